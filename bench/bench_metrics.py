@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark for pull_request_report.metrics
+
+Times loading synthetic PR lists into column arrays and computing every
+Overview metric from them.  Compute time should stay a small fraction of
+load time, which is the one unavoidable pass over the PR dicts.
+
+Usage:
+    python bench/bench_metrics.py [--prs 10000 100000 300000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import synthetic_pr_data  # noqa: E402
+
+from pull_request_report.metrics import PRColumns, compute_metrics  # noqa: E402
+
+
+def bench_metrics(prs: int) -> dict:
+    pr_lists = {"acme/api": synthetic_pr_data(prs, comments_per_pr=0)["pr_list"]}
+    start = time.perf_counter()
+    columns = PRColumns(pr_lists)
+    loaded = time.perf_counter()
+    metrics = compute_metrics(columns)
+    done = time.perf_counter()
+    return {
+        "prs": prs,
+        "groups": len(metrics["groups"]),
+        "load_seconds": loaded - start,
+        "compute_seconds": done - loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark review metrics")
+    parser.add_argument("--prs", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    args = parser.parse_args()
+
+    print(f"{'prs':>8} {'groups':>7} {'load s':>8} {'compute s':>10}")
+    for prs in args.prs:
+        r = bench_metrics(prs)
+        print(f"{r['prs']:>8} {r['groups']:>7} {r['load_seconds']:>8.3f} {r['compute_seconds']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
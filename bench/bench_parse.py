@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark for convert_to_pdf.parse_markdown_summary
+
+Parses synthetic summaries of 10k-100k lines straight from disk and reports
+time and peak traced memory per line.  Both should stay flat as the document
+grows; peak memory is dominated by the parsed result, not by parser state.
+
+Usage:
+    python bench/bench_parse.py [--sizes 10000 30000 100000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import write_synthetic_summary  # noqa: E402
+
+from convert_to_pdf import parse_markdown_summary  # noqa: E402
+
+
+def bench_parse(path: Path) -> dict:
+    """Parse ``path`` once and return timing and memory figures."""
+    with open(path) as f:
+        lines = sum(1 for _ in f)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path) as f:
+        data = parse_markdown_summary(f)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "lines": lines,
+        "patterns": len(data["patterns"]),
+        "seconds": elapsed,
+        "us_per_line": elapsed / lines * 1e6,
+        "peak_bytes": peak,
+        "peak_bytes_per_line": peak / lines,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown summary parsing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 30_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'patterns':>9} {'seconds':>9} {'us/line':>8} {'peak MB':>8} {'B/line':>7}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in args.sizes:
+            path = write_synthetic_summary(Path(temp_dir) / f"summary-{size}.md", size)
+            r = bench_parse(path)
+            print(
+                f"{r['lines']:>8} {r['patterns']:>9} {r['seconds']:>9.3f} {r['us_per_line']:>8.2f} "
+                f"{r['peak_bytes'] / 1e6:>8.2f} {r['peak_bytes_per_line']:>7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark for pull_request_report.patterns
+
+Clusters synthetic review comments drawn from five themes and reports how
+long vectorizing and clustering take and whether each theme came out as its
+own Key Pattern.
+
+Usage:
+    python bench/bench_patterns.py [--comments 10000 100000 300000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import COMMENT_THEMES, synthetic_comments  # noqa: E402
+
+from pull_request_report.patterns import extract_patterns  # noqa: E402
+
+
+def bench_patterns(count: int) -> dict:
+    comments = synthetic_comments(count)
+    start = time.perf_counter()
+    patterns = extract_patterns(comments)
+    seconds = time.perf_counter() - start
+    # A theme is recovered when one large pattern opens with that theme's text
+    large = [p for p in patterns if p["comments"] >= 0.9 * count / len(COMMENT_THEMES)]
+    recovered = sum(
+        any(theme.split("{x}")[0] in p["issues"][0] for p in large) for theme, _ in COMMENT_THEMES
+    )
+    return {"comments": count, "patterns": len(patterns), "recovered": recovered, "seconds": seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Key Pattern clustering")
+    parser.add_argument("--comments", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    args = parser.parse_args()
+
+    print(f"{'comments':>9} {'patterns':>9} {'themes':>7} {'seconds':>8}")
+    for count in args.comments:
+        r = bench_patterns(count)
+        print(f"{r['comments']:>9} {r['patterns']:>9} {r['recovered']:>5}/{len(COMMENT_THEMES)} {r['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
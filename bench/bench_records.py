@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for pull_request_report.records
+
+Decodes synthetic PR histories with ``json.loads`` and measures the memory
+retained by the plain dicts against the slotted record objects built from
+them.  Both start from the same JSON text, so logins and file paths begin as
+separate string copies exactly as they do when reading pr_data.json.
+
+Usage:
+    python bench/bench_records.py [--prs 1000 10000 50000]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import synthetic_pr_data  # noqa: E402
+
+from pull_request_report.records import from_pr_data  # noqa: E402
+
+
+def retained_bytes(build, text: str) -> int:
+    """Return the bytes still allocated after ``build(text)``, keeping its result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(text)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bench_records(prs: int, comments_per_pr: int = 20) -> dict:
+    text = json.dumps(synthetic_pr_data(prs, comments_per_pr))
+    # One PR, its comments and one review each
+    records = prs * (comments_per_pr + 2)
+    dict_bytes = retained_bytes(json.loads, text)
+    record_bytes = retained_bytes(lambda t: from_pr_data(json.loads(t)), text)
+    return {
+        "prs": prs,
+        "records": records,
+        "dict_bytes": dict_bytes,
+        "record_bytes": record_bytes,
+        "ratio": record_bytes / dict_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of dict and slotted PR records")
+    parser.add_argument("--prs", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--comments-per-pr", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'prs':>7} {'records':>9} {'dicts MB':>9} {'slots MB':>9} {'B/rec dict':>11} {'B/rec slots':>12} {'ratio':>6}")
+    for prs in args.prs:
+        r = bench_records(prs, args.comments_per_pr)
+        print(
+            f"{r['prs']:>7} {r['records']:>9} {r['dict_bytes'] / 1e6:>9.1f} {r['record_bytes'] / 1e6:>9.1f} "
+            f"{r['dict_bytes'] / r['records']:>11.0f} {r['record_bytes'] / r['records']:>12.0f} {r['ratio']:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the parse → render → PDF path of convert_to_pdf
+
+Builds summaries and PR datasets at 1×, 10×, 100× and 1000× the size of the
+``test/fixtures`` samples and times ``parse_markdown_summary``,
+``generate_html`` and ``convert_html_to_pdf`` separately.  Each stage is
+timed ``--repeat`` times without tracing, looping fast stages the way
+``timeit`` does so every sample takes at least 0.2s, and the best time per
+call is reported; one more call under tracemalloc gives its peak Python
+heap.  A PDF renderer running out of process (wkhtmltopdf) is timed but its
+memory is not traced.
+
+``--save`` writes the results to the baseline file.  Otherwise, when the
+baseline exists, every stage is compared with it and the run exits non-zero
+if any stage got slower or bigger by more than ``--tolerance``.
+
+Usage:
+    python bench/bench_report.py [--scales 1 10 100 1000] [--save] [--no-pdf]
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import scaled_pr_data, scaled_summary  # noqa: E402
+
+from convert_to_pdf import (  # noqa: E402
+    PR_DATA_BASENAME,
+    convert_html_to_pdf,
+    generate_html,
+    load_config,
+    parse_markdown_summary,
+    pdf_backend_name,
+    report_metrics,
+    write_html,
+)
+
+CONFIG = Path(__file__).parent.parent / "test" / "fixtures" / "sample_config.json"
+DEFAULT_BASELINE = Path(__file__).parent / "baseline_report.json"
+STAGES = ("parse", "render", "pdf")
+
+
+def measure(run, repeat: int) -> dict:
+    """Best and median seconds per call over ``repeat`` samples, then the traced peak of one more call."""
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    seconds = [total / number for total in timer.repeat(repeat, number)]
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(seconds), "median_seconds": statistics.median(seconds), "peak_bytes": peak}
+
+
+def available_pdf_backend():
+    """The backend ``convert_html_to_pdf`` would use here, or None when neither is installed."""
+    backend = pdf_backend_name("auto")
+    if backend == "wkhtmltopdf" and shutil.which("wkhtmltopdf") is None:
+        return None
+    return backend
+
+
+def bench_scale(scale: int, work_dir: Path, config: dict, repeat: int, pdf_backend) -> dict:
+    """Run every stage on the ``scale``× inputs and return their figures by stage name."""
+    summary_path = work_dir / "summary.md"
+    summary_path.write_text(scaled_summary(scale))
+    pr_data_path = work_dir / PR_DATA_BASENAME
+    pr_data_path.write_text(json.dumps(scaled_pr_data(scale)))
+
+    def parse():
+        with open(summary_path) as f:
+            return parse_markdown_summary(f)
+
+    data = parse()
+    # Metrics feed the Overview tables; they are computed once, outside the timed stages
+    data["metrics"] = report_metrics(pr_data_path, "test-api")
+    html_path = write_html(data, config, work_dir / "report.html")
+    pdf_path = work_dir / "report.pdf"
+
+    def pdf():
+        if not convert_html_to_pdf(html_path, pdf_path, pdf_backend):
+            raise RuntimeError(f"{pdf_backend} failed on the {scale}× report")
+
+    stages = {
+        "parse": measure(parse, repeat),
+        "render": measure(lambda: generate_html(data, config), repeat),
+    }
+    if pdf_backend:
+        stages["pdf"] = measure(pdf, repeat)
+    stages["parse"]["input_bytes"] = summary_path.stat().st_size
+    stages["render"]["output_bytes"] = html_path.stat().st_size
+    if pdf_backend:
+        stages["pdf"]["output_bytes"] = pdf_path.stat().st_size
+    return stages
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Describe every stage that is more than ``tolerance`` slower or bigger than the baseline."""
+    regressions = []
+    same_backend = results["pdf_backend"] == baseline.get("pdf_backend")
+    for scale, stages in results["scales"].items():
+        for stage, figures in stages.items():
+            before = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if before is None or (stage == "pdf" and not same_backend):
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                if figures[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{scale}× {stage}: {metric} {before[metric]:.4g} → {figures[metric]:.4g} "
+                        f"({figures[metric] / before[metric]:.2f}×)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark summary parsing, HTML rendering and PDF conversion")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (default: 3)")
+    parser.add_argument("--no-pdf", action="store_true", help="skip the PDF stage")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or growth over the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    config = load_config(CONFIG)
+    pdf_backend = None if args.no_pdf else available_pdf_backend()
+    if pdf_backend is None and not args.no_pdf:
+        print("No PDF backend installed (weasyprint or wkhtmltopdf); skipping the pdf stage")
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pdf_backend": pdf_backend,
+        "repeat": args.repeat,
+        "scales": {},
+    }
+    print(f"{'scale':>6} {'stage':>7} {'best s':>9} {'median s':>9} {'peak MB':>8} {'in/out KB':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scale in args.scales:
+            work_dir = Path(temp_dir) / f"{scale}x"
+            work_dir.mkdir()
+            stages = bench_scale(scale, work_dir, config, args.repeat, pdf_backend)
+            results["scales"][str(scale)] = stages
+            for stage in STAGES:
+                if stage in stages:
+                    r = stages[stage]
+                    size = r.get("input_bytes", r.get("output_bytes", 0))
+                    print(
+                        f"{scale:>5}× {stage:>7} {r['seconds']:>9.4f} {r['median_seconds']:>9.4f} "
+                        f"{r['peak_bytes'] / 1e6:>8.2f} {size / 1e3:>10.1f}"
+                    )
+
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("platform") != results["platform"]:
+        print(f"Note: baseline was recorded on {baseline.get('platform')}")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%} against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions over {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
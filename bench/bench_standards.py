@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark for pull_request_report.standards
+
+Tags synthetic review comments against the fixture standards document padded
+with extra rules, once with the single compiled index and once by searching
+with a separate pattern per rule, and checks both agree.
+
+Usage:
+    python bench/bench_standards.py [--comments 20000] [--rules 11 100 500]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import synthetic_comments  # noqa: E402
+
+from pull_request_report.standards import (  # noqa: E402
+    StandardsIndex,
+    compile_keywords,
+    load_rules,
+    parse_standards,
+)
+
+DOCS = Path(__file__).parent.parent / "test" / "fixtures" / "sample_engineering_docs.md"
+
+
+def padded_rules(count: int) -> list:
+    rules = load_rules(DOCS)
+    extra = "".join(
+        f"### Standard {i}\n- **Keywords**: guideline{i} topic, practice{i}\n" for i in range(count - len(rules))
+    )
+    return rules + parse_standards(extra)
+
+
+def per_rule_match(rules, patterns, text: str) -> list:
+    return [rule for rule, pattern in zip(rules, patterns) if pattern.search(text)]
+
+
+def bench_standards(comments: list, rules: int) -> dict:
+    rule_list = padded_rules(rules)
+    start = time.perf_counter()
+    index = StandardsIndex(rule_list)
+    built = time.perf_counter()
+    combined = [index.match(c["body"]) for c in comments]
+    indexed = time.perf_counter()
+
+    patterns = [compile_keywords(rule.keywords) for rule in rule_list]
+    separate = [per_rule_match(rule_list, patterns, c["body"]) for c in comments]
+    done = time.perf_counter()
+    assert combined == separate
+    return {
+        "rules": len(rule_list),
+        "build_seconds": built - start,
+        "index_seconds": indexed - built,
+        "per_rule_seconds": done - indexed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tagging comments with engineering standards")
+    parser.add_argument("--comments", type=int, default=20_000)
+    parser.add_argument("--rules", type=int, nargs="+", default=[11, 100, 500])
+    args = parser.parse_args()
+
+    comments = synthetic_comments(args.comments)
+    print(f"{'rules':>6} {'build s':>8} {'index s':>8} {'per-rule s':>11}")
+    for rules in args.rules:
+        r = bench_standards(comments, rules)
+        print(f"{r['rules']:>6} {r['build_seconds']:>8.3f} {r['index_seconds']:>8.2f} {r['per_rule_seconds']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
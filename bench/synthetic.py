@@ -0,0 +1,174 @@
+"""
+Synthetic inputs for the benchmarks
+
+Everything is generated from the shapes of the fixtures in ``test/fixtures`` so
+the benchmarks exercise the same code paths as real reports, only larger.
+"""
+
+import copy
+import json
+import re
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent.parent / "test" / "fixtures"
+# PR numbers of the n-th copy of a fixture PR are offset by n * PR_OFFSET
+PR_OFFSET = 1000
+
+ISSUES = (
+    "**Method Placement**: JWT validation logic could be extracted to utility functions",
+    "**Configuration Management**: Hardcoded values instead of environment variables",
+    "**Resource Management**: Missing proper cleanup patterns for database connections",
+)
+
+IMPROVEMENTS = (
+    "Extract utility functions for reusable logic",
+    "Use environment variables for configuration",
+    "Implement context managers for resource cleanup",
+)
+
+
+def synthetic_summary_lines(target_lines: int):
+    """Yield a summary.md of roughly ``target_lines`` lines, one line at a time.
+
+    The Key Patterns section is repeated until the target is reached, which is
+    what org-wide rollups with hundreds of patterns look like.
+    """
+    yield "# Pull Request Analysis Summary\n"
+    yield "\n## Overview\n\n"
+    yield "Analyzed recent pull requests to identify patterns in code review feedback.\n\n"
+    yield "**PRs Analyzed:**\n"
+    for number in range(100, 110):
+        yield f"- PR #{number}: Synthetic change {number}\n"
+    yield "\n## Key Patterns Identified\n"
+
+    produced = 20
+    pattern = 0
+    while produced < target_lines - 20:
+        pattern += 1
+        yield f"\n### {pattern}. **Pattern {pattern}**\n\n**Recurring Issues:**\n"
+        for issue in ISSUES:
+            yield f"- {issue} ({pattern})\n"
+        yield "\n**Improvement Actions:**\n"
+        for improvement in IMPROVEMENTS:
+            yield f"- {improvement} ({pattern})\n"
+        produced += 12
+
+    yield "\n## Strengths Observed\n\n1. **Clean Code Structure**: Well-structured code\n"
+    yield "\n## Top Recommendations for Improvement\n\n### Immediate Actions:\n"
+    yield "1. **Extract reusable logic** to utility functions\n"
+    yield "\n## Conclusion\n\nSolid implementation skills with room for improvement.\n"
+
+
+def write_synthetic_summary(path, target_lines: int):
+    """Write a synthetic summary to ``path`` and return the path."""
+    with open(path, "w") as f:
+        f.writelines(synthetic_summary_lines(target_lines))
+    return path
+
+
+def synthetic_pr_data(prs: int, comments_per_pr: int = 20, logins: int = 50, files: int = 500) -> dict:
+    """Return ``pr_data.json``-shaped data with realistic repetition.
+
+    Logins and file paths come from small pools, as in a real organisation,
+    while titles and comment bodies are unique.
+    """
+    users = [f"dev-{i}" for i in range(logins)]
+    paths = [f"service-{i % 20}/module_{i}.py" for i in range(files)]
+    states = ("APPROVED", "CHANGES_REQUESTED", "COMMENTED")
+    data = {"pr_list": [], "comments": [], "reviews": []}
+    for number in range(1, prs + 1):
+        data["pr_list"].append({
+            "number": number,
+            "title": f"Synthetic change {number}",
+            "state": "MERGED" if number % 5 else "OPEN",
+            "author": users[number % logins],
+            "created_at": f"2025-{number % 12 + 1:02d}-{number % 28 + 1:02d}T10:00:00Z",
+            "merged_at": f"2025-{number % 12 + 1:02d}-{number % 28 + 1:02d}T15:30:00Z" if number % 5 else None,
+            "reviewers": [{"login": users[(number + k) % logins], "state": states[k]} for k in range(2)],
+            "changed_files": number % 17 + 1,
+            "additions": number * 7 % 400,
+            "deletions": number * 3 % 120,
+        })
+        for k in range(comments_per_pr):
+            data["comments"].append({
+                "pr_number": number,
+                "user": users[(number * 7 + k) % logins],
+                "body": f"Consider extracting this logic ({number}.{k}) into a helper for reuse.",
+                "file": paths[(number * 13 + k) % files],
+                "line": k * 3 + 1,
+            })
+        data["reviews"].append({
+            "pr_number": number,
+            "user": users[(number + 1) % logins],
+            "state": states[number % 3],
+            "body": f"Review of change {number}.",
+        })
+    return data
+
+
+COMMENT_THEMES = (
+    ("Consider extracting the {x} logic into a separate utility function for reuse.", "auth/{x}.py"),
+    ("The connection pool for {x} is not closed; use a context manager to avoid resource leaks.", "database/{x}.py"),
+    ("Add error handling for expired {x} tokens and invalid input.", "api/{x}.py"),
+    ("Missing tests for the {x} edge cases, please add unit tests.", "tests/test_{x}.py"),
+    ("Hardcoded {x} value should come from environment variables configuration.", "config/{x}.py"),
+)
+
+
+def synthetic_comments(count: int, seed: int = 1) -> list:
+    """Return review comments drawn from ``COMMENT_THEMES``, one subject word varying."""
+    import random
+
+    rng = random.Random(seed)
+    subjects = ("user", "order", "payment", "session", "invoice", "report", "cache", "token", "queue", "widget")
+    comments = []
+    for _ in range(count):
+        body, path = rng.choice(COMMENT_THEMES)
+        subject = f"{rng.choice(subjects)}{rng.randrange(50)}"
+        comments.append({"body": body.format(x=subject), "file": path.format(x=subject)})
+    return comments
+
+
+def scaled_summary(scale: int) -> str:
+    """Return ``sample_summary.md`` with its PRs, Key Patterns and Strengths repeated ``scale`` times.
+
+    Copies are renumbered, and PR numbers match ``scaled_pr_data(scale)``.
+    """
+    head, *sections = (FIXTURES / "sample_summary.md").read_text().split("\n## ")
+    scaled = [head]
+    for section in sections:
+        title, body = section.split("\n", 1)
+        if title == "Overview":
+            prs = re.findall(r"^- PR #(\d+)(.*)$", body, re.M)
+            lines = "".join(
+                f"- PR #{int(number) + n * PR_OFFSET}{rest}\n" for n in range(scale) for number, rest in prs
+            )
+            body = re.sub(r"(^- PR #.*\n)+", lambda _, lines=lines: lines, body, count=1, flags=re.M)
+        elif title == "Key Patterns Identified":
+            intro, *blocks = body.split("\n### ")
+            renumbered = (
+                re.sub(r"^\d+\.", f"{n * len(blocks) + i + 1}.", block)
+                for n in range(scale) for i, block in enumerate(blocks)
+            )
+            body = "\n### ".join([intro, *renumbered])
+        elif title == "Strengths Observed":
+            items = re.findall(r"^\d+\.(.*)$", body, re.M)
+            lines = "".join(f"{k + 1}.{items[k % len(items)]}\n" for k in range(scale * len(items)))
+            body = re.sub(r"(^\d+\..*\n)+", lambda _, lines=lines: lines, body, count=1, flags=re.M)
+        scaled.append(f"{title}\n{body}")
+    return "\n## ".join(scaled)
+
+
+def scaled_pr_data(scale: int) -> dict:
+    """Return ``sample_pr_data.json`` with every PR, comment and review repeated ``scale`` times."""
+    with open(FIXTURES / "sample_pr_data.json") as f:
+        sample = json.load(f)
+    data = {key: [] for key in sample}
+    for n in range(scale):
+        for key, records in sample.items():
+            for record in records:
+                record = copy.deepcopy(record)
+                field = "number" if key == "pr_list" else "pr_number"
+                record[field] += n * PR_OFFSET
+                data[key].append(record)
+    return data
@@ -4,6 +4,11 @@ Pull Request Analysis Report Converter
 Converts markdown summary reports to styled HTML and PDF format.
 """
 
+import functools
+import glob
+import hashlib
+import io
+import os
 import re
 import json
 import argparse
@@ -11,9 +16,57 @@ from pathlib import Path
 from datetime import datetime
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext, suppress
 
-def parse_markdown_summary(content: str) -> dict:
-    """Parse the markdown summary into structured data."""
+from pull_request_report import prometheus
+from pull_request_report.cache import atomic_open, atomic_write_json
+from pull_request_report.profiling import profile_table, profiling, span
+
+SECTION_HEADINGS = (
+    ('## Overview', 'overview'),
+    ('## Key Patterns', 'patterns'),
+    ('## Standards Compliance', 'standards_compliance'),
+    ('## Strengths', 'strengths'),
+    ('## Top Recommendations', 'recommendations'),
+    ('## Focus Areas', 'focus_areas'),
+    ('## Conclusion', 'conclusion'),
+)
+
+RECOMMENDATION_SUBSECTIONS = (
+    ('Critical Actions', 'critical'),
+    ('Immediate Actions', 'immediate'),
+    ('Development Process', 'development'),
+    ('Architecture Improvements', 'architecture'),
+)
+
+FOCUS_SUBSECTIONS = (
+    ('Clean Code', 'clean_code'),
+    ('FastAPI', 'fastapi'),
+    ('API Construction', 'api_construction'),
+)
+
+NUMBERED_ITEM = re.compile(r'\d+\.')
+
+
+def iter_summary_lines(source):
+    """Yield stripped, non-empty lines from markdown text or an open text file."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    for line in source:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def parse_markdown_summary(source) -> dict:
+    """Parse the markdown summary into structured data.
+
+    ``source`` is either the markdown text or an open text file.  Lines are
+    consumed one at a time and only the current section, subsection and
+    Key Patterns list are remembered, so memory use does not grow with the
+    length of the document beyond the parsed result itself.
+    """
     data = {
         'title': 'Pull Request Analysis Summary',
         'overview': '',
@@ -34,536 +87,868 @@ def parse_markdown_summary(content: str) -> dict:
         },
         'conclusion': ''
     }
-    
-    lines = content.split('\n')
+
+    # Free text is collected as parts and joined once at the end
+    text_parts = {'overview': [], 'standards_compliance': [], 'conclusion': []}
     current_section = None
     current_subsection = None
-    current_content = []
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines
-        if not line:
-            continue
-            
-        # Main sections
+    # Which Key Patterns list ('issues' or 'improvements') items belong to
+    pattern_list = None
+
+    for line in iter_summary_lines(source):
         if line.startswith('# '):
             data['title'] = line[2:]
-        elif line.startswith('## Overview'):
-            current_section = 'overview'
-            current_content = []
-        elif line.startswith('## Key Patterns'):
-            current_section = 'patterns'
-            current_content = []
-        elif line.startswith('## Standards Compliance'):
-            current_section = 'standards_compliance'
-            current_content = []
-        elif line.startswith('## Strengths'):
-            current_section = 'strengths'
-            current_content = []
-        elif line.startswith('## Top Recommendations'):
-            current_section = 'recommendations'
-            current_content = []
-        elif line.startswith('## Focus Areas'):
-            current_section = 'focus_areas'
-            current_content = []
-        elif line.startswith('## Conclusion'):
-            current_section = 'conclusion'
-            current_content = []
-        # Subsections
-        elif line.startswith('### ') and current_section == 'recommendations':
-            if 'Critical Actions' in line:
-                current_subsection = 'critical'
-            elif 'Immediate Actions' in line:
-                current_subsection = 'immediate'
-            elif 'Development Process' in line:
-                current_subsection = 'development'
-            elif 'Architecture Improvements' in line:
-                current_subsection = 'architecture'
-        elif line.startswith('### ') and current_section == 'focus_areas':
-            if 'Clean Code' in line:
-                current_subsection = 'clean_code'
-            elif 'FastAPI' in line:
-                current_subsection = 'fastapi'
-            elif 'API Construction' in line:
-                current_subsection = 'api_construction'
+            continue
+
+        if line.startswith('## '):
+            for heading, section in SECTION_HEADINGS:
+                if line.startswith(heading):
+                    current_section = section
+                    pattern_list = None
+                    break
             else:
-                current_subsection = None
-        else:
-            # Content lines
-            current_content.append(line)
-            
-            # Process content based on current section
-            if current_section == 'overview':
-                if line.startswith('- PR #'):
-                    data['pr_list'].append(line[2:])
-                elif not line.startswith('**PRs Analyzed:**') and not line.startswith('- PR #'):
-                    data['overview'] += line + ' '
-            elif current_section == 'patterns':
-                if line.startswith('### '):
-                    # New pattern section
-                    pattern_name = line[4:].split('**')[1] if '**' in line else line[4:]
-                    data['patterns'].append({
-                        'name': pattern_name,
-                        'issues': [],
-                        'improvements': []
-                    })
-                elif line.startswith('- **') and data['patterns']:
-                    # Issue or improvement item
-                    if '**Recurring Issues:**' in '\n'.join(current_content[-5:]):
-                        data['patterns'][-1]['issues'].append(line[2:])
-                    elif '**Improvement Actions:**' in '\n'.join(current_content[-5:]):
-                        data['patterns'][-1]['improvements'].append(line[2:])
-            elif current_section == 'standards_compliance':
-                data['standards_compliance'] += line + '\n'
-            elif current_section == 'strengths':
-                if line.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.')):
-                    data['strengths'].append(line)
-            elif current_section == 'recommendations' and current_subsection:
-                if line.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.')):
-                    data['recommendations'][current_subsection].append(line)
-            elif current_section == 'focus_areas' and current_subsection and current_subsection in data['focus_areas']:
-                if line.startswith('- '):
-                    data['focus_areas'][current_subsection].append(line[2:])
-            elif current_section == 'conclusion':
-                data['conclusion'] += line + ' '
-    
+                _parse_section_line(data, text_parts, current_section, current_subsection, line)
+            continue
+
+        if line.startswith('### ') and current_section == 'recommendations':
+            for label, key in RECOMMENDATION_SUBSECTIONS:
+                if label in line:
+                    current_subsection = key
+                    break
+            continue
+
+        if line.startswith('### ') and current_section == 'focus_areas':
+            current_subsection = next(
+                (key for label, key in FOCUS_SUBSECTIONS if label in line), None
+            )
+            continue
+
+        if current_section == 'patterns':
+            if line.startswith('### '):
+                pattern_name = line[4:].split('**')[1] if '**' in line else line[4:]
+                data['patterns'].append({
+                    'name': pattern_name,
+                    'issues': [],
+                    'improvements': []
+                })
+                pattern_list = None
+            elif '**Recurring Issues:**' in line:
+                pattern_list = 'issues'
+            elif '**Improvement Actions:**' in line:
+                pattern_list = 'improvements'
+            elif line.startswith('- ') and pattern_list and data['patterns']:
+                data['patterns'][-1][pattern_list].append(line[2:])
+            continue
+
+        _parse_section_line(data, text_parts, current_section, current_subsection, line)
+
+    data['overview'] = ''.join(part + ' ' for part in text_parts['overview'])
+    data['standards_compliance'] = ''.join(part + '\n' for part in text_parts['standards_compliance'])
+    data['conclusion'] = ''.join(part + ' ' for part in text_parts['conclusion'])
     return data
 
-def generate_html(data: dict, config: dict) -> str:
-    """Generate HTML from parsed data using the template style."""
-    
-    # Read the template CSS from the example file
-    css_content = """
-        @page {
-            margin: 1in;
-            size: letter;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 8.5in;
-            margin: 0 auto;
-            background: white;
-        }
-        
-        h1 {
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-            font-size: 28px;
-            margin-bottom: 30px;
-        }
-        
-        h2 {
-            color: #34495e;
-            border-bottom: 2px solid #ecf0f1;
-            padding-bottom: 8px;
-            margin-top: 35px;
-            margin-bottom: 20px;
-            font-size: 22px;
-        }
-        
-        h3 {
-            color: #2c3e50;
-            margin-top: 25px;
-            margin-bottom: 15px;
-            font-size: 18px;
-        }
-        
-        h4 {
-            color: #34495e;
-            margin-top: 20px;
-            margin-bottom: 12px;
-            font-size: 16px;
-            font-weight: 600;
-        }
-        
-        p {
-            margin-bottom: 15px;
-            text-align: justify;
-        }
-        
-        ul, ol {
-            margin-bottom: 20px;
-            padding-left: 25px;
-        }
-        
-        li {
-            margin-bottom: 8px;
-        }
-        
-        strong {
-            color: #2c3e50;
-            font-weight: 600;
-        }
-        
-        .overview-box {
-            background: #f8f9fa;
-            border: 1px solid #e9ecef;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 20px 0;
-        }
-        
-        .pr-list {
-            background: #ffffff;
-            border-left: 4px solid #3498db;
-            padding: 15px 20px;
-            margin: 15px 0;
-        }
-        
-        .pattern-section {
-            background: #fefefe;
-            border: 1px solid #e1e8ed;
-            border-radius: 6px;
-            padding: 20px;
-            margin: 20px 0;
-        }
-        
-        .issues-list {
-            background: #fff5f5;
-            border-left: 4px solid #e74c3c;
-            padding: 15px 20px;
-            margin: 15px 0;
-        }
-        
-        .improvements-list {
-            background: #f0fff4;
-            border-left: 4px solid #27ae60;
-            padding: 15px 20px;
-            margin: 15px 0;
-        }
-        
-        .strengths-list {
-            background: #f0f8ff;
-            border-left: 4px solid #3498db;
-            padding: 15px 20px;
-            margin: 15px 0;
-        }
-        
-        .recommendations {
-            background: #fffbf0;
-            border: 2px solid #f39c12;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 25px 0;
-        }
-        
-        .focus-areas {
-            background: #f8f0ff;
-            border: 2px solid #9b59b6;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 25px 0;
-        }
-        
-        .conclusion {
-            background: #f0f8f0;
-            border: 2px solid #27ae60;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 25px 0;
-        }
-        
-        .standards-compliance {
-            background: #f0f8ff;
-            border: 2px solid #3498db;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 25px 0;
-        }
-        
-        .page-break {
-            page-break-before: always;
-        }
-        
-        @media print {
-            body {
-                font-size: 12px;
-                line-height: 1.4;
-            }
-            
-            h1 { font-size: 24px; }
-            h2 { font-size: 18px; }
-            h3 { font-size: 16px; }
-            h4 { font-size: 14px; }
-            
-            .pattern-section,
-            .recommendations,
-            .focus-areas,
-            .conclusion,
-            .standards-compliance {
-                break-inside: avoid;
-            }
-        }
+
+def _parse_section_line(data, text_parts, section, subsection, line):
+    """Handle a content line outside the Key Patterns section."""
+    if section == 'overview':
+        if line.startswith('- PR #'):
+            data['pr_list'].append(line[2:])
+        elif not line.startswith('**PRs Analyzed:**'):
+            text_parts['overview'].append(line)
+    elif section in ('standards_compliance', 'conclusion'):
+        text_parts[section].append(line)
+    elif section == 'strengths':
+        if NUMBERED_ITEM.match(line):
+            data['strengths'].append(line)
+    elif section == 'recommendations' and subsection:
+        if NUMBERED_ITEM.match(line):
+            data['recommendations'][subsection].append(line)
+    elif section == 'focus_areas' and subsection in data['focus_areas'] and line.startswith('- '):
+        data['focus_areas'][subsection].append(line[2:])
+
+
+RECOMMENDATION_SECTIONS = (
+    ('critical', 'Critical Actions'),
+    ('immediate', 'Immediate Actions'),
+    ('development', 'Development Process'),
+    ('architecture', 'Architecture Improvements'),
+)
+
+FOCUS_SECTIONS = (
+    ('clean_code', 'Clean Code Principles'),
+    ('fastapi', 'FastAPI Best Practices'),
+    ('api_construction', 'API Construction Patterns'),
+)
+
+# Bump when rendering code changes output in ways the template sources do not show
+RENDER_VERSION = 2
+
+BOLD = re.compile(r'\*\*(.+?)\*\*')
+
+
+def inline_markdown(text: str):
+    """Render the inline markdown used in summaries (bold) as HTML.
+
+    Summaries quote review comments verbatim, so everything else is escaped.
     """
-    
-    # Generate repository info from config
+    from markupsafe import Markup, escape
+
+    return Markup(BOLD.sub(r'<strong>\1</strong>', str(escape(text))))
+
+
+@functools.lru_cache(maxsize=None)
+def report_template():
+    """Load and compile the report template once per process."""
+    import jinja2
+
+    env = jinja2.Environment(
+        loader=jinja2.PackageLoader('pull_request_report', 'templates'),
+        autoescape=True,
+        trim_blocks=True,
+        lstrip_blocks=False,
+        keep_trailing_newline=True,
+    )
+    env.filters['inline_markdown'] = inline_markdown
+    return env.get_template('report.html.j2')
+
+
+@functools.lru_cache(maxsize=None)
+def report_css() -> str:
+    """Return the report stylesheet, read once per process."""
+    template = report_template()
+    return template.environment.loader.get_source(template.environment, 'report.css')[0]
+
+
+@functools.lru_cache(maxsize=None)
+def shared_css_name() -> str:
+    """``report.<hash>.css``: the stylesheet's file name in shared mode, named by content."""
+    return f"report.{hashlib.sha256(report_css().encode()).hexdigest()[:12]}.css"
+
+
+def write_shared_css(root: Path) -> Path:
+    """Write the stylesheet once into ``root`` for the reports below it to link."""
+    css_path = Path(root) / shared_css_name()
+    if not css_path.exists():
+        with atomic_open(css_path) as f:
+            f.write(report_css())
+    return css_path
+
+
+def shared_css_href(css_path: Path, html_path: Path) -> str:
+    """The link to ``css_path`` from a report written at ``html_path``."""
+    return Path(os.path.relpath(css_path, Path(html_path).parent)).as_posix()
+
+
+@functools.lru_cache(maxsize=None)
+def report_stylesheet():
+    """The stylesheet parsed once per process by weasyprint, for every PDF it renders."""
+    import weasyprint
+
+    return weasyprint.CSS(string=report_css())
+
+
+def _shared_css_fetcher(url: str, *args, **kwargs):
+    """weasyprint URL fetcher that hands linked shared stylesheets back empty.
+
+    ``report_stylesheet()`` is passed to every render instead, so the linked
+    copy does not need fetching and parsing again for each document.
+    """
+    import weasyprint
+
+    if url.endswith('/' + shared_css_name()):
+        return {'string': '', 'mime_type': 'text/css'}
+    return weasyprint.default_url_fetcher(url, *args, **kwargs)
+
+
+def render_config_fields(config: dict) -> dict:
+    """The parts of config.json that affect rendered output.
+
+    Keep in step with ``_template_context``: the render cache hashes exactly
+    these fields, so anything else in the config can change freely.
+    """
+    repositories = config.get('repositories') or []
+    return {'repository': repositories[0].get('name') if repositories else None}
+
+
+def _template_context(data: dict, config: dict, css_href: str = None) -> dict:
     repo_info = ""
     if config.get('repositories'):
         repo = config['repositories'][0]  # Use first repo
         repo_info = f"Analyzed {len(data['pr_list'])} recent pull requests from the {repo['name']} repository"
-    
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{data['title']}</title>
-    <style>{css_content}</style>
-</head>
-<body>
-    <h1>{data['title']}</h1>
-    
-    <div class="overview-box">
-        <h2>Overview</h2>
-        <p>{repo_info} to identify patterns in code review feedback and opportunities for improvement in FastAPI and API construction patterns.</p>
-        
-        <div class="pr-list">
-            <strong>PRs Analyzed:</strong>
-            <ul>"""
-    
-    # Add PR list
-    for pr in data['pr_list']:
-        html += f"\n                <li>{pr}</li>"
-    
-    html += """
-            </ul>
-        </div>
-    </div>
 
-    <h2>Key Patterns Identified</h2>
-"""
-    
-    # Add patterns
-    for i, pattern in enumerate(data['patterns']):
-        html += f"""
-    <div class="pattern-section">
-        <h3>{i+1}. {pattern['name']}</h3>
-        
-        <div class="issues-list">
-            <h4>Recurring Issues:</h4>
-            <ul>"""
-        
-        for issue in pattern['issues']:
-            html += f"\n                <li>{issue}</li>"
-        
-        html += """
-            </ul>
-        </div>
-
-        <div class="improvements-list">
-            <h4>Improvement Actions:</h4>
-            <ul>"""
-        
-        for improvement in pattern['improvements']:
-            html += f"\n                <li>{improvement}</li>"
-        
-        html += """
-            </ul>
-        </div>
-    </div>"""
-    
-    # Add page break
-    html += '\n\n    <div class="page-break"></div>'
-    
-    # Add standards compliance if available
-    if data['standards_compliance'].strip():
-        html += f"""
-    
-    <div class="standards-compliance">
-        <h2>Standards Compliance Analysis</h2>
-        <div>{data['standards_compliance'].replace('**', '<strong>').replace('**', '</strong>')}</div>
-    </div>"""
-    
-    # Add strengths
-    html += """
+    return {
+        'data': data,
+        'css': None if css_href else report_css(),
+        'css_href': css_href,
+        'repo_info': repo_info,
+        'recommendation_sections': RECOMMENDATION_SECTIONS,
+        'focus_sections': FOCUS_SECTIONS,
+    }
 
-    <div class="strengths-list">
-        <h2>Strengths Observed</h2>
-        <ol>"""
-    
-    for strength in data['strengths']:
-        html += f"\n            <li>{strength}</li>"
-    
-    html += """
-        </ol>
-    </div>
 
-    <div class="page-break"></div>
+def generate_html(data: dict, config: dict, css_href: str = None) -> str:
+    """Generate HTML from parsed data using the report template.
 
-    <div class="recommendations">
-        <h2>Top Recommendations for Improvement</h2>"""
-    
-    # Add recommendation sections
-    rec_sections = [
-        ('critical', 'Critical Actions'),
-        ('immediate', 'Immediate Actions'),
-        ('development', 'Development Process'),
-        ('architecture', 'Architecture Improvements')
-    ]
-    
-    for key, title in rec_sections:
-        if data['recommendations'][key]:
-            html += f"""
-        
-        <h3>{title}:</h3>
-        <ol>"""
-            for rec in data['recommendations'][key]:
-                html += f"\n            <li>{rec}</li>"
-            html += """
-        </ol>"""
-    
-    html += """
-    </div>
+    The stylesheet is inlined unless ``css_href`` links a shared copy.
+    """
+    return ''.join(report_template().generate(**_template_context(data, config, css_href)))
 
-    <div class="focus-areas">
-        <h2>Focus Areas for Future PRs</h2>
-        <p>Based on your learning goals of clean code and FastAPI patterns:</p>"""
-    
-    # Add focus areas
-    focus_sections = [
-        ('clean_code', 'Clean Code Principles'),
-        ('fastapi', 'FastAPI Best Practices'),
-        ('api_construction', 'API Construction Patterns')
-    ]
-    
-    for key, title in focus_sections:
-        if data['focus_areas'][key]:
-            html += f"""
-
-        <h3>{title}:</h3>
-        <ul>"""
-            for item in data['focus_areas'][key]:
-                html += f"\n            <li>{item}</li>"
-            html += """
-        </ul>"""
-    
-    html += """
-    </div>
 
-    <div class="conclusion">
-        <h2>Conclusion</h2>"""
-    
-    if data['conclusion'].strip():
-        html += f"\n        <p>{data['conclusion'].strip()}</p>"
-    else:
-        html += """
-        <p>The analysis shows strong technical implementation skills with room for improvement in code organization, consistency, and leveraging existing patterns. The team provides excellent feedback that, when systematically applied, will lead to cleaner, more maintainable FastAPI code.</p>
-
-        <h3>Next Steps:</h3>
-        <ol>
-            <li>Implement the immediate actions listed above</li>
-            <li>Apply these patterns to future PRs</li>
-            <li>Consider creating a team coding standards document based on these patterns</li>
-        </ol>"""
-    
-    html += """
-    </div>
-</body>
-</html>"""
-    
-    return html
+def write_html(data: dict, config: dict, html_path: Path, css_href: str = None) -> Path:
+    """Render the report template straight into ``html_path``."""
+    with atomic_open(html_path, encoding='utf-8') as f:
+        for chunk in report_template().generate(**_template_context(data, config, css_href)):
+            f.write(chunk)
+    return html_path
+
+
+PDF_BACKENDS = ('auto', 'weasyprint', 'wkhtmltopdf')
+
+WKHTMLTOPDF_OPTIONS = (
+    '--page-size', 'Letter',
+    '--margin-top', '1in',
+    '--margin-bottom', '1in',
+    '--margin-left', '1in',
+    '--margin-right', '1in',
+    '--print-media-type',
+)
+
 
-def convert_html_to_pdf(html_file: Path, pdf_file: Path) -> bool:
-    """Convert HTML to PDF using weasyprint or wkhtmltopdf."""
+def wkhtmltopdf_options(shared_css: Path = None) -> tuple:
+    """Command-line options, letting reports load ``shared_css`` and nothing else local.
+
+    0.12.6 blocks local files other than the input by default; ``--allow``
+    opens only the stylesheet's directory rather than the whole file system.
+    """
+    if shared_css is None:
+        return WKHTMLTOPDF_OPTIONS
+    return (*WKHTMLTOPDF_OPTIONS, '--allow', str(Path(shared_css).parent.absolute()))
+
+# Files handed to one wkhtmltopdf process in batch mode
+WKHTMLTOPDF_BATCH_SIZE = 50
+
+
+def convert_html_to_pdf(html_file: Path, pdf_file: Path, backend: str = 'auto', shared_css: Path = None,
+                        pages: dict = None) -> bool:
+    """Convert HTML to PDF using weasyprint or wkhtmltopdf.
+
+    ``backend`` forces one renderer; ``'auto'`` tries weasyprint first and
+    falls back to wkhtmltopdf.  ``shared_css`` is the stylesheet the report
+    links instead of inlining (see ``convert_summaries``).  weasyprint's page
+    count is stored in ``pages[html_file]`` when a dict is given.
+    """
     
     # Try weasyprint first (better CSS support)
-    try:
-        import weasyprint
-        weasyprint.HTML(filename=str(html_file)).write_pdf(str(pdf_file))
-        return True
-    except ImportError:
-        pass
+    if backend in ('auto', 'weasyprint'):
+        try:
+            import weasyprint
+        except (ImportError, OSError):
+            # OSError: weasyprint is installed but its Pango libraries are not
+            weasyprint = None
+        if weasyprint is not None:
+            # Render and write errors are this file's failure, not a reason to fall back
+            with span('css layout', file=html_file):
+                if shared_css is None:
+                    document = weasyprint.HTML(filename=str(html_file)).render()
+                else:
+                    document = weasyprint.HTML(filename=str(html_file), url_fetcher=_shared_css_fetcher).render(
+                        stylesheets=[report_stylesheet()]
+                    )
+            with span('pdf write', file=pdf_file):
+                document.write_pdf(str(pdf_file))
+            if pages is not None:
+                pages[html_file] = len(document.pages)
+            return True
     
     # Try wkhtmltopdf as fallback
-    try:
-        result = subprocess.run([
-            'wkhtmltopdf',
-            '--page-size', 'Letter',
-            '--margin-top', '1in',
-            '--margin-bottom', '1in',
-            '--margin-left', '1in',
-            '--margin-right', '1in',
-            '--print-media-type',
-            str(html_file),
-            str(pdf_file)
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            return True
-        else:
-            print(f"wkhtmltopdf error: {result.stderr}")
-            return False
-    except FileNotFoundError:
-        pass
+    if backend in ('auto', 'wkhtmltopdf'):
+        try:
+            with span('wkhtmltopdf', file=html_file):
+                result = subprocess.run([
+                    'wkhtmltopdf',
+                    *wkhtmltopdf_options(shared_css),
+                    str(html_file),
+                    str(pdf_file)
+                ], capture_output=True, text=True)
+            
+            if result.returncode == 0:
+                return True
+            else:
+                print(f"wkhtmltopdf error: {result.stderr}")
+                return False
+        except FileNotFoundError:
+            pass
     
     print("Error: Neither weasyprint nor wkhtmltopdf is available")
     print("Install weasyprint with: pip install weasyprint")
     print("Or install wkhtmltopdf from: https://wkhtmltopdf.org/downloads.html")
     return False
 
+
+PDF_PAGE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+
+def pdf_page_count(pdf_file: Path):
+    """Count the page objects of a PDF, or None when none are visible.
+
+    Pages inside compressed object streams, as weasyprint writes them, are
+    not seen; this is for wkhtmltopdf output, whose page objects are plain.
+    weasyprint's count comes from the rendered document instead.
+    """
+    try:
+        pages = len(PDF_PAGE.findall(Path(pdf_file).read_bytes()))
+    except OSError:
+        return None
+    return pages or None
+
+
+def _init_pdf_worker():
+    """Import weasyprint once when a pool worker starts, not once per file."""
+    with suppress(ImportError, OSError):
+        import weasyprint  # noqa: F401
+
+
+def _convert_one_to_pdf(html_file: Path, pdf_file: Path, backend: str, shared_css: Path = None):
+    """Convert one file, returning ``(None or an error message, page count or None)``."""
+    pages = {}
+    try:
+        if convert_html_to_pdf(html_file, pdf_file, backend, shared_css, pages):
+            return None, pages.get(html_file)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", None
+    return "PDF generation failed", None
+
+
+REPORT_BASENAME = 'analysis-report'
+# Written by `pr-report analyze` next to each summary; feeds the Overview metrics
+PR_DATA_BASENAME = 'pr_data.json'
+
+
+def expand_summary_paths(patterns) -> list:
+    """Expand summary paths and glob patterns such as ``reports/*/summary.md``.
+
+    Literal paths are kept even when they do not exist so the caller can
+    report them; patterns contribute their sorted matches.  Duplicates are
+    dropped while keeping the first occurrence.
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        pattern = str(pattern)
+        if any(char in pattern for char in '*?['):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            path = Path(match)
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def load_config(config_path: Path) -> dict:
+    """Load config.json, warning and falling back to an empty config if missing."""
+    if not config_path.exists():
+        print(f"Warning: Config file not found: {config_path}")
+        return {}
+    with span('config load'), open(config_path) as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def weasyprint_available() -> bool:
+    """Whether weasyprint and its native libraries can be imported."""
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError):
+        return False
+    return True
+
+
+def _quote_wkhtmltopdf_arg(arg) -> str:
+    """Quote a path for a ``--read-args-from-stdin`` line."""
+    return '"' + str(arg).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+# stderr lines that make wkhtmltopdf exit 1 for a file, even though it wrote a PDF
+WKHTMLTOPDF_LOAD_ERROR = re.compile(r'(Error|Warning: (Failed to load|Blocked access))\b')
+
+
+def _wkhtmltopdf_documents(stderr: str, count: int):
+    """Split batch stderr into each document's lines, or None if it does not divide.
+
+    Every conversion starts its progress output with ``Loading pages``.
+    """
+    documents = []
+    for line in stderr.splitlines():
+        if line.startswith('Loading pages'):
+            documents.append([])
+        elif documents:
+            documents[-1].append(line)
+    return documents if len(documents) == count else None
+
+
+def convert_batch_with_wkhtmltopdf(jobs: list, shared_css: Path = None) -> dict:
+    """Convert several files with a single wkhtmltopdf process.
+
+    Each ``(html_file, pdf_file)`` pair is one line of ``--read-args-from-stdin``
+    input, so process start-up and engine initialization are paid once per
+    batch.  wkhtmltopdf only reports one exit status for the whole run, so
+    a file succeeds when a non-empty PDF was written and its part of stderr
+    has no load errors, the cases single-file mode sees as exit status 1.
+    Returns ``{html_file: None or error message}``.
+    """
+    for _, pdf_file in jobs:
+        Path(pdf_file).unlink(missing_ok=True)
+
+    lines = ''.join(
+        f"{_quote_wkhtmltopdf_arg(html_file)} {_quote_wkhtmltopdf_arg(pdf_file)}\n"
+        for html_file, pdf_file in jobs
+    )
+    try:
+        with span('wkhtmltopdf', files=len(jobs)):
+            result = subprocess.run(
+                ['wkhtmltopdf', *wkhtmltopdf_options(shared_css), '--read-args-from-stdin'],
+                input=lines, capture_output=True, text=True
+            )
+    except FileNotFoundError:
+        return {html_file: "wkhtmltopdf is not available" for html_file, _ in jobs}
+
+    stderr_lines = result.stderr.splitlines()
+    documents = _wkhtmltopdf_documents(result.stderr, len(jobs))
+    errors = {}
+    for i, (html_file, pdf_file) in enumerate(jobs):
+        pdf_file = Path(pdf_file)
+        own_lines = documents[i] if documents else [line for line in stderr_lines if str(html_file) in line]
+        load_errors = [line for line in own_lines if WKHTMLTOPDF_LOAD_ERROR.match(line)]
+        if pdf_file.exists() and pdf_file.stat().st_size > 0 and not load_errors:
+            errors[html_file] = None
+            continue
+        mentions = load_errors or [line for line in stderr_lines if str(html_file) in line]
+        errors[html_file] = "wkhtmltopdf error: " + (mentions[0] if mentions else result.stderr.strip() or "no output")
+    return errors
+
+
+def convert_many_with_wkhtmltopdf(jobs: list, workers: int = 1,
+                                  batch_size: int = WKHTMLTOPDF_BATCH_SIZE, shared_css: Path = None) -> dict:
+    """Convert many files with a few long-lived wkhtmltopdf processes.
+
+    Jobs are split into batches of at most ``batch_size`` and at least one
+    batch per worker; up to ``workers`` batches run at once.
+    """
+    if not jobs:
+        return {}
+    batches_wanted = max(max(1, workers), -(-len(jobs) // batch_size))
+    per_batch = -(-len(jobs) // batches_wanted)
+    batches = [jobs[i:i + per_batch] for i in range(0, len(jobs), per_batch)]
+
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for batch_errors in pool.map(functools.partial(convert_batch_with_wkhtmltopdf, shared_css=shared_css), batches):
+            errors.update(batch_errors)
+    return errors
+
+
+def pdf_worker_pool(workers: int) -> ProcessPoolExecutor:
+    """A pool of ``workers`` processes that import weasyprint once at start-up."""
+    return ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_pdf_worker)
+
+
+def convert_in_process_pool(jobs: list, workers: int, backend: str = 'auto', shared_css: Path = None,
+                            pages: dict = None, pool: ProcessPoolExecutor = None) -> dict:
+    """Convert files on a process pool of warm workers, one file per task.
+
+    PDF layout is CPU-bound, so files are spread over processes whose workers
+    import weasyprint once at start-up and then render many files each.
+    ``pool`` is a ``pdf_worker_pool`` kept warm by the caller across calls;
+    without one a pool of ``workers`` lives for this call only.
+    """
+    errors = {}
+    with nullcontext(pool) if pool is not None else pdf_worker_pool(min(workers, len(jobs))) as pool:
+        futures = {
+            pool.submit(_convert_one_to_pdf, html_file, pdf_file, backend, shared_css): html_file
+            for html_file, pdf_file in jobs
+        }
+        for future in as_completed(futures):
+            html_file = futures[future]
+            try:
+                errors[html_file], count = future.result()
+            except Exception as e:
+                # A worker that died (e.g. BrokenProcessPool) only fails its own files
+                errors[html_file] = f"{type(e).__name__}: {e}"
+                continue
+            if pages is not None and count:
+                pages[html_file] = count
+    return errors
+
+
+def convert_many_to_pdf(jobs: list, workers: int = 1, backend: str = 'auto', shared_css: Path = None,
+                        pages: dict = None, pool: ProcessPoolExecutor = None) -> dict:
+    """Convert ``(html_file, pdf_file)`` pairs to PDF.
+
+    weasyprint renders on ``pool`` when given, else on a process pool of its
+    own when ``workers > 1``; wkhtmltopdf,
+    whether forced or used as the fallback, renders in batches through a few
+    long-lived processes.  ``shared_css`` is the stylesheet every file links,
+    if any.  weasyprint page counts go into ``pages`` when a dict is given.
+    Returns ``{html_file: None or error message}``;
+    a failure in one file never stops the others.
+    """
+    if not jobs:
+        return {}
+
+    use_wkhtmltopdf = backend == 'wkhtmltopdf' or (backend == 'auto' and not weasyprint_available())
+    if use_wkhtmltopdf:
+        errors = convert_many_with_wkhtmltopdf(jobs, workers=workers, shared_css=shared_css)
+        if backend == 'auto' and all(e == "wkhtmltopdf is not available" for e in errors.values()):
+            print("Error: Neither weasyprint nor wkhtmltopdf is available")
+            print("Install weasyprint with: pip install weasyprint")
+            print("Or install wkhtmltopdf from: https://wkhtmltopdf.org/downloads.html")
+            errors = dict.fromkeys(errors, "Neither weasyprint nor wkhtmltopdf is available")
+        return errors
+
+    if pool is None and (workers <= 1 or len(jobs) <= 1):
+        errors = {}
+        for html_file, pdf_file in jobs:
+            errors[html_file], count = _convert_one_to_pdf(html_file, pdf_file, backend, shared_css)
+            if pages is not None and count:
+                pages[html_file] = count
+        return errors
+    return convert_in_process_pool(jobs, workers, backend, shared_css, pages, pool)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_json(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def template_version() -> str:
+    """Fingerprint of the renderer: template, stylesheet and RENDER_VERSION."""
+    env = report_template().environment
+    sources = [env.loader.get_source(env, name)[0] for name in ('report.html.j2', 'report.css')]
+    return _hash_json([RENDER_VERSION, *sources])
+
+
+def pdf_backend_name(backend: str) -> str:
+    """Resolve ``'auto'`` to the renderer that will actually be used."""
+    if backend == 'auto':
+        return 'weasyprint' if weasyprint_available() else 'wkhtmltopdf'
+    return backend
+
+
+@functools.lru_cache(maxsize=None)
+def metrics_available() -> bool:
+    """True when the optional NumPy metrics engine can be imported."""
+    try:
+        import pull_request_report.metrics  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def report_metrics(pr_data_path: Path, repo: str):
+    """Review metrics for the Overview, or None without pr_data.json or NumPy."""
+    if not metrics_available() or not pr_data_path.exists():
+        return None
+    from pull_request_report.metrics import metrics_from_file
+
+    try:
+        return metrics_from_file(pr_data_path, repo)
+    except ValueError as e:
+        print(f"Warning: skipping review metrics, {pr_data_path} is invalid: {e}")
+        return None
+
+
+def report_patterns(pr_data_path: Path):
+    """Key Patterns clustered from review comments, or None when unavailable."""
+    if not metrics_available() or not pr_data_path.exists():
+        return None
+    from pull_request_report.patterns import patterns_from_file
+
+    try:
+        return patterns_from_file(pr_data_path) or None
+    except ValueError as e:
+        print(f"Warning: keeping summary patterns, {pr_data_path} is invalid: {e}")
+        return None
+
+
+def engineering_docs_path(config: dict, rule_index: Path = None):
+    """Standards source for an enabled ``engineering_docs``: its local ``path``
+    (a markdown file or directory), else ``rule_index`` (the index
+    ``sync-docs``/``analyze`` keep under the reports directory) if present."""
+    docs = config.get('engineering_docs') or {}
+    if not docs.get('enabled'):
+        return None
+    if docs.get('path'):
+        return Path(docs['path'])
+    return Path(rule_index) if rule_index is not None and Path(rule_index).exists() else None
+
+
+def _docs_digest(path: Path) -> str:
+    if path.is_dir():
+        return _hash_json([[str(doc.relative_to(path)), _file_digest(doc)] for doc in sorted(path.rglob('*.md'))])
+    return _file_digest(path)
+
+
+@functools.lru_cache(maxsize=4)
+def _compile_standards(docs_path: Path, digest: str):  # noqa: ARG001 - digest keys the cache on content
+    from pull_request_report.standards import StandardsIndex
+
+    return StandardsIndex.from_file(docs_path)
+
+
+def load_standards_index(config: dict, rule_index: Path = None):
+    """The configured engineering standards, compiled once per document version.
+
+    Returns None when ``engineering_docs`` is disabled, has neither a local
+    path nor a synced ``rule_index``, or the path does not exist.
+    """
+    docs_path = engineering_docs_path(config, rule_index)
+    if docs_path is None:
+        return None
+    if not docs_path.exists():
+        print(f"Warning: engineering docs not found: {docs_path}")
+        return None
+    return _compile_standards(docs_path, _docs_digest(docs_path))
+
+
+def report_standards(index, pr_data_path: Path):
+    """Standards Compliance text tallied from review comments, or None when unavailable."""
+    if index is None or not pr_data_path.exists():
+        return None
+    from pull_request_report.standards import standards_from_file
+
+    try:
+        return standards_from_file(index, pr_data_path) or None
+    except ValueError as e:
+        print(f"Warning: keeping summary standards compliance, {pr_data_path} is invalid: {e}")
+        return None
+
+
+def html_cache_key(summary_path: Path, config: dict, derive_patterns: bool = False, css_href: str = None,
+                   rule_index: Path = None) -> str:
+    """Hash everything that determines the HTML for one summary."""
+    pr_data_path = summary_path.parent / PR_DATA_BASENAME
+    docs_path = engineering_docs_path(config, rule_index)
+    uses_pr_data = metrics_available() or docs_path is not None
+    pr_data = _file_digest(pr_data_path) if uses_pr_data and pr_data_path.exists() else None
+    inputs = [_file_digest(summary_path), pr_data, render_config_fields(config), template_version()]
+    if derive_patterns:
+        inputs.append('derive_patterns')
+    if css_href:
+        inputs.append(['css_href', css_href])
+    if docs_path is not None and docs_path.exists():
+        inputs.append(['engineering_docs', _docs_digest(docs_path)])
+    return _hash_json(inputs)
+
+
+def pdf_cache_key(html_key: str, backend: str) -> str:
+    """Hash everything that determines the PDF rendered from that HTML."""
+    return _hash_json([html_key, pdf_backend_name(backend)])
+
+
+def read_manifest(manifest_path: Path) -> dict:
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def convert_summaries(summary_paths: list, config: dict, output: str = None, pdf: bool = True,
+                      workers: int = 1, backend: str = 'auto', force: bool = False,
+                      derive_patterns: bool = False, shared_css: bool = False, css_root: Path = None,
+                      rule_index: Path = None, pdf_pool: ProcessPoolExecutor = None) -> list:
+    """Parse and render every summary in this process.
+
+    The compiled template, stylesheet, config and PDF backend are shared by
+    all reports, and PDFs are rendered by ``workers`` processes, or by the
+    warm ``pdf_pool`` when the caller keeps one across calls.  Outputs go
+    next to each summary as ``analysis-report.html`` and ``.pdf`` unless
+    ``output`` names a prefix for a single summary.
+
+    A ``<prefix>.manifest.json`` beside the outputs records the hash of their
+    inputs; outputs whose hash still matches are reused without parsing,
+    rendering or PDF conversion unless ``force`` is set.
+
+    With ``derive_patterns`` the Key Patterns come from clustering the review
+    comments in ``pr_data.json`` instead of the summary's own list, whenever
+    that file and NumPy are available.  When ``engineering_docs`` is enabled
+    with a local ``path``, or synced into ``rule_index``, the standards there
+    are compiled once and the Standards Compliance section is tallied from
+    the review comments each standard matches.
+
+    With ``shared_css`` every report links one ``report.<hash>.css`` written
+    into ``css_root`` (by default the deepest directory holding all the
+    reports) instead of inlining the stylesheet, and weasyprint renders
+    the PDFs with a copy of it parsed once per process.  Returns one result
+    dict per summary with ``html``, ``pdf``, ``error`` and the list of
+    ``cached`` outputs.
+    """
+    import jinja2
+
+    if output and len(summary_paths) > 1:
+        raise ValueError("--output can only be used with a single summary")
+
+    prefixes = [Path(output) if output else summary_path.parent / REPORT_BASENAME for summary_path in summary_paths]
+    css_path = None
+    if shared_css and prefixes:
+        root = css_root or os.path.commonpath([prefix.parent.absolute() for prefix in prefixes])
+        css_path = write_shared_css(root)
+
+    results = []
+    pdf_jobs = []
+    for summary_path, prefix in zip(summary_paths, prefixes):
+        html_path = Path(f"{prefix}.html")
+        css_href = shared_css_href(css_path, html_path) if css_path else None
+        result = {
+            'summary': summary_path, 'html': None, 'pdf': None, 'error': None, 'cached': [],
+            'manifest': Path(f"{prefix}.manifest.json"),
+        }
+        results.append(result)
+        try:
+            result['html_key'] = html_cache_key(summary_path, config, derive_patterns, css_href, rule_index)
+            manifest = {} if force else read_manifest(result['manifest'])
+            if manifest.get('html_key') == result['html_key'] and html_path.exists():
+                result['html'] = html_path
+                result['cached'].append('html')
+            else:
+                manifest = {}
+                with span('parse', summary=summary_path), open(summary_path, encoding='utf-8') as f:
+                    data = parse_markdown_summary(f)
+                with span('metrics', summary=summary_path):
+                    repo = render_config_fields(config)['repository'] or summary_path.parent.name
+                    data['metrics'] = report_metrics(summary_path.parent / PR_DATA_BASENAME, repo)
+                if derive_patterns:
+                    with span('patterns', summary=summary_path):
+                        data['patterns'] = report_patterns(summary_path.parent / PR_DATA_BASENAME) or data['patterns']
+                with span('standards', summary=summary_path):
+                    compliance = report_standards(load_standards_index(config, rule_index), summary_path.parent / PR_DATA_BASENAME)
+                data['standards_compliance'] = compliance or data['standards_compliance']
+                with span('render', summary=summary_path):
+                    result['html'] = write_html(data, config, html_path, css_href)
+        except OSError as e:
+            result['error'] = str(e)
+            continue
+        except (ValueError, KeyError, jinja2.TemplateError) as e:
+            # A summary that is not UTF-8, a repository entry without a name, a template error...
+            result['error'] = f"{type(e).__name__}: {e}"
+            continue
+
+        if pdf:
+            pdf_path = Path(f"{prefix}.pdf")
+            result['pdf_key'] = pdf_cache_key(result['html_key'], backend)
+            if manifest.get('pdf_key') == result['pdf_key'] and pdf_path.exists():
+                result['pdf'] = pdf_path
+                result['cached'].append('pdf')
+            else:
+                pdf_jobs.append((result, pdf_path))
+
+    page_counts = {}
+    with span('pdf', files=len(pdf_jobs)) if pdf_jobs else nullcontext():
+        errors = convert_many_to_pdf(
+            [(result['html'], pdf_path) for result, pdf_path in pdf_jobs], workers=workers, backend=backend,
+            shared_css=css_path, pages=page_counts, pool=pdf_pool,
+        )
+    for result, pdf_path in pdf_jobs:
+        error = errors.get(result['html'])
+        if error is None:
+            result['pdf'] = pdf_path
+            pages = (page_counts.get(result['html']) or pdf_page_count(pdf_path)) if prometheus.enabled() else None
+            if pages:
+                prometheus.observe('pr_report_pdf_pages', pages)
+        else:
+            result['error'] = f"{error}. HTML report is available."
+
+    for result in results:
+        if result['html'] is not None:
+            manifest = {'html_key': result['html_key'], 'html': str(result['html'])}
+            if result['pdf'] is not None:
+                manifest.update(pdf_key=result['pdf_key'], pdf=str(result['pdf']))
+            atomic_write_json(result['manifest'], manifest)
+    return results
+
+
 def main():
-    parser = argparse.ArgumentParser(description='Convert PR analysis summary to HTML and PDF')
-    parser.add_argument('--summary', '-s', 
-                       default='reports/paxton-app-api/summary.md',
-                       help='Path to markdown summary file')
+    parser = argparse.ArgumentParser(description='Convert PR analysis summaries to HTML and PDF')
+    parser.add_argument('--summary', '-s', nargs='+',
+                       default=['reports/paxton-app-api/summary.md'],
+                       help='Markdown summary files or glob patterns (e.g. "reports/*/summary.md")')
     parser.add_argument('--config', '-c',
                        default='config.json',
                        help='Path to config.json file')
     parser.add_argument('--output', '-o',
-                       default='reports/paxton-app-api/analysis-report',
-                       help='Output file prefix (without extension)')
+                       default=None,
+                       help='Output file prefix (without extension) for a single summary; '
+                            'defaults to analysis-report next to each summary')
     parser.add_argument('--html-only', action='store_true',
                        help='Generate only HTML, skip PDF conversion')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Number of processes rendering PDFs in parallel')
+    parser.add_argument('--backend', choices=PDF_BACKENDS, default='auto',
+                       help='PDF renderer to use (default: weasyprint, falling back to wkhtmltopdf)')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render even when the summary, config and template are unchanged')
+    parser.add_argument('--derive-patterns', action='store_true',
+                       help='Build Key Patterns by clustering review comments in pr_data.json')
+    parser.add_argument('--shared-css', action='store_true',
+                       help='Link one report.<hash>.css shared by every report instead of inlining the stylesheet')
+    parser.add_argument('--reports-dir', default='reports',
+                       help='Reports directory whose .cache holds the rule index synced from engineering_docs')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print how long each stage took')
+    parser.add_argument('--profile-stats', default=None, metavar='PATH',
+                       help='Also write cProfile stats to PATH (read with python -m pstats)')
+    parser.add_argument('--trace', default=None, metavar='PATH',
+                       help='Also write a Chrome trace-event JSON file to PATH')
     
     args = parser.parse_args()
     
-    # Read input files
-    summary_path = Path(args.summary)
-    config_path = Path(args.config)
-    
-    if not summary_path.exists():
-        print(f"Error: Summary file not found: {summary_path}")
+    summary_paths = expand_summary_paths(args.summary)
+    missing = [path for path in summary_paths if not path.exists()]
+    if not summary_paths or missing:
+        for path in missing or args.summary:
+            print(f"Error: Summary file not found: {path}")
+        sys.exit(1)
+    if args.output and len(summary_paths) > 1:
+        print("Error: --output can only be used with a single summary")
         sys.exit(1)
     
-    if not config_path.exists():
-        print(f"Warning: Config file not found: {config_path}")
-        config = {}
-    else:
-        with open(config_path) as f:
-            config = json.load(f)
-    
-    # Parse markdown
-    with open(summary_path) as f:
-        content = f.read()
-    
-    data = parse_markdown_summary(content)
-    
-    # Generate HTML
-    html_content = generate_html(data, config)
-    
-    # Write HTML file
-    html_path = Path(f"{args.output}.html")
-    html_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(html_path, 'w') as f:
-        f.write(html_content)
-    
-    print(f"HTML report generated: {html_path}")
-    
-    # Generate PDF
-    if not args.html_only:
-        pdf_path = Path(f"{args.output}.pdf")
-        if convert_html_to_pdf(html_path, pdf_path):
-            print(f"PDF report generated: {pdf_path}")
-        else:
-            print("PDF generation failed. HTML report is available.")
-            sys.exit(1)
+    from pull_request_report.docs_sync import rule_index_path
+
+    profile = args.profile or args.profile_stats or args.trace
+    with profiling(args.profile_stats, args.trace) if profile else nullcontext() as profiler:
+        config = load_config(Path(args.config))
+        results = convert_summaries(summary_paths, config, output=args.output, pdf=not args.html_only,
+                                    workers=args.workers, backend=args.backend, force=args.force,
+                                    derive_patterns=args.derive_patterns, shared_css=args.shared_css,
+                                    rule_index=rule_index_path(args.reports_dir))
+    if profiler:
+        from rich.console import Console
+
+        Console().print(profile_table(profiler))
+    
+    failed = 0
+    for result in results:
+        for kind in ('html', 'pdf'):
+            if result[kind]:
+                state = "unchanged" if kind in result['cached'] else "generated"
+                print(f"{kind.upper()} report {state}: {result[kind]}")
+        if result['error']:
+            failed += 1
+            print(f"{result['summary']}: {result['error']}")
+    
+    if failed:
+        sys.exit(1)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
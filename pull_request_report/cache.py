@@ -0,0 +1,166 @@
+"""
+Persistent HTTP cache for GitHub API responses
+
+Entries are keyed by repository, PR number and endpoint and keep the response
+body together with its ETag/Last-Modified validators, so repeat runs can send
+conditional requests and reuse the body on a 304.
+
+Closed and merged PRs are effectively immutable: their entries live under
+``closed/`` and are served without any request and never evicted.  Everything
+else lives under ``open/``, is revalidated once older than the TTL (PR list
+pages on every run, see ``PRFetcher.api``), and is evicted
+least-recently-used first when the cap is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import prometheus
+
+DEFAULT_CACHE_DIR = Path("reports") / ".cache"
+DEFAULT_TTL = 3600
+DEFAULT_MAX_OPEN_ENTRIES = 5000
+
+
+# Read once at import: os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_mode(path: Path) -> int:
+    """The existing file's permissions, else what a plain ``open`` would create"""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w", encoding: str = None):
+    """Open a temp file that replaces ``path`` only once the block completes"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp creates 0600; keep the mode other readers of the file expect
+        os.chmod(tmp, _file_mode(path))
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_json(path: Path, data, indent: int = None) -> None:
+    """Write JSON through a temp file and rename so readers never see partial files"""
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=indent)
+
+
+class ResponseCache:
+    """On-disk ETag/Last-Modified cache under ``reports/.cache/``."""
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        ttl: float = DEFAULT_TTL,
+        max_open_entries: int = DEFAULT_MAX_OPEN_ENTRIES,
+    ):
+        self.root = Path(root) / "http"
+        self.ttl = ttl
+        self.max_open_entries = max_open_entries
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, bucket: str, repo: str, pr_number, endpoint: str) -> Path:
+        digest = hashlib.sha1(endpoint.encode()).hexdigest()[:16]
+        pr_dir = str(pr_number) if pr_number is not None else "_repo"
+        return self.root / bucket / repo.replace("/", "__") / pr_dir / f"{digest}.json"
+
+    def get(self, repo: str, pr_number, endpoint: str):
+        """Return the cached entry, preferring the immutable copy, or None."""
+        for bucket in ("closed", "open"):
+            path = self._path(bucket, repo, pr_number, endpoint)
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if bucket == "open":
+                # mtime doubles as the LRU clock
+                os.utime(path)
+            return entry
+        return None
+
+    def is_fresh(self, entry: dict) -> bool:
+        """True when the entry can be used without asking GitHub at all."""
+        return entry.get("immutable") or time.time() - entry["fetched_at"] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry) -> dict:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, repo, pr_number, endpoint, body, headers=None, immutable=False) -> dict:
+        """Store a response body with its validators."""
+        headers = headers or {}
+        entry = {
+            "repo": repo,
+            "pr_number": pr_number,
+            "endpoint": endpoint,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time(),
+            "immutable": bool(immutable),
+            "body": body,
+        }
+        bucket = "closed" if immutable else "open"
+        atomic_write_json(self._path(bucket, repo, pr_number, endpoint), entry)
+        if immutable:
+            # A PR that just closed leaves a stale open copy behind
+            self._path("open", repo, pr_number, endpoint).unlink(missing_ok=True)
+        return entry
+
+    def refresh(self, entry: dict, immutable=False) -> dict:
+        """Record a successful 304 revalidation."""
+        return self.put(
+            entry["repo"],
+            entry["pr_number"],
+            entry["endpoint"],
+            entry["body"],
+            {"etag": entry.get("etag"), "last-modified": entry.get("last_modified")},
+            immutable=immutable or entry.get("immutable"),
+        )
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+        prometheus.inc("pr_report_cache_requests_total", result=outcome)
+
+    def prune(self) -> int:
+        """Evict least-recently-used open entries beyond the cap."""
+        open_root = self.root / "open"
+        if not open_root.exists():
+            return 0
+        entries = [(p.stat().st_mtime, p) for p in open_root.rglob("*.json")]
+        excess = len(entries) - self.max_open_entries
+        if excess <= 0:
+            return 0
+        entries.sort()
+        for _, path in entries[:excess]:
+            path.unlink(missing_ok=True)
+        return excess
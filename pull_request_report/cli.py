@@ -1,58 +1,147 @@
 #!/usr/bin/env python3
 """
 Main CLI interface for Pull Request Report tool
+
+Only typer is imported up front.  rich, json and the analysis modules load
+inside the commands that use them, because ``pr-report`` runs from shell
+loops and pre-commit hooks where startup time dominates.
 """
 
-import typer
+import functools
+from contextlib import contextmanager
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-import subprocess
-import sys
+from typing import List
+
+import typer
 
 app = typer.Typer(
     name="pr-report",
     help="AI-powered code review analysis tool",
     rich_markup_mode="rich"
 )
-console = Console()
 
 
-def check_requirements():
-    """Check if required tools are available"""
-    missing = []
-    
-    # Check GitHub CLI
-    try:
-        subprocess.run(["gh", "--version"], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        missing.append("GitHub CLI (gh)")
-    
-    # Check wkhtmltopdf for PDF generation
-    try:
-        subprocess.run(["wkhtmltopdf", "--version"], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # This is optional, weasyprint can be used instead
-        pass
-    
+@functools.lru_cache(maxsize=None)
+def get_console():
+    """Create the rich console on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+INSTALL_HINTS = {
+    "gh": "GitHub CLI (gh): https://github.com/cli/cli#installation",
+}
+
+
+def check_requirements(tools=("gh",)):
+    """Check if required tools are available
+
+    Discovery results are cached by PATH and executable mtime, so repeat runs
+    do not spawn ``<tool> --version``.
+    """
+    from .tools import find_tools
+
+    missing = [name for name, info in find_tools(tools).items() if info is None]
     if missing:
+        console = get_console()
         console.print("\n[red]Missing required tools:[/red]")
         for tool in missing:
-            if tool == "GitHub CLI (gh)":
-                console.print(f"  • {tool}: https://github.com/cli/cli#installation")
+            console.print(f"  • {INSTALL_HINTS.get(tool, tool)}")
         console.print("\n[yellow]Please install the missing tools and try again.[/yellow]")
         return False
-    
+
     return True
 
 
+def load_config(path: Path) -> dict:
+    """Load config.json, returning an empty config when it does not exist"""
+    import json
+
+    from .profiling import span
+
+    if not path.exists():
+        return {}
+    with span("config load"), open(path) as f:
+        return json.load(f)
+
+
+def save_config(cfg: dict, path: Path) -> None:
+    from .cache import atomic_write_json
+
+    atomic_write_json(path, cfg, indent=2)
+
+
+@contextmanager
+def _profiled(stats_path: Path = None, trace_path: Path = None):
+    """Profile the block and print the per-stage table when it ends, even on failure."""
+    from .profiling import profile_table, profiling
+
+    console = get_console()
+    try:
+        with profiling(stats_path, trace_path) as profiler:
+            yield profiler
+    finally:
+        console.print(profile_table(profiler))
+        if stats_path:
+            console.print(f"  📈 cProfile stats: {stats_path} (python -m pstats {stats_path})")
+        if trace_path:
+            console.print(f"  🧭 Trace: {trace_path} (open in https://ui.perfetto.dev or chrome://tracing)")
+
+
+def start_profiling(ctx: typer.Context, profile: bool, stats_path: Path, trace_path: Path) -> None:
+    """Profile the rest of the command when any profiling option was given."""
+    if profile or stats_path or trace_path:
+        ctx.with_resource(_profiled(stats_path, trace_path))
+
+
+@contextmanager
+def _exported(textfile: Path = None, port: int = None):
+    """Collect Prometheus metrics for the block, served on ``port`` and/or written to ``textfile``."""
+    from .prometheus import exporting
+
+    console = get_console()
+    with exporting(textfile, port) as exporter:
+        if exporter.url:
+            console.print(f"  📊 Metrics at {exporter.url}")
+        yield exporter
+    if textfile:
+        console.print(f"  📊 Metrics written to {textfile}")
+
+
+def start_metrics(ctx: typer.Context, textfile: Path, port: int) -> None:
+    """Export metrics for the rest of the command when ``--metrics-file`` or ``--metrics-port`` was given."""
+    if textfile or port is not None:
+        ctx.with_resource(_exported(textfile, port))
+
+
+PROFILE_HELP = "Print how long each stage took"
+PROFILE_STATS_HELP = "Also write cProfile stats to this file (read with python -m pstats)"
+TRACE_HELP = "Also write a Chrome trace-event JSON file here"
+METRICS_FILE_HELP = "Write Prometheus metrics to this .prom file for node_exporter's textfile collector"
+METRICS_PORT_HELP = "Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics during the run (0 picks a port)"
+SHARED_CSS_HELP = "Link one content-hashed report.<hash>.css shared by every report instead of inlining the stylesheet"
+
+
+def _rate_limit_line(limiter) -> str:
+    remaining = f", {limiter.remaining} calls left in this window" if limiter.remaining is not None else ""
+    return f"waited {limiter.waited:.1f}s, {limiter.throttled} throttled calls retried{remaining}"
+
+
+def _docs_sync_line(result: dict) -> str:
+    parsed = f"{len(result['changed'])} files re-parsed" if result["changed"] else "unchanged"
+    return f"{result['rules']} rules at {result['commit'][:8]} ({parsed})"
+
+
 @app.command()
 def setup():
     """Interactive setup for configuring repositories and preferences"""
     if not check_requirements():
         raise typer.Exit(1)
-    
+
+    from rich.panel import Panel
+
+    console = get_console()
     console.print(Panel.fit(
         "🚀 [bold blue]Pull Request Report Setup[/bold blue]\n"
         "Let's configure your repositories and analysis preferences.",
@@ -66,42 +155,392 @@ def setup():
 
 @app.command()
 def analyze(
+    ctx: typer.Context,
     repo: str = typer.Option(None, "--repo", "-r", help="Repository to analyze (owner/repo)"),
-    count: int = typer.Option(10, "--count", "-c", help="Number of PRs to analyze"),
+    count: int = typer.Option(None, "--count", "-c", help="Number of PRs to analyze [default: pr_limit from config, or 10]; --incremental runs take every PR since the last run"),
     author: str = typer.Option(None, "--author", "-a", help="Filter by PR author"),
+    jobs: int = typer.Option(8, "--jobs", "-j", help="Maximum number of concurrent gh api calls"),
+    config: Path = typer.Option("config.json", "--config", help="Path to config.json file"),
+    reports_dir: Path = typer.Option("reports", "--reports-dir", help="Directory to write PR data into"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore the reports/.cache response cache"),
+    cache_ttl: int = typer.Option(3600, "--cache-ttl", help="Seconds before open PR data is revalidated (PR lists always are)"),
+    incremental: bool = typer.Option(False, "--incremental", "-i", help="Only fetch PRs newer than the last run and merge them in"),
+    store: Path = typer.Option(None, "--store", help="Also load fetched PRs into this SQLite history store"),
+    resume: bool = typer.Option(False, "--resume", help="Skip repositories the last run already fetched"),
+    api: str = typer.Option("rest", "--api", help="GitHub API to fetch through: rest, or graphql for a few bulk queries per repository"),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_HELP),
+    profile_stats: Path = typer.Option(None, "--profile-stats", help=PROFILE_STATS_HELP),
+    trace: Path = typer.Option(None, "--trace", help=TRACE_HELP),
+    metrics_file: Path = typer.Option(None, "--metrics-file", help=METRICS_FILE_HELP),
+    metrics_port: int = typer.Option(None, "--metrics-port", help=METRICS_PORT_HELP),
 ):
     """Analyze pull requests and generate reports"""
     if not check_requirements():
         raise typer.Exit(1)
-        
-    console.print(f"🔍 Analyzing {count} PRs" + (f" from {repo}" if repo else ""))
-    # Implementation would go here
+    start_profiling(ctx, profile, profile_stats, trace)
+    start_metrics(ctx, metrics_file, metrics_port)
+
+    from . import prometheus
+    from .cache import ResponseCache
+    from .fetch import FETCH_APIS, make_fetcher, read_pr_data, repo_slug, write_pr_data
+    from .incremental import HighWaterMarks, merge_pr_data
+    from .pipeline import PipelineState
+    from .profiling import span
+    from .ratelimit import RateLimiter
+
+    console = get_console()
+
+    cfg = load_config(config)
+    settings = cfg.get("analysis_settings", {})
+    if repo:
+        targets = {repo_slug(repo): repo_slug(repo).split("/")[-1]}
+    else:
+        targets = {repo_slug(r): r.get("name") or repo_slug(r).split("/")[-1]
+                   for r in cfg.get("repositories", [])}
+    if not targets:
+        console.print("[red]No repositories to analyze.[/red] Pass --repo or add repositories to config.json.")
+        raise typer.Exit(1)
+
+    if (cfg.get("engineering_docs") or {}).get("enabled"):
+        from .docs_sync import DocsSyncError, docs_cache_dir, sync_docs
+
+        # config.json is left alone here; only sync-docs records last_synced in it
+        try:
+            docs = sync_docs(cfg, docs_cache_dir(reports_dir))
+            if docs:
+                console.print(f"📚 Engineering docs: {_docs_sync_line(docs)}")
+        except DocsSyncError as e:
+            console.print(f"[yellow]⚠ Engineering docs not synced:[/yellow] {e}")
+
+    if api not in FETCH_APIS:
+        console.print(f"[red]Unknown API {api!r}.[/red] Choose from: {', '.join(FETCH_APIS)}")
+        raise typer.Exit(1)
+
+    count = count or settings.get("pr_limit", 10)
+    fetcher = make_fetcher(
+        api,
+        jobs=jobs,
+        count=count,
+        author=author or settings.get("author"),
+        include_drafts=settings.get("include_draft_prs", False),
+        include_closed=settings.get("include_closed_prs", True),
+        cache=None if no_cache else ResponseCache(reports_dir / ".cache", ttl=cache_ttl),
+        limiter=RateLimiter(burst=jobs),
+    )
+
+    marks = HighWaterMarks(reports_dir / ".state" / "high_water_marks.json") if incremental else None
+    history = None
+    if store:
+        from .store import PRStore
+
+        history = PRStore(store)
+    state = PipelineState(reports_dir / ".state" / "analyze.json")
+    if resume:
+        done = [slug for slug, name in targets.items()
+                if state.finished(slug, "fetch", reports_dir / name / "pr_data.json")]
+        for slug in done:
+            console.print(f"  [green]= {slug}[/green]: fetched by the last run")
+            del targets[slug]
+    else:
+        state.reset(targets)
+    since = {slug: marks.get(slug) for slug in targets} if marks else None
+
+    console.print(f"🔍 Analyzing {count} PRs from {len(targets)} repositories ({jobs} jobs)"
+                  + (" via GraphQL" if api == "graphql" else "") + (" (incremental)" if incremental else ""))
+    with span("fetch", repositories=len(targets)):
+        results = fetcher.fetch_all(list(targets), since=since)
+
+    failed = 0
+    for slug, data in results.items():
+        if "error" in data:
+            failed += 1
+            state.record(slug, "fetch", "failed", error=data["error"])
+            prometheus.inc("pr_report_failures_total", repo=slug, stage="fetch")
+            console.print(f"  [red]✗ {slug}[/red]: {data['error']}")
+            continue
+
+        repo_dir = reports_dir / targets[slug]
+        new_prs = len(data["pr_list"])
+        if marks:
+            # The delta alone feeds the summary update; pr_data.json keeps the full history
+            write_pr_data(data, repo_dir / "pr_data.new.json")
+            existing = read_pr_data(repo_dir / "pr_data.json")
+            data = merge_pr_data(existing, data)
+            marks.advance(slug, data["pr_list"])
+
+        path = write_pr_data(data, repo_dir / "pr_data.json")
+        if history:
+            history.ingest(slug, data)
+        state.record(slug, "fetch", "done", output=path, prs=[pr["number"] for pr in data["pr_list"]])
+        console.print(f"  [green]✓ {slug}[/green]: {new_prs} new PRs, "
+                      f"{len(data['comments'])} comments, {len(data['reviews'])} reviews → {path}")
+
+    state.compact()
+    if marks:
+        marks.save()
+    if history:
+        history.close()
+        console.print(f"  🗄  History store: {store}")
+
+    if fetcher.cache is not None:
+        cache = fetcher.cache
+        console.print(f"  💾 Cache: {cache.hits} hits, {cache.revalidated} not modified, {cache.misses} downloaded")
+    if fetcher.limiter.waited >= 1 or fetcher.limiter.throttled:
+        console.print(f"  ⏱  Rate limit: {_rate_limit_line(fetcher.limiter)}")
+
+    if failed:
+        console.print(f"[red]❌ {failed} repositories failed.[/red] Re-run with --resume to fetch only those.")
+        raise typer.Exit(1)
     console.print("[green]✅ Analysis completed![/green]")
 
 
 @app.command()
 def convert(
-    summary: Path = typer.Option("reports/*/summary.md", "--summary", "-s", help="Path to summary markdown file"),
-    output: str = typer.Option(None, "--output", "-o", help="Output file prefix"),
+    ctx: typer.Context,
+    summary: List[str] = typer.Option(["reports/*/summary.md"], "--summary", "-s", help="Summary markdown files or glob patterns"),
+    output: str = typer.Option(None, "--output", "-o", help="Output file prefix (single summary only)"),
     pdf: bool = typer.Option(False, "--pdf", help="Also generate PDF"),
+    config: Path = typer.Option("config.json", "--config", help="Path to config.json file"),
+    workers: int = typer.Option(1, "--workers", "-w", help="Number of processes rendering PDFs in parallel"),
+    backend: str = typer.Option("auto", "--backend", help="PDF renderer: auto, weasyprint or wkhtmltopdf"),
+    force: bool = typer.Option(False, "--force", "-f", help="Re-render even when inputs are unchanged"),
+    derive_patterns: bool = typer.Option(
+        False, "--derive-patterns", help="Build Key Patterns by clustering review comments in pr_data.json"
+    ),
+    shared_css: bool = typer.Option(False, "--shared-css", help=SHARED_CSS_HELP),
+    reports_dir: Path = typer.Option(
+        "reports", "--reports-dir", help="Reports directory whose .cache holds the synced engineering docs rule index"
+    ),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_HELP),
+    profile_stats: Path = typer.Option(None, "--profile-stats", help=PROFILE_STATS_HELP),
+    trace: Path = typer.Option(None, "--trace", help=TRACE_HELP),
+    metrics_file: Path = typer.Option(None, "--metrics-file", help=METRICS_FILE_HELP),
+    metrics_port: int = typer.Option(None, "--metrics-port", help=METRICS_PORT_HELP),
 ):
-    """Convert markdown summary to styled HTML and optionally PDF"""
-    if not check_requirements():
+    """Convert markdown summaries to styled HTML and optionally PDF"""
+    import convert_to_pdf
+
+    from .docs_sync import rule_index_path
+
+    console = get_console()
+    start_profiling(ctx, profile, profile_stats, trace)
+    start_metrics(ctx, metrics_file, metrics_port)
+
+    summaries = convert_to_pdf.expand_summary_paths(summary)
+    missing = [path for path in summaries if not path.exists()]
+    if not summaries or missing:
+        console.print(f"[red]No summary files found:[/red] {', '.join(map(str, missing or summary))}")
+        raise typer.Exit(1)
+    if output and len(summaries) > 1:
+        console.print("[red]--output can only be used with a single summary.[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"🎨 Converting {len(summaries)} summaries to HTML" + (" and PDF..." if pdf else "..."))
+    if backend not in convert_to_pdf.PDF_BACKENDS:
+        console.print(f"[red]Unknown backend {backend!r}.[/red] Choose from: {', '.join(convert_to_pdf.PDF_BACKENDS)}")
+        raise typer.Exit(1)
+
+    results = convert_to_pdf.convert_summaries(
+        summaries, load_config(config), output=output, pdf=pdf, workers=workers, backend=backend, force=force,
+        derive_patterns=derive_patterns, shared_css=shared_css, rule_index=rule_index_path(reports_dir),
+    )
+
+    failed = 0
+    for result in results:
+        if result["error"]:
+            failed += 1
+            console.print(f"  [red]✗ {result['summary']}[/red]: {result['error']}")
+        else:
+            outputs = ", ".join(str(path) for path in (result["html"], result["pdf"]) if path)
+            unchanged = " (unchanged)" if len(result["cached"]) == 1 + bool(pdf) else ""
+            console.print(f"  [green]✓ {result['summary']}[/green] → {outputs}{unchanged}")
+
+    if failed:
+        console.print(f"[red]❌ {failed} conversions failed.[/red]")
         raise typer.Exit(1)
-        
-    console.print("🎨 Converting markdown to HTML...")
-    if pdf:
-        console.print("📄 Generating PDF...")
-    
-    # Implementation would go here
     console.print("[green]✅ Conversion completed![/green]")
 
 
+@app.command()
+def run(
+    ctx: typer.Context,
+    repo: List[str] = typer.Option(None, "--repo", "-r", help="Only these repositories (owner/repo); repeatable"),
+    author: List[str] = typer.Option(None, "--author", "-a", help="Only these authors; repeatable [default: analysis_settings.authors]"),
+    config: Path = typer.Option("config.json", "--config", help="Path to config.json file"),
+    reports_dir: Path = typer.Option("reports", "--reports-dir", help="Directory reports are written into"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Pipeline tasks running at once"),
+    fetch_jobs: int = typer.Option(8, "--jobs", "-j", help="Concurrent gh api calls per fetch"),
+    pdf: bool = typer.Option(True, "--pdf/--no-pdf", help="Render PDFs after the HTML reports"),
+    backend: str = typer.Option("auto", "--backend", help="PDF renderer: auto, weasyprint or wkhtmltopdf"),
+    pdf_workers: int = typer.Option(1, "--pdf-workers", help="PDFs rendering at once, on a pool of warm processes"),
+    resume: bool = typer.Option(False, "--resume", help="Reuse stages the last run finished whose output is unchanged"),
+    api: str = typer.Option("rest", "--api", help="GitHub API to fetch through: rest, or graphql for a few bulk queries per repository"),
+    shared_css: bool = typer.Option(False, "--shared-css", help=SHARED_CSS_HELP),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_HELP),
+    profile_stats: Path = typer.Option(None, "--profile-stats", help=PROFILE_STATS_HELP),
+    trace: Path = typer.Option(None, "--trace", help=TRACE_HELP),
+    metrics_file: Path = typer.Option(None, "--metrics-file", help=METRICS_FILE_HELP),
+    metrics_port: int = typer.Option(None, "--metrics-port", help=METRICS_PORT_HELP),
+):
+    """Fetch, analyze, summarize and render reports for every repository × author"""
+    if not check_requirements():
+        raise typer.Exit(1)
+    start_profiling(ctx, profile, profile_stats, trace)
+    start_metrics(ctx, metrics_file, metrics_port)
+
+    from rich.table import Table
+
+    from .cache import ResponseCache
+    from .fetch import FETCH_APIS
+    from .pipeline import STAGES, PipelineState, ReportPipeline, expand_jobs
+    from .ratelimit import RateLimiter
+
+    console = get_console()
+    if api not in FETCH_APIS:
+        console.print(f"[red]Unknown API {api!r}.[/red] Choose from: {', '.join(FETCH_APIS)}")
+        raise typer.Exit(1)
+    cfg = load_config(config)
+    jobs = expand_jobs(cfg, reports_dir, repos=repo or None, authors=author or None)
+    if not jobs:
+        console.print("[red]No repositories to analyze.[/red] Pass --repo or add repositories to config.json.")
+        raise typer.Exit(1)
+
+    def report(task, status, info):
+        if status == "failed":
+            console.print(f"  [red]✗ {task.job_id} {task.stage}[/red]: {info['error']}")
+        elif status == "done" and task.job_id != "*":
+            console.print(f"  [green]✓ {task.job_id} {task.stage}[/green] ({info['seconds']:.1f}s)")
+
+    console.print(f"🚀 Running {len(jobs)} reports ({workers} workers)" + (" (resuming)" if resume else ""))
+    pipeline = ReportPipeline(
+        cfg, jobs, reports_dir=reports_dir, pdf=pdf, backend=backend, fetch_jobs=fetch_jobs,
+        cache=ResponseCache(reports_dir / ".cache"), limiter=RateLimiter(burst=fetch_jobs), api=api,
+        shared_css=shared_css, pdf_workers=pdf_workers,
+    )
+    status = pipeline.run(
+        PipelineState(reports_dir / ".state" / "pipeline.json"), workers=workers, resume=resume, on_update=report
+    )
+    stages = STAGES if pdf else STAGES[:-1]
+    table = Table(title="Report pipeline")
+    table.add_column("Job")
+    for stage in stages:
+        table.add_column(stage)
+    marks = {"done": "[green]✓[/green]", "cached": "[green]=[/green]", "failed": "[red]✗[/red]", "blocked": "[dim]–[/dim]"}
+    for job in jobs:
+        table.add_row(job.id, *(marks.get(status.get((job.id, stage)), "?") for stage in stages))
+    console.print(table)
+    if pipeline.limiter.waited >= 1 or pipeline.limiter.throttled:
+        console.print(f"  ⏱  Rate limit: {_rate_limit_line(pipeline.limiter)}")
+    reused = sum(1 for value in status.values() if value == "cached")
+    if reused:
+        console.print(f"  ♻ {reused} finished stages reused")
+
+    failed = [job.id for job in jobs if any(status.get((job.id, stage)) == "failed" for stage in stages)]
+    if failed:
+        console.print(f"[red]❌ {len(failed)} of {len(jobs)} reports failed.[/red] "
+                      "Re-run with --resume to continue from the last finished stage.")
+        raise typer.Exit(1)
+    console.print("[green]✅ All reports completed![/green]")
+
+
+@app.command("sync-docs")
+def sync_docs_command(
+    config: Path = typer.Option("config.json", "--config", help="Path to config.json file"),
+    cache_dir: Path = typer.Option(Path("reports") / ".cache" / "engineering-docs", "--cache-dir", help="Where the docs mirror and rule index live"),
+    force: bool = typer.Option(False, "--force", "-f", help="Re-parse every document, not just changed ones"),
+):
+    """Fetch the engineering docs repository and update the standards rule index"""
+    from .docs_sync import DocsSyncError, sync_docs
+
+    console = get_console()
+    cfg = load_config(config)
+    docs = cfg.get("engineering_docs") or {}
+    if not docs.get("enabled") or not docs.get("github_url"):
+        console.print("[red]engineering_docs is not enabled with a github_url in config.json.[/red]")
+        raise typer.Exit(1)
+
+    try:
+        result = sync_docs(cfg, cache_dir, force=force)
+    except DocsSyncError as e:
+        console.print(f"[red]❌ {e}[/red]")
+        raise typer.Exit(1) from e
+    save_config(cfg, config)
+    for path in result["changed"]:
+        console.print(f"  [green]↻ {path}[/green]")
+    for path in result["removed"]:
+        console.print(f"  [yellow]− {path}[/yellow]")
+    console.print(f"[green]✅ Engineering docs synced:[/green] {_docs_sync_line(result)} → {result['index']}")
+
+
+@app.command()
+def ingest(
+    dump: Path = typer.Argument(..., help="pr_data.json-shaped file, or .ndjson/.jsonl with one record per line"),
+    repo: str = typer.Option(..., "--repo", "-r", help="Repository the dump belongs to (owner/repo)"),
+    store: Path = typer.Option(Path("reports") / "pr_history.sqlite", "--store", help="SQLite history store to load into"),
+):
+    """Stream a PR data dump into the history store, validating each record"""
+    from .ingest import RecordError, iter_records
+    from .store import PRStore
+
+    console = get_console()
+    if not dump.exists():
+        console.print(f"[red]No such file: {dump}[/red]")
+        raise typer.Exit(1)
+
+    with PRStore(store) as history:
+        try:
+            counts = history.ingest_records(repo, iter_records(dump))
+        except RecordError as e:
+            # The store rolls back, so a bad dump leaves no partial data behind
+            console.print(f"[red]❌ {dump}: {e}[/red]")
+            raise typer.Exit(1) from e
+    console.print(f"[green]✅ Loaded {counts['pr_list']} PRs, {counts['comments']} comments and "
+                  f"{counts['reviews']} reviews into {store}[/green]")
+
+
+@app.command()
+def query(
+    kind: str = typer.Argument("reviews", help="What to list: reviews, comments or prs"),
+    store: Path = typer.Option(Path("reports") / "pr_history.sqlite", "--store", help="SQLite history store written by analyze --store"),
+    repo: str = typer.Option(None, "--repo", "-r", help="Repository (owner/repo)"),
+    author: str = typer.Option(None, "--author", "-a", help="PR author"),
+    reviewer: str = typer.Option(None, "--reviewer", help="Reviewer login (reviews, prs)"),
+    user: str = typer.Option(None, "--user", help="Comment author (comments)"),
+    state: str = typer.Option(None, "--state", help="Review state (reviews) or PR state (prs)"),
+    path: str = typer.Option(None, "--path", help="File path prefix, e.g. database/"),
+    since: str = typer.Option(None, "--since", help="PRs created at or after this ISO date"),
+    until: str = typer.Option(None, "--until", help="PRs created before this ISO date"),
+    limit: int = typer.Option(0, "--limit", "-n", help="Stop after this many rows (0 for all)"),
+):
+    """Query the PR history store, printing one JSON object per line"""
+    import json
+    from itertools import islice
+
+    from .store import PRStore
+
+    if kind not in ("reviews", "comments", "prs"):
+        get_console().print(f"[red]Unknown query {kind!r}.[/red] Choose from: reviews, comments, prs")
+        raise typer.Exit(1)
+    if not store.exists():
+        get_console().print(f"[red]No history store at {store}.[/red] Run pr-report analyze --store {store} first.")
+        raise typer.Exit(1)
+
+    filters = {"repo": repo, "author": author, "path_prefix": path, "since": since, "until": until}
+    if kind == "comments":
+        filters["user"] = user
+    else:
+        filters.update(reviewer=reviewer, state=state)
+    with PRStore(store) as history:
+        rows = getattr(history, f"query_{kind}")(**filters)
+        for row in islice(rows, limit or None):
+            typer.echo(json.dumps(row))
+
+
 @app.command()
 def version():
     """Show version information"""
     from . import __version__
-    console.print(f"Pull Request Report v{__version__}")
+    typer.echo(f"Pull Request Report v{__version__}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+"""
+Incremental sync of the engineering-docs repository
+
+The docs repository named by ``config.json`` ``engineering_docs.github_url``
+is kept as a bare, shallow git mirror under ``reports/.cache/engineering-docs``.
+Each sync fetches only the tip commit of the docs branch, so after the first
+run git transfers just the objects that changed.  The markdown files of that
+commit are listed with their blob hashes and only files whose blob changed are
+read and parsed again; the parsed rules of every file are kept in
+``rules.json`` next to the mirror, which the standards matcher loads instead
+of re-reading the docs.
+"""
+
+import json
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .cache import atomic_write_json
+from .profiling import span
+from .standards import Rule, parse_standards
+
+DEFAULT_DOCS_CACHE = Path("reports") / ".cache" / "engineering-docs"
+RULE_INDEX_NAME = "rules.json"
+# Bump when the rule index layout or rule parsing changes
+INDEX_VERSION = 1
+
+
+class DocsSyncError(RuntimeError):
+    """Raised when git cannot fetch or read the engineering docs."""
+
+
+def git(*args, git_dir: Path = None, input: bytes = None) -> bytes:
+    options = ["--git-dir", str(git_dir)] if git_dir else []
+    try:
+        with span("git", command=args[0]):
+            result = subprocess.run(["git", *options, *args], input=input, capture_output=True)
+    except FileNotFoundError as e:
+        raise DocsSyncError("git not found") from e
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="replace").strip().splitlines()
+        raise DocsSyncError(f"git {args[0]} failed: {message[0] if message else result.returncode}")
+    return result.stdout
+
+
+def docs_cache_dir(reports_dir: Path) -> Path:
+    """Where ``analyze`` and ``run`` keep the docs mirror for ``reports_dir``."""
+    return Path(reports_dir) / ".cache" / "engineering-docs"
+
+
+def rule_index_path(reports_dir: Path) -> Path:
+    """The rule index those runs write for ``reports_dir``."""
+    return docs_cache_dir(reports_dir) / RULE_INDEX_NAME
+
+
+def rule_to_json(rule: Rule) -> list:
+    return [rule.name, rule.section, rule.critical, rule.keywords]
+
+
+def rule_from_json(entry: list) -> Rule:
+    name, section, critical, keywords = entry
+    return Rule(name, section, critical, keywords)
+
+
+def read_rule_index(path) -> dict:
+    """Load a rule index written by ``sync_docs``, or ``{}`` if missing or outdated."""
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return index if index.get("version") == INDEX_VERSION else {}
+
+
+def index_rules(index: dict) -> list:
+    """All rules in a loaded rule index, in path order."""
+    files = index.get("files", {})
+    return [rule_from_json(rule) for path in sorted(files) for rule in files[path]["rules"]]
+
+
+class DocsMirror:
+    """Bare shallow mirror of the docs repository plus its parsed rule index."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_DOCS_CACHE):
+        self.cache_dir = Path(cache_dir)
+        self.git_dir = self.cache_dir / "mirror.git"
+        self.index_path = self.cache_dir / RULE_INDEX_NAME
+
+    def _git(self, *args, input: bytes = None) -> bytes:
+        return git(*args, git_dir=self.git_dir, input=input)
+
+    def _ensure_remote(self, url: str) -> None:
+        """Create the mirror on first use and keep its remote pointing at ``url``."""
+        if not self.git_dir.exists():
+            self.git_dir.parent.mkdir(parents=True, exist_ok=True)
+            git("init", "--quiet", "--bare", str(self.git_dir))
+            self._git("remote", "add", "origin", url)
+        elif self._git("remote", "get-url", "origin").decode().strip() != url:
+            self._git("remote", "set-url", "origin", url)
+
+    def fetch(self, branch: str = None) -> str:
+        """Fetch the tip of ``branch`` (default: the remote HEAD) and return its commit."""
+        self._git("fetch", "--quiet", "--depth", "1", "--no-tags", "origin", branch or "HEAD")
+        return self._git("rev-parse", "FETCH_HEAD^{commit}").decode().strip()
+
+    def markdown_blobs(self, commit: str) -> dict:
+        """``{path: blob sha}`` for every ``.md`` file in ``commit``."""
+        blobs = {}
+        for entry in self._git("ls-tree", "-r", "-z", commit).split(b"\0"):
+            if not entry:
+                continue
+            meta, path = entry.decode().split("\t", 1)
+            _, kind, sha = meta.split()
+            if kind == "blob" and path.endswith(".md"):
+                blobs[path] = sha
+        return blobs
+
+    def read_blobs(self, shas: list) -> dict:
+        """Read many blobs with one ``git cat-file --batch``."""
+        if not shas:
+            return {}
+        output = self._git("cat-file", "--batch", input="".join(f"{sha}\n" for sha in shas).encode())
+        contents, offset = {}, 0
+        for sha in shas:
+            header_end = output.index(b"\n", offset)
+            size = int(output[offset:header_end].split()[2])
+            start = header_end + 1
+            contents[sha] = output[start:start + size].decode("utf-8", errors="replace")
+            # Each object is followed by a newline
+            offset = start + size + 1
+        return contents
+
+    def sync(self, url: str, branch: str = None, force: bool = False) -> dict:
+        """Bring the mirror and rule index up to date with ``url``.
+
+        Returns ``{"commit", "synced_at", "changed", "removed", "rules",
+        "index"}`` where ``changed`` and ``removed`` list the markdown paths
+        that were parsed again or dropped.  ``force`` discards the index and
+        parses every file.  The index only changes when the docs commit does,
+        so it is safe to use as a render cache input.
+        """
+        self._ensure_remote(url)
+        commit = self.fetch(branch)
+        index = {} if force else read_rule_index(self.index_path)
+        if index.get("url") != url:
+            index = {}
+        files = index.get("files", {})
+
+        if index.get("commit") == commit:
+            changed, removed = [], []
+        else:
+            blobs = self.markdown_blobs(commit)
+            changed = sorted(path for path, sha in blobs.items() if files.get(path, {}).get("blob") != sha)
+            removed = sorted(set(files) - set(blobs))
+            contents = self.read_blobs([blobs[path] for path in changed])
+            files = {path: entry for path, entry in files.items() if path in blobs}
+            for path in changed:
+                rules = parse_standards(contents[blobs[path]])
+                files[path] = {"blob": blobs[path], "rules": [rule_to_json(rule) for rule in rules]}
+
+        if changed or removed or not index:
+            atomic_write_json(self.index_path, {"version": INDEX_VERSION, "url": url, "commit": commit, "files": files})
+        return {
+            "commit": commit,
+            "synced_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "changed": changed,
+            "removed": removed,
+            "rules": sum(len(entry["rules"]) for entry in files.values()),
+            "index": self.index_path,
+        }
+
+
+def sync_docs(config: dict, cache_dir: Path = DEFAULT_DOCS_CACHE, force: bool = False):
+    """Sync the docs configured in ``engineering_docs`` and stamp ``last_synced``.
+
+    Returns the ``DocsMirror.sync`` result, or None when docs are disabled or
+    have no ``github_url``.  ``config`` is updated in place; saving it is up
+    to the caller.
+    """
+    docs = config.get("engineering_docs") or {}
+    if not docs.get("enabled") or not docs.get("github_url"):
+        return None
+    result = DocsMirror(cache_dir).sync(docs["github_url"], docs.get("branch"), force=force)
+    docs["last_synced"] = result["synced_at"]
+    return result
@@ -0,0 +1,421 @@
+"""
+Concurrent pull request fetching through the GitHub CLI
+
+Every REST call is a separate ``gh api`` process.  Calls for all repositories
+share one bounded thread pool so ``--jobs`` caps the number of gh processes
+running at once, no matter how many repositories are configured.
+"""
+
+import json
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from . import prometheus
+from .cache import atomic_open
+from .profiling import span
+from .ratelimit import PRIORITY_METADATA, PRIORITY_PAGES
+from .records import Comment, PullRequest, Review, record_json, typed_records
+
+PAGE_SIZE = 100
+PR_STATES = ("OPEN", "CLOSED", "MERGED")
+REVIEW_STATES = ("APPROVED", "CHANGES_REQUESTED", "COMMENTED")
+FETCH_APIS = ("rest", "graphql")
+
+
+class GhError(RuntimeError):
+    """Raised when a ``gh api`` call fails"""
+
+    def __init__(self, message: str, status: int = None, headers: dict = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def repo_slug(repo) -> str:
+    """Return ``owner/name`` for a config repository entry or slug string."""
+    if isinstance(repo, dict):
+        repo = repo.get("github_url") or repo.get("name", "")
+    slug = repo.strip().rstrip("/")
+    if slug.endswith(".git"):
+        slug = slug[:-4]
+    if "github.com" in slug:
+        slug = slug.split("github.com", 1)[1].lstrip(":/")
+    return slug
+
+
+class GhResponse:
+    """Status, lower-cased headers and decoded body of one ``gh api -i`` call"""
+
+    def __init__(self, status: int, headers: dict, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+def parse_include_output(output: str):
+    """Split ``gh api -i`` output into status, headers and raw body text."""
+    head, _, body = output.replace("\r\n", "\n").partition("\n\n")
+    lines = head.split("\n")
+    if not lines or not lines[0].startswith("HTTP/"):
+        return None, {}, output
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def gh_request(path: str, gh: str = "gh", headers: dict = None, fields: dict = None) -> GhResponse:
+    """Run ``gh api -i <path>`` and return the parsed response.
+
+    ``fields`` become ``-F``/``-f`` parameters, which makes gh send a POST
+    (as ``gh api graphql`` needs); integers are typed, everything else is
+    passed as a raw string.
+
+    gh exits non-zero for any status above 299, including 304 Not Modified,
+    so the status line is trusted over the exit code whenever it is present.
+    """
+    cmd = [gh, "api", "-i"]
+    for name, value in (headers or {}).items():
+        cmd += ["-H", f"{name}: {value}"]
+    for name, value in (fields or {}).items():
+        cmd += ["-F" if isinstance(value, int) else "-f", f"{name}={value}"]
+    cmd.append(path)
+    try:
+        with span("gh api", path=path):
+            result = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        raise GhError(f"GitHub CLI not found: {gh}") from e
+
+    status, response_headers, body = parse_include_output(result.stdout)
+    if status is None:
+        status = 200 if result.returncode == 0 else 0
+    if status == 304:
+        return GhResponse(status, response_headers, None)
+    if result.returncode != 0 or status >= 400:
+        raise GhError(f"gh api {path} failed: {result.stderr.strip() or status}", status or None, response_headers)
+    return GhResponse(status, response_headers, json.loads(body or "null"))
+
+
+def gh_api(path: str, gh: str = "gh"):
+    """Run ``gh api <path>`` and return the decoded JSON body."""
+    return gh_request(path, gh=gh).body
+
+
+def pr_watermark(pr: dict) -> str:
+    """Return the newest of a PR's ``created_at``/``merged_at`` timestamps."""
+    return max(pr.get("created_at") or "", pr.get("merged_at") or "")
+
+
+def normalize_pr(pr: dict, reviews: list) -> dict:
+    """Convert a REST pull request into the ``pr_list`` record shape."""
+    state = "MERGED" if pr.get("merged_at") else str(pr.get("state", "open")).upper()
+
+    # Latest decisive review per reviewer wins, like the GitHub UI
+    reviewers = {}
+    for review in reviews:
+        login = review["user"]
+        if review["state"] != "COMMENTED" or login not in reviewers:
+            reviewers[login] = review["state"]
+
+    return {
+        "number": pr["number"],
+        "title": pr.get("title", ""),
+        "state": state,
+        "author": (pr.get("user") or {}).get("login", ""),
+        "created_at": pr.get("created_at"),
+        "merged_at": pr.get("merged_at"),
+        "reviewers": [
+            {"login": login, "state": state} for login, state in reviewers.items()
+        ],
+        "changed_files": pr.get("changed_files", 0),
+        "additions": pr.get("additions", 0),
+        "deletions": pr.get("deletions", 0),
+    }
+
+
+def normalize_comment(pr_number: int, comment: dict) -> dict:
+    """Convert a REST review comment into the ``comments`` record shape."""
+    return {
+        "pr_number": pr_number,
+        "user": (comment.get("user") or {}).get("login", ""),
+        "body": comment.get("body", ""),
+        "file": comment.get("path", ""),
+        "line": comment.get("line") or comment.get("original_line") or 0,
+    }
+
+
+def normalize_review(pr_number: int, review: dict):
+    """Convert a REST review into the ``reviews`` record shape, or None."""
+    state = review.get("state")
+    if state not in REVIEW_STATES:
+        # PENDING and DISMISSED reviews carry no feedback worth analyzing
+        return None
+    return {
+        "pr_number": pr_number,
+        "user": (review.get("user") or {}).get("login", ""),
+        "state": state,
+        "body": review.get("body", ""),
+    }
+
+
+def make_fetcher(api: str = "rest", **options) -> "PRFetcher":
+    """A ``PRFetcher`` (``rest``) or ``GraphQLFetcher`` (``graphql``) with ``options``."""
+    if api == "graphql":
+        from .graphql import GraphQLFetcher
+
+        return GraphQLFetcher(**options)
+    if api != "rest":
+        raise ValueError(f"unknown GitHub API {api!r}; choose from {', '.join(FETCH_APIS)}")
+    return PRFetcher(**options)
+
+
+class PRFetcher:
+    """Fetch PR lists, review comments and reviews for many repositories."""
+
+    def __init__(
+        self,
+        jobs: int = 8,
+        count: int = 10,
+        author: str = None,
+        include_drafts: bool = False,
+        include_closed: bool = True,
+        gh: str = "gh",
+        cache=None,
+        limiter=None,
+    ):
+        self.jobs = max(1, jobs)
+        self.count = count
+        self.author = author
+        self.include_drafts = include_drafts
+        self.include_closed = include_closed
+        self.gh = gh
+        self.cache = cache
+        self.limiter = limiter
+
+    def request(self, path: str, headers: dict = None, priority: int = PRIORITY_METADATA,
+                fields: dict = None) -> GhResponse:
+        """Run one ``gh api`` call, paced and retried by the rate limiter when set."""
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire(priority)
+            try:
+                response = gh_request(path, gh=self.gh, headers=headers, fields=fields)
+            except GhError as e:
+                prometheus.inc("pr_report_github_api_calls_total", status=e.status or 0)
+                if self.limiter is not None and self.limiter.throttle(e.status, e.headers, str(e), attempt):
+                    prometheus.inc("pr_report_github_throttled_total")
+                    attempt += 1
+                    continue
+                raise
+            finally:
+                if self.limiter is not None:
+                    self.limiter.release()
+            prometheus.inc("pr_report_github_api_calls_total", status=response.status)
+            if "x-ratelimit-remaining" in response.headers:
+                prometheus.set_gauge("pr_report_github_rate_limit_remaining",
+                                     int(response.headers["x-ratelimit-remaining"]))
+            if self.limiter is not None:
+                self.limiter.update(response.headers)
+            return response
+
+    def api(self, path: str, repo: str = None, pr_number: int = None, immutable: bool = False,
+            priority: int = PRIORITY_METADATA):
+        """Return the JSON body for ``path``, going through the cache when set.
+
+        ``immutable`` marks responses for closed or merged PRs, which are kept
+        forever and served without contacting GitHub on later runs.  Only
+        per-PR responses are served from the cache within the TTL; repository
+        endpoints such as the PR list are always revalidated, so new PRs show
+        up at once.
+        ``priority`` orders calls waiting on the rate limiter, lowest first.
+        """
+        if self.cache is None or repo is None:
+            return self.request(path, priority=priority).body
+
+        endpoint = path[len(f"repos/{repo}/"):]
+        entry = self.cache.get(repo, pr_number, endpoint)
+        if entry and pr_number is not None and self.cache.is_fresh(entry):
+            self.cache.record("hits")
+            return entry["body"]
+
+        response = self.request(path, self.cache.conditional_headers(entry), priority)
+        if response.status == 304 and entry:
+            self.cache.record("revalidated")
+            self.cache.refresh(entry, immutable=immutable)
+            return entry["body"]
+
+        self.cache.record("misses")
+        self.cache.put(repo, pr_number, endpoint, response.body, response.headers, immutable)
+        return response.body
+
+    def _paginate(self, path: str, repo: str, pr_number: int, immutable: bool) -> list:
+        items = []
+        page = 1
+        while True:
+            batch = self.api(
+                f"{path}?per_page={PAGE_SIZE}&page={page}", repo, pr_number, immutable, PRIORITY_PAGES
+            ) or []
+            items.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return items
+            page += 1
+
+    def list_prs(self, repo: str, since: str = None) -> list:
+        """Return the newest matching REST pull requests for ``repo``.
+
+        With ``since`` (an ISO timestamp high-water mark) every PR created or
+        merged after it is returned, however many there are: the mark then
+        moves past all of them, so any left out would never be fetched.  PRs
+        are listed by last update so paging can stop at the first page that is
+        entirely older than the mark.
+        """
+        selected = []
+        page = 1
+        limit = None if since else self.count
+        # Filtering happens client side, so read full pages until we have enough
+        per_page = PAGE_SIZE if self.author or since else min(self.count, PAGE_SIZE)
+        order = "&sort=updated&direction=desc" if since else ""
+        while limit is None or len(selected) < limit:
+            batch = self.api(
+                f"repos/{repo}/pulls?state=all{order}&per_page={per_page}&page={page}", repo
+            ) or []
+            for pr in batch:
+                if self._wanted(pr) and (since is None or pr_watermark(pr) > since):
+                    selected.append(pr)
+            if len(batch) < per_page:
+                break
+            if since and all((pr.get("updated_at") or "") <= since for pr in batch):
+                break
+            page += 1
+        return selected[:limit]
+
+    def _wanted(self, pr: dict) -> bool:
+        if self.author and (pr.get("user") or {}).get("login") != self.author:
+            return False
+        if pr.get("draft") and not self.include_drafts:
+            return False
+        return self.include_closed or pr.get("state") != "closed"
+
+    def fetch_pr_detail(self, repo: str, number: int, immutable: bool = False) -> dict:
+        return self.api(f"repos/{repo}/pulls/{number}", repo, number, immutable)
+
+    def fetch_comments(self, repo: str, number: int, immutable: bool = False) -> list:
+        return self._paginate(f"repos/{repo}/pulls/{number}/comments", repo, number, immutable)
+
+    def fetch_reviews(self, repo: str, number: int, immutable: bool = False) -> list:
+        return self._paginate(f"repos/{repo}/pulls/{number}/reviews", repo, number, immutable)
+
+    def submit_pr_calls(self, pool, repo: str, prs: list) -> dict:
+        """Queue the calls for listed PRs; returns ``{future: (kind, repo, number)}``.
+
+        ``kind`` is ``detail``, ``comments`` or ``reviews`` for one PR, or
+        ``feedback`` for a future resolving to ``{number: {"comments",
+        "reviews"}}`` for several PRs at once.
+        """
+        pending = {}
+        for pr in prs:
+            n = pr["number"]
+            # MERGED and CLOSED PRs no longer change
+            done_pr = pr.get("state") == "closed"
+            pending[pool.submit(self.fetch_pr_detail, repo, n, done_pr)] = ("detail", repo, n)
+            pending[pool.submit(self.fetch_comments, repo, n, done_pr)] = ("comments", repo, n)
+            pending[pool.submit(self.fetch_reviews, repo, n, done_pr)] = ("reviews", repo, n)
+        return pending
+
+    def fetch_all(self, repos: list, since: dict = None) -> dict:
+        """Fetch every repository concurrently.
+
+        ``since`` optionally maps a repository to its high-water mark, limiting
+        that repository to PRs created or merged after it.
+
+        Returns ``{repo: {"pr_list": [...], "comments": [...], "reviews": [...]}}``
+        for repositories that succeeded and ``{repo: {"error": str}}`` for the
+        ones that did not, so one broken repository never sinks the whole run.
+        """
+        raw = {repo: {"prs": [], "detail": {}, "comments": {}, "reviews": {}} for repo in repos}
+        errors = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            pending = {
+                pool.submit(self.list_prs, repo, (since or {}).get(repo)): ("list", repo, None)
+                for repo in repos
+            }
+
+            # Per-PR calls are submitted from this thread as each list arrives;
+            # workers never wait on other futures, so the pool cannot deadlock.
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, repo, number = pending.pop(future)
+                    if repo in errors:
+                        continue
+                    try:
+                        result = future.result()
+                    except (GhError, ValueError) as e:
+                        errors[repo] = str(e)
+                        continue
+
+                    if kind == "list":
+                        raw[repo]["prs"] = result
+                        pending.update(self.submit_pr_calls(pool, repo, result))
+                    elif kind == "feedback":
+                        for n, feedback in result.items():
+                            raw[repo]["comments"][n] = feedback["comments"]
+                            raw[repo]["reviews"][n] = feedback["reviews"]
+                        prometheus.inc("pr_report_prs_fetched_total", len(result), repo=repo)
+                    else:
+                        raw[repo][kind][number] = result
+                        if kind == "detail":
+                            prometheus.inc("pr_report_prs_fetched_total", repo=repo)
+
+        if self.cache is not None:
+            self.cache.prune()
+
+        results = {}
+        for repo in repos:
+            if repo in errors:
+                results[repo] = {"error": errors[repo]}
+            else:
+                results[repo] = self._assemble(raw[repo])
+        return results
+
+    @staticmethod
+    def _assemble(raw: dict) -> dict:
+        """Compact ``records`` objects for every fetched PR, comment and review."""
+        data = {"pr_list": [], "comments": [], "reviews": []}
+        for pr in raw["prs"]:
+            number = pr["number"]
+            reviews = [
+                r
+                for r in (normalize_review(number, r) for r in raw["reviews"].get(number, []))
+                if r
+            ]
+            detail = {**pr, **raw["detail"].get(number, {})}
+            data["pr_list"].append(PullRequest.from_json(normalize_pr(detail, reviews)))
+            data["comments"].extend(
+                Comment.from_json(normalize_comment(number, c)) for c in raw["comments"].get(number, [])
+            )
+            data["reviews"].extend(Review.from_json(r) for r in reviews)
+        return data
+
+
+def read_pr_data(path: Path) -> dict:
+    """Read PR data written by an earlier run as record objects, or empty data if there is none."""
+    from .ingest import iter_records
+
+    data = {"pr_list": [], "comments": [], "reviews": []}
+    if path.exists():
+        for section, record in typed_records(iter_records(path)):
+            data[section].append(record)
+    return data
+
+
+def write_pr_data(data: dict, path: Path) -> Path:
+    """Write fetched PR data (record objects or dicts) as JSON, creating parent directories."""
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=2, default=record_json)
+    return path
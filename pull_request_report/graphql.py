@@ -0,0 +1,244 @@
+"""
+Bulk pull request fetching through ``gh api graphql``
+
+The REST backend needs a list call plus a detail, comments and reviews call
+for every PR.  ``GraphQLFetcher`` gets the list together with each PR's
+details in pages of 100, then asks for the reviews and review threads (with
+file and line of every comment) of up to ``BATCH_SIZE`` PRs in one query by
+aliasing ``pullRequest`` per PR.  Only PRs with more reviews, threads or
+thread comments than fit in one page need follow-up queries.
+
+Nodes are converted to the REST shapes ``fetch.normalize_*`` read, so the
+result is the same ``pr_list``/``comments``/``reviews`` data.  GraphQL calls
+are POSTs and do not go through the REST response cache.
+"""
+
+from .fetch import PAGE_SIZE, PRFetcher, pr_watermark
+from .ratelimit import PRIORITY_METADATA, PRIORITY_PAGES
+
+# PRs per feedback query; GitHub caps a query at 500,000 nodes
+BATCH_SIZE = 25
+# Nested page sizes of the feedback query
+REVIEWS_PAGE = 50
+THREADS_PAGE = 50
+COMMENTS_PAGE = 50
+
+PAGE_INFO = "pageInfo { hasNextPage endCursor }"
+REVIEW_FIELDS = "author { login } state body"
+COMMENT_FIELDS = "author { login } body path line originalLine"
+
+LIST_QUERY = f"""
+query PullRequests($owner: String!, $name: String!, $first: Int!, $after: String, $order: PullRequestOrderField!) {{
+  repository(owner: $owner, name: $name) {{
+    pullRequests(first: $first, after: $after, orderBy: {{field: $order, direction: DESC}}) {{
+      {PAGE_INFO}
+      nodes {{
+        number title state isDraft createdAt mergedAt updatedAt changedFiles additions deletions
+        author {{ login }}
+      }}
+    }}
+  }}
+}}
+"""
+
+FEEDBACK_FRAGMENT = f"""
+fragment Feedback on PullRequest {{
+  number
+  reviews(first: $reviews) {{ {PAGE_INFO} nodes {{ {REVIEW_FIELDS} }} }}
+  reviewThreads(first: $threads) {{
+    {PAGE_INFO}
+    nodes {{ id comments(first: $comments) {{ {PAGE_INFO} nodes {{ {COMMENT_FIELDS} }} }} }}
+  }}
+}}
+"""
+
+MORE_REVIEWS_QUERY = f"""
+query MoreReviews($owner: String!, $name: String!, $number: Int!, $first: Int!, $after: String!) {{
+  repository(owner: $owner, name: $name) {{
+    pullRequest(number: $number) {{
+      reviews(first: $first, after: $after) {{ {PAGE_INFO} nodes {{ {REVIEW_FIELDS} }} }}
+    }}
+  }}
+}}
+"""
+
+MORE_THREADS_QUERY = f"""
+query MoreThreads($owner: String!, $name: String!, $number: Int!, $first: Int!, $after: String!, $comments: Int!) {{
+  repository(owner: $owner, name: $name) {{
+    pullRequest(number: $number) {{
+      reviewThreads(first: $first, after: $after) {{
+        {PAGE_INFO}
+        nodes {{ id comments(first: $comments) {{ {PAGE_INFO} nodes {{ {COMMENT_FIELDS} }} }} }}
+      }}
+    }}
+  }}
+}}
+"""
+
+MORE_COMMENTS_QUERY = f"""
+query MoreThreadComments($id: ID!, $first: Int!, $after: String!) {{
+  node(id: $id) {{
+    ... on PullRequestReviewThread {{
+      comments(first: $first, after: $after) {{ {PAGE_INFO} nodes {{ {COMMENT_FIELDS} }} }}
+    }}
+  }}
+}}
+"""
+
+
+def feedback_query(count: int) -> str:
+    """Query for the reviews and threads of ``count`` PRs, numbered ``$n0``, ``$n1``, ..."""
+    numbers = "".join(f", $n{i}: Int!" for i in range(count))
+    aliases = "\n".join(f"    pr{i}: pullRequest(number: $n{i}) {{ ...Feedback }}" for i in range(count))
+    return (
+        f"query PullRequestFeedback($owner: String!, $name: String!, $reviews: Int!, $threads: Int!, "
+        f"$comments: Int!{numbers}) {{\n  repository(owner: $owner, name: $name) {{\n{aliases}\n  }}\n}}\n"
+        + FEEDBACK_FRAGMENT
+    )
+
+
+def rest_pr(node: dict) -> dict:
+    """A ``pullRequests`` node in the shape of a REST pull request."""
+    return {
+        "number": node["number"],
+        "title": node.get("title", ""),
+        "state": "open" if node.get("state") == "OPEN" else "closed",
+        "draft": node.get("isDraft", False),
+        "user": {"login": (node.get("author") or {}).get("login", "")},
+        "created_at": node.get("createdAt"),
+        "merged_at": node.get("mergedAt"),
+        "updated_at": node.get("updatedAt"),
+        "changed_files": node.get("changedFiles", 0),
+        "additions": node.get("additions", 0),
+        "deletions": node.get("deletions", 0),
+    }
+
+
+def rest_review(node: dict) -> dict:
+    return {"user": {"login": (node.get("author") or {}).get("login", "")}, "state": node.get("state"),
+            "body": node.get("body", "")}
+
+
+def rest_comment(node: dict) -> dict:
+    return {
+        "user": {"login": (node.get("author") or {}).get("login", "")},
+        "body": node.get("body", ""),
+        "path": node.get("path", ""),
+        "line": node.get("line"),
+        "original_line": node.get("originalLine"),
+    }
+
+
+class GraphQLFetcher(PRFetcher):
+    """``PRFetcher`` that talks to the GraphQL API in a few round trips per repository."""
+
+    def __init__(self, *args, batch_size: int = BATCH_SIZE, page_sizes: tuple = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_size = max(1, batch_size)
+        self.reviews_page, self.threads_page, self.comments_page = page_sizes or (
+            REVIEWS_PAGE, THREADS_PAGE, COMMENTS_PAGE,
+        )
+
+    def graphql(self, query: str, priority: int = PRIORITY_METADATA, **variables) -> dict:
+        """Run one query and return its ``data``."""
+        fields = {"query": query, **{name: value for name, value in variables.items() if value is not None}}
+        body = self.request("graphql", priority=priority, fields=fields).body or {}
+        if body.get("errors"):
+            raise ValueError(f"GraphQL query failed: {body['errors'][0].get('message', body['errors'][0])}")
+        return body["data"]
+
+    @staticmethod
+    def _owner_name(repo: str) -> dict:
+        owner, name = repo.split("/", 1)
+        return {"owner": owner, "name": name}
+
+    def list_prs(self, repo: str, since: str = None) -> list:
+        """Same selection as the REST ``list_prs``, with PR details already included."""
+        selected = []
+        after = None
+        limit = None if since else self.count
+        per_page = PAGE_SIZE if self.author or since else min(self.count, PAGE_SIZE)
+        while limit is None or len(selected) < limit:
+            data = self.graphql(
+                LIST_QUERY, **self._owner_name(repo), first=per_page, after=after,
+                order="UPDATED_AT" if since else "CREATED_AT",
+            )
+            connection = (data.get("repository") or {}).get("pullRequests")
+            if connection is None:
+                raise ValueError(f"repository {repo} not found")
+            batch = [rest_pr(node) for node in connection["nodes"]]
+            for pr in batch:
+                if self._wanted(pr) and (since is None or pr_watermark(pr) > since):
+                    selected.append(pr)
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            if since and all((pr.get("updated_at") or "") <= since for pr in batch):
+                break
+            after = connection["pageInfo"]["endCursor"]
+        return selected[:limit]
+
+    def submit_pr_calls(self, pool, repo: str, prs: list) -> dict:
+        numbers = [pr["number"] for pr in prs]
+        return {
+            pool.submit(self.fetch_feedback, repo, numbers[i:i + self.batch_size]): ("feedback", repo, None)
+            for i in range(0, len(numbers), self.batch_size)
+        }
+
+    def fetch_feedback(self, repo: str, numbers: list) -> dict:
+        """Reviews and review comments of several PRs: ``{number: {"comments", "reviews"}}``."""
+        data = self.graphql(
+            feedback_query(len(numbers)), **self._owner_name(repo),
+            reviews=self.reviews_page, threads=self.threads_page, comments=self.comments_page,
+            **{f"n{i}": number for i, number in enumerate(numbers)},
+        )
+        repository = data.get("repository") or {}
+        feedback = {}
+        for i, number in enumerate(numbers):
+            node = repository.get(f"pr{i}") or {}
+            reviews = [rest_review(review) for review in self._all(repo, number, node, "reviews")]
+            comments = []
+            for thread in self._all(repo, number, node, "reviewThreads"):
+                comments.extend(rest_comment(comment) for comment in self._thread_comments(thread))
+            feedback[number] = {"comments": comments, "reviews": reviews}
+        return feedback
+
+    def _all(self, repo: str, number: int, pull: dict, field: str) -> list:
+        """Every node of a PR's ``reviews`` or ``reviewThreads``, following ``pageInfo``."""
+        connection = pull.get(field) or {}
+        nodes = list(connection.get("nodes") or [])
+        page_info = connection.get("pageInfo") or {}
+        while page_info.get("hasNextPage"):
+            if field == "reviews":
+                data = self.graphql(
+                    MORE_REVIEWS_QUERY, PRIORITY_PAGES, **self._owner_name(repo), number=number,
+                    first=self.reviews_page, after=page_info["endCursor"],
+                )
+            else:
+                data = self.graphql(
+                    MORE_THREADS_QUERY, PRIORITY_PAGES, **self._owner_name(repo), number=number,
+                    first=self.threads_page, after=page_info["endCursor"], comments=self.comments_page,
+                )
+            pull = (data.get("repository") or {}).get("pullRequest")
+            if pull is None:
+                raise ValueError(f"pull request #{number} in {repo} not found")
+            connection = pull.get(field) or {}
+            nodes.extend(connection.get("nodes") or [])
+            page_info = connection.get("pageInfo") or {}
+        return nodes
+
+    def _thread_comments(self, thread: dict) -> list:
+        connection = thread.get("comments") or {}
+        comments = list(connection.get("nodes") or [])
+        page_info = connection.get("pageInfo") or {}
+        while page_info.get("hasNextPage"):
+            data = self.graphql(
+                MORE_COMMENTS_QUERY, PRIORITY_PAGES, id=thread["id"], first=self.comments_page,
+                after=page_info["endCursor"],
+            )
+            node = data.get("node")
+            if node is None:
+                raise ValueError(f"review thread {thread['id']} not found")
+            connection = node.get("comments") or {}
+            comments.extend(connection.get("nodes") or [])
+            page_info = connection.get("pageInfo") or {}
+        return comments
@@ -0,0 +1,59 @@
+"""
+Incremental analysis support
+
+A per-repository high-water mark records the newest ``created_at``/``merged_at``
+already processed, so later runs only fetch and analyze PRs past it and merge
+them into the data already on disk.
+"""
+
+import json
+from pathlib import Path
+
+from .cache import atomic_write_json
+from .fetch import pr_watermark
+
+DEFAULT_MARKS_FILE = Path("reports") / ".state" / "high_water_marks.json"
+
+
+class HighWaterMarks:
+    """Newest processed PR timestamp per repository, persisted as JSON."""
+
+    def __init__(self, path: Path = DEFAULT_MARKS_FILE):
+        self.path = Path(path)
+        try:
+            with open(self.path) as f:
+                self.marks = json.load(f)
+        except FileNotFoundError:
+            self.marks = {}
+
+    def get(self, repo: str):
+        return self.marks.get(repo)
+
+    def advance(self, repo: str, pr_list: list) -> str:
+        """Move the mark for ``repo`` past every PR in ``pr_list``."""
+        newest = max((pr_watermark(pr) for pr in pr_list), default="")
+        if newest > (self.marks.get(repo) or ""):
+            self.marks[repo] = newest
+        return self.marks.get(repo)
+
+    def save(self) -> None:
+        atomic_write_json(self.path, self.marks)
+
+
+def merge_pr_data(existing: dict, new: dict) -> dict:
+    """Merge freshly fetched PR data into previously stored data.
+
+    PRs present in ``new`` replace their old record along with all of their
+    comments and reviews; everything else is kept as it was.
+    """
+    refreshed = {pr["number"] for pr in new["pr_list"]}
+    merged = {
+        "pr_list": [pr for pr in existing.get("pr_list", []) if pr["number"] not in refreshed],
+        "comments": [c for c in existing.get("comments", []) if c["pr_number"] not in refreshed],
+        "reviews": [r for r in existing.get("reviews", []) if r["pr_number"] not in refreshed],
+    }
+    merged["pr_list"].extend(new["pr_list"])
+    merged["comments"].extend(new["comments"])
+    merged["reviews"].extend(new["reviews"])
+    merged["pr_list"].sort(key=lambda pr: pr.get("created_at") or "", reverse=True)
+    return merged
@@ -0,0 +1,233 @@
+"""
+Streaming ingestion of PR data dumps
+
+Org-wide exports of ``pr_data.json`` run to several GB, so they are never
+loaded with ``json.load``.  ``iter_records`` walks the top-level object
+incrementally and decodes one ``pr_list``/``comments``/``reviews`` entry at a
+time with ``json.JSONDecoder.raw_decode`` over a small rolling buffer; memory
+stays bounded by the largest single record, not the file.
+
+Newline-delimited JSON (``.ndjson``/``.jsonl``) is read line by line, each
+line being one record tagged with ``"kind": "pr" | "comment" | "review"``.
+
+Every record is validated against the ``pr_data.json`` schema before it is
+handed on, and errors name the offending record.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from .fetch import PR_STATES, REVIEW_STATES
+
+CHUNK_SIZE = 1 << 16
+# A record larger than this is treated as a corrupt file rather than buffered
+MAX_RECORD_CHARS = 64 << 20
+SECTIONS = ("pr_list", "comments", "reviews")
+NDJSON_KINDS = {"pr": "pr_list", "comment": "comments", "review": "reviews"}
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+class RecordError(ValueError):
+    """Raised when a dump is malformed or a record fails validation"""
+
+
+def _check_date(value, field: str, optional: bool = False):
+    if value is None and optional:
+        return None
+    if not isinstance(value, str):
+        return f"{field} must be an ISO timestamp"
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return f"{field} is not an ISO timestamp: {value!r}"
+    return None
+
+
+def _check_fields(record: dict, types: dict):
+    for field, kind in types.items():
+        if field not in record:
+            return f"missing {field}"
+        if not isinstance(record[field], kind) or isinstance(record[field], bool):
+            return f"{field} must be {kind.__name__}"
+    return None
+
+
+def _pr_problem(pr: dict):
+    problem = _check_fields(pr, {"number": int, "title": str, "state": str, "author": str, "reviewers": list})
+    if problem:
+        return problem
+    if pr["state"] not in PR_STATES:
+        return f"state {pr['state']!r} is not one of {', '.join(PR_STATES)}"
+    problem = _check_date(pr.get("created_at"), "created_at") or _check_date(
+        pr.get("merged_at"), "merged_at", optional=True
+    )
+    if problem:
+        return problem
+    for reviewer in pr["reviewers"]:
+        if not isinstance(reviewer, dict) or "login" not in reviewer:
+            return "reviewers entries need a login"
+        if reviewer.get("state") not in REVIEW_STATES:
+            return f"reviewer state {reviewer.get('state')!r} is not one of {', '.join(REVIEW_STATES)}"
+    return None
+
+
+def _comment_problem(comment: dict):
+    problem = _check_fields(comment, {"pr_number": int, "user": str, "body": str, "file": str, "line": int})
+    if problem:
+        return problem
+    if not comment["body"]:
+        return "body is empty"
+    return None
+
+
+def _review_problem(review: dict):
+    problem = _check_fields(review, {"pr_number": int, "user": str, "state": str, "body": str})
+    if problem:
+        return problem
+    if review["state"] not in REVIEW_STATES:
+        return f"state {review['state']!r} is not one of {', '.join(REVIEW_STATES)}"
+    return None
+
+
+VALIDATORS = {"pr_list": _pr_problem, "comments": _comment_problem, "reviews": _review_problem}
+
+
+def validate_record(section: str, record, where: str = None) -> dict:
+    """Return ``record`` if it matches the schema for ``section``, else raise RecordError.
+
+    ``where`` locates the record in error messages, e.g. ``comments[41]``.
+    """
+    where = where or section
+    if not isinstance(record, dict):
+        raise RecordError(f"{where}: expected an object")
+    problem = VALIDATORS[section](record)
+    if problem:
+        raise RecordError(f"{where}: {problem}")
+    return record
+
+
+class _JSONStream:
+    """Incremental tokenizer over a text file for one level of JSON structure."""
+
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer never holds more than a record
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            found = repr(char) if char else "end of file"
+            raise RecordError(f"expected one of {chars!r}, found {found}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if len(self.buf) - self.pos > MAX_RECORD_CHARS or not self._fill():
+                    raise RecordError(f"invalid JSON: {e.msg}") from e
+                continue
+            # A number or literal ending exactly at the buffer edge may continue
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_json(f, chunk_size: int = CHUNK_SIZE):
+    stream = _JSONStream(f, chunk_size)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        if not isinstance(key, str):
+            raise RecordError("expected an object key")
+        stream.expect(":")
+        if key in SECTIONS:
+            stream.expect("[")
+            index = 0
+            if stream.peek() == "]":
+                stream.pos += 1
+            else:
+                while True:
+                    yield key, validate_record(key, stream.value(), f"{key}[{index}]")
+                    index += 1
+                    if stream.expect(",]") == "]":
+                        break
+        else:
+            # Unknown top-level entries are small metadata; decode and drop
+            stream.value()
+        if stream.expect(",}") == "}":
+            return
+
+
+def _iter_ndjson(f):
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise RecordError(f"line {lineno}: invalid JSON: {e.msg}") from e
+        section = NDJSON_KINDS.get(record.pop("kind", None)) if isinstance(record, dict) else None
+        if section is None:
+            raise RecordError(f"line {lineno}: kind must be one of {', '.join(NDJSON_KINDS)}")
+        yield section, validate_record(section, record, f"line {lineno}")
+
+
+def iter_records(path: Path, chunk_size: int = CHUNK_SIZE):
+    """Yield ``(section, record)`` pairs from a PR data dump as they are read.
+
+    ``section`` is ``pr_list``, ``comments`` or ``reviews``.  Files ending in
+    ``.ndjson``/``.jsonl`` are read as newline-delimited JSON, anything else
+    as a ``pr_data.json`` object.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix in NDJSON_SUFFIXES:
+            yield from _iter_ndjson(f)
+        else:
+            yield from _iter_json(f, chunk_size)
+
+
+def write_ndjson(data: dict, path: Path) -> Path:
+    """Write ``pr_data.json``-shaped data as newline-delimited JSON."""
+    kinds = {section: kind for kind, section in NDJSON_KINDS.items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for section in SECTIONS:
+            for record in data.get(section, ()):
+                f.write(json.dumps({"kind": kinds[section], **record}) + "\n")
+    return path
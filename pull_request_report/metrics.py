@@ -0,0 +1,222 @@
+"""
+Review metrics computed in bulk with NumPy
+
+PR records are loaded once into column arrays (categorical codes for repo,
+author and reviewer, ``datetime64`` timestamps, integer sizes) and every
+metric is a handful of array operations over all PRs at once: time-to-merge
+percentiles, churn, CHANGES_REQUESTED rate and review load, overall and per
+repo and author.  Grouped percentiles sort once by (group, value) and index
+each group's slice, so nothing loops over PRs in Python after loading.
+
+NumPy is an optional dependency (``pip install pull-request-report[metrics]``);
+importing this module without it raises ImportError.
+"""
+
+import numpy as np
+
+from .fetch import REVIEW_STATES
+
+PERCENTILES = (50, 75, 90)
+CHANGES_REQUESTED = REVIEW_STATES.index("CHANGES_REQUESTED")
+
+
+def _timestamps(values: list) -> np.ndarray:
+    """Parse ISO timestamps (``...Z`` or None) into ``datetime64[s]``."""
+    return np.array(
+        [value[:-1] if value and value.endswith("Z") else (value or "NaT") for value in values],
+        dtype="datetime64[s]",
+    )
+
+
+class PRColumns:
+    """Column arrays for a set of PRs and the reviewer entries on them."""
+
+    def __init__(self, pr_lists: dict):
+        """Load ``{repo: pr_list}``, where each PR has the ``pr_data.json`` shape."""
+        repos, authors, created, merged = [], [], [], []
+        additions, deletions, changed_files = [], [], []
+        review_pr, review_login, review_state = [], [], []
+        state_codes = {state: i for i, state in enumerate(REVIEW_STATES)}
+        for repo, pr_list in pr_lists.items():
+            for pr in pr_list:
+                index = len(repos)
+                repos.append(repo)
+                authors.append(pr.get("author") or "")
+                created.append(pr.get("created_at"))
+                merged.append(pr.get("merged_at"))
+                additions.append(pr.get("additions") or 0)
+                deletions.append(pr.get("deletions") or 0)
+                changed_files.append(pr.get("changed_files") or 0)
+                for reviewer in pr.get("reviewers") or ():
+                    review_pr.append(index)
+                    review_login.append(reviewer.get("login") or "")
+                    review_state.append(state_codes.get(reviewer.get("state"), -1))
+
+        self.repos, self.repo = np.unique(np.array(repos, dtype=str), return_inverse=True)
+        self.authors, self.author = np.unique(np.array(authors, dtype=str), return_inverse=True)
+        self.created = _timestamps(created)
+        self.merged = _timestamps(merged)
+        self.additions = np.array(additions, dtype=np.int64)
+        self.deletions = np.array(deletions, dtype=np.int64)
+        self.changed_files = np.array(changed_files, dtype=np.int64)
+        self.review_pr = np.array(review_pr, dtype=np.int64)
+        self.logins, self.review_login = np.unique(np.array(review_login, dtype=str), return_inverse=True)
+        self.review_state = np.array(review_state, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.created)
+
+    @property
+    def churn(self) -> np.ndarray:
+        return self.additions + self.deletions
+
+    @property
+    def hours_to_merge(self) -> np.ndarray:
+        """Hours from creation to merge, NaN for unmerged PRs."""
+        seconds = (self.merged - self.created).astype("timedelta64[s]").astype(np.float64)
+        # NaT does not cast to NaN, so mask it explicitly
+        seconds[np.isnat(self.merged) | np.isnat(self.created)] = np.nan
+        return seconds / 3600
+
+    @property
+    def group(self) -> np.ndarray:
+        """Code of each PR's (repo, author) pair: ``repo * len(authors) + author``."""
+        return self.repo * len(self.authors) + self.author
+
+
+def grouped_percentiles(groups: np.ndarray, values: np.ndarray, n_groups: int,
+                        percentiles=PERCENTILES) -> np.ndarray:
+    """Return an ``(n_groups, len(percentiles))`` array, ignoring NaN values.
+
+    Interpolates linearly between order statistics, like ``np.percentile``;
+    groups without values get NaN.
+    """
+    keep = ~np.isnan(values)
+    groups, values = groups[keep], values[keep]
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full((n_groups, len(percentiles)), np.nan)
+    present = counts > 0
+    for column, q in enumerate(percentiles):
+        position = starts[present] + (counts[present] - 1) * (q / 100)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        result[present, column] = values[low] + (values[high] - values[low]) * (position - low)
+    return result
+
+
+def _number(value, digits: int = 1):
+    """Round for display, turning NaN into None so the result is valid JSON."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def _percentile_dict(row) -> dict:
+    return {f"p{q}": _number(value) for q, value in zip(PERCENTILES, row)}
+
+
+def reviewer_stats(columns: PRColumns, groups: np.ndarray = None):
+    """Review load and CHANGES_REQUESTED counts per (group, reviewer).
+
+    ``groups`` gives each PR's group code; without it all PRs form one group.
+    Returns parallel arrays ``(group, login, reviews, changes_requested)``
+    holding only the pairs that occur, sorted by group.
+    """
+    review_group = groups[columns.review_pr] if groups is not None else np.zeros(len(columns.review_pr), np.int64)
+    keys = review_group * len(columns.logins) + columns.review_login
+    pairs, inverse = np.unique(keys, return_inverse=True)
+    reviews = np.bincount(inverse, minlength=len(pairs))
+    changes = np.bincount(inverse, weights=columns.review_state == CHANGES_REQUESTED, minlength=len(pairs))
+    return pairs // len(columns.logins), pairs % len(columns.logins), reviews, changes.astype(np.int64)
+
+
+def _reviewer_rows(columns: PRColumns, logins, reviews, changes) -> list:
+    order = np.lexsort((columns.logins[logins], -reviews))
+    return [
+        {
+            "login": str(columns.logins[logins[i]]),
+            "reviews": int(reviews[i]),
+            "changes_requested": int(changes[i]),
+            "changes_requested_rate": _number(changes[i] / reviews[i], 3),
+        }
+        for i in order
+    ]
+
+
+def compute_metrics(columns: PRColumns) -> dict:
+    """Compute the Overview metrics for every PR in ``columns``.
+
+    Returns plain Python values: an ``overall`` summary, one entry per
+    (repo, author) under ``groups`` and per-reviewer load under ``reviewers``.
+    """
+    hours = columns.hours_to_merge
+    churn = columns.churn
+    merged = ~np.isnan(hours)
+    n_groups = len(columns.repos) * len(columns.authors)
+    groups = columns.group
+
+    everyone = np.zeros(len(columns), np.int64)
+    _, logins, reviews, changes = reviewer_stats(columns)
+    overall = {
+        "prs": len(columns),
+        "merged": int(merged.sum()),
+        "time_to_merge_hours": _percentile_dict(grouped_percentiles(everyone, hours, 1)[0]),
+        "churn_total": int(churn.sum()),
+        "churn_mean": _number(churn.mean()) if len(columns) else None,
+        "churn_median": _number(np.median(churn)) if len(columns) else None,
+        "changed_files_mean": _number(columns.changed_files.mean()) if len(columns) else None,
+    }
+
+    counts = np.bincount(groups, minlength=n_groups)
+    merged_counts = np.bincount(groups, weights=merged, minlength=n_groups)
+    churn_totals = np.bincount(groups, weights=churn, minlength=n_groups)
+    ttm = grouped_percentiles(groups, hours, n_groups)
+    churn_p = grouped_percentiles(groups, churn.astype(np.float64), n_groups, (50,))
+    review_group, review_logins, group_reviews, group_changes = reviewer_stats(columns, groups)
+
+    present = np.flatnonzero(counts)
+    review_starts = np.searchsorted(review_group, present, side="left")
+    review_ends = np.searchsorted(review_group, present, side="right")
+
+    group_rows = []
+    for group, start, end in zip(present, review_starts, review_ends):
+        in_group = slice(start, end)
+        group_rows.append({
+            "repo": str(columns.repos[group // len(columns.authors)]),
+            "author": str(columns.authors[group % len(columns.authors)]),
+            "prs": int(counts[group]),
+            "merged": int(merged_counts[group]),
+            "time_to_merge_hours": _percentile_dict(ttm[group]),
+            "churn_total": int(churn_totals[group]),
+            "churn_mean": _number(churn_totals[group] / counts[group]),
+            "churn_median": _number(churn_p[group, 0]),
+            "reviewers": _reviewer_rows(
+                columns, review_logins[in_group], group_reviews[in_group], group_changes[in_group]
+            ),
+        })
+    group_rows.sort(key=lambda row: (-row["prs"], row["repo"], row["author"]))
+
+    return {
+        "overall": overall,
+        "groups": group_rows,
+        "reviewers": _reviewer_rows(columns, logins, reviews, changes),
+    }
+
+
+def metrics_for_pr_data(pr_lists: dict) -> dict:
+    """Convenience wrapper: ``{repo: pr_list}`` straight to metrics."""
+    return compute_metrics(PRColumns(pr_lists))
+
+
+def metrics_from_file(path, repo: str) -> dict:
+    """Compute metrics for the ``pr_list`` of one ``pr_data.json`` file.
+
+    Only PR records are read; comments and reviews are streamed past.
+    """
+    from .ingest import iter_records
+
+    prs = (record for section, record in iter_records(path) if section == "pr_list")
+    return metrics_for_pr_data({repo: prs})
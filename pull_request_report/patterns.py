@@ -0,0 +1,269 @@
+"""
+Deterministic Key Patterns from review comments
+
+Review comment bodies are turned into hashed unigram and bigram features,
+weighted by TF-IDF and stored as a CSR sparse matrix in plain NumPy arrays.
+Spherical k-means with a seeded k-means++ start groups them into recurring
+themes, and each theme is written out in the ``patterns`` structure that
+``parse_markdown_summary`` produces and ``generate_html`` renders:
+
+    {"name": ..., "issues": [...], "improvements": [...]}
+
+Everything is offline and reproducible: the same comments always give the
+same patterns.  100k comments take a few seconds on one core.  Needs NumPy
+(the ``metrics`` extra).
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+N_FEATURES = 1 << 18
+MAX_PATTERNS = 8
+MIN_PATTERN_SIZE = 2
+MIN_DF = 2
+ITERATIONS = 25
+SEED = 0
+
+TOKEN = re.compile(r"[a-z][a-z0-9_]+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+SUGGESTION = re.compile(
+    r"^(consider|use|add|extract|avoid|make sure|move|prefer|please|should|implement|ensure|replace|rename)\b",
+    re.IGNORECASE,
+)
+# Function words and review politeness that say nothing about the theme
+STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by can could do does for from has have here how i if in into is it its
+    just let like may me might more most my no not of on or our out over so some such than that the their
+    them then there these they this those to too up us was we were what when where which while who why will
+    with would you your also only very really should please maybe still consider make sure good
+    """.split()  # noqa: SIM905
+)
+
+
+class SparseRows:
+    """Minimal CSR matrix: row ``i`` is ``indices/data[indptr[i]:indptr[i + 1]]``."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_columns: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_columns = n_columns
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def row_ids(self) -> np.ndarray:
+        """Row number of every stored value."""
+        return np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+
+    def normalize(self) -> "SparseRows":
+        """Scale every non-empty row to unit L2 norm, in place."""
+        norms = np.sqrt(np.bincount(self.row_ids(), weights=self.data ** 2, minlength=self.n_rows))
+        norms[norms == 0] = 1
+        self.data /= np.repeat(norms, np.diff(self.indptr))
+        return self
+
+    def dot_dense(self, dense: np.ndarray) -> np.ndarray:
+        """Return ``self @ dense.T`` for a ``(k, n_columns)`` dense matrix."""
+        rows = self.row_ids()
+        result = np.empty((self.n_rows, dense.shape[0]))
+        # One weighted bincount per centroid keeps temporaries at O(nnz)
+        for j, vector in enumerate(dense):
+            result[:, j] = np.bincount(rows, weights=self.data * vector[self.indices], minlength=self.n_rows)
+        return result
+
+
+class Vectorizer:
+    """Hashed unigram + bigram TF-IDF features for comment bodies."""
+
+    def __init__(self, n_features: int = N_FEATURES, min_df: int = MIN_DF):
+        self.n_features = n_features
+        self.min_df = min_df
+        self._hashes = {}
+        # First spelling seen for each hashed feature, for naming patterns
+        self.terms = {}
+
+    def _feature(self, term: str) -> int:
+        feature = self._hashes.get(term)
+        if feature is None:
+            # crc32 rather than hash(): stable across processes and runs
+            feature = zlib.crc32(term.encode()) % self.n_features
+            self._hashes[term] = feature
+            self.terms.setdefault(feature, term)
+        return feature
+
+    def tokens(self, text: str) -> list:
+        return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+    def transform(self, texts) -> SparseRows:
+        """Vectorize ``texts``; columns are compacted to features with ``min_df``."""
+        features = []
+        lengths = []
+        for text in texts:
+            tokens = self.tokens(text)
+            row = [self._feature(t) for t in tokens]
+            row += [self._feature(f"{a} {b}") for a, b in zip(tokens, tokens[1:])]
+            features += row
+            lengths.append(len(row))
+        n_rows = len(lengths)
+
+        # Count (row, feature) pairs for every document with a single unique()
+        rows = np.repeat(np.arange(n_rows, dtype=np.int64), lengths)
+        pairs, tf = np.unique(rows * self.n_features + np.array(features, dtype=np.int64), return_counts=True)
+        rows, indices = np.divmod(pairs, self.n_features)
+
+        df = np.bincount(indices, minlength=self.n_features)
+        keep = df[indices] >= self.min_df
+        rows, indices, tf = rows[keep], indices[keep], tf[keep].astype(np.float64)
+        self.columns = np.flatnonzero(df >= self.min_df)
+        column_of = np.full(self.n_features, -1, np.int64)
+        column_of[self.columns] = np.arange(len(self.columns))
+
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_rows)))).astype(np.int64)
+        idf = np.log((1 + n_rows) / (1 + df[indices])) + 1
+        data = (1 + np.log(tf)) * idf
+        return SparseRows(indptr, column_of[indices], data, len(self.columns)).normalize()
+
+    def term(self, column: int) -> str:
+        return self.terms[int(self.columns[column])]
+
+
+def _kmeans_plus_plus(matrix: SparseRows, k: int, rng) -> np.ndarray:
+    """Greedy seeded k-means++ over non-empty rows, returning unit centroids.
+
+    Each step samples a few candidates in proportion to their distance from
+    the chosen centroids and keeps the one that lowers the total most.
+    """
+    candidates = np.flatnonzero(np.diff(matrix.indptr) > 0)
+    trials = 2 + int(np.log(k))
+    centroids = np.zeros((k, matrix.n_columns))
+    distance = None
+    for i in range(k):
+        if distance is None:
+            picks = candidates[rng.integers(len(candidates), size=1)]
+        else:
+            weights = distance[candidates]
+            if weights.sum() <= 0:
+                return centroids[:i]
+            picks = candidates[rng.choice(len(candidates), size=trials, p=weights / weights.sum())]
+
+        options = np.zeros((len(picks), matrix.n_columns))
+        for option, row in zip(options, picks):
+            span = slice(matrix.indptr[row], matrix.indptr[row + 1])
+            option[matrix.indices[span]] = matrix.data[span]
+        # Cosine distance of every row to each candidate
+        distances = np.clip(1 - matrix.dot_dense(options), 0, None)
+        if distance is not None:
+            distances = np.minimum(distances, distance[:, None])
+        best = int(np.argmin(distances.sum(axis=0)))
+        centroids[i] = options[best]
+        distance = distances[:, best]
+    return centroids
+
+
+def cluster(matrix: SparseRows, k: int, iterations: int = ITERATIONS, seed: int = SEED):
+    """Spherical k-means; returns ``(labels, centroids)``, label -1 for empty rows."""
+    rng = np.random.default_rng(seed)
+    centroids = _kmeans_plus_plus(matrix, k, rng)
+    empty = np.diff(matrix.indptr) == 0
+    labels = np.full(matrix.n_rows, -1)
+    rows = matrix.row_ids()
+    for _ in range(iterations):
+        new_labels = np.argmax(matrix.dot_dense(centroids), axis=1)
+        new_labels[empty] = -1
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        # Sum each cluster's rows with one bincount over (label, column) pairs
+        assigned = labels[rows] >= 0
+        flat = labels[rows][assigned] * matrix.n_columns + matrix.indices[assigned]
+        sums = np.bincount(flat, weights=matrix.data[assigned], minlength=len(centroids) * matrix.n_columns)
+        sums = sums.reshape(len(centroids), matrix.n_columns)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+    return labels, centroids
+
+
+def first_sentence(text: str, limit: int = 160) -> str:
+    sentence = SENTENCE_END.split(" ".join(text.split()), 1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit - 1].rstrip() + "…"
+
+
+def _pattern_name(vectorizer: Vectorizer, centroid: np.ndarray, words: int = 3) -> str:
+    names = []
+    for column in np.argsort(-centroid, kind="stable"):
+        if centroid[column] <= 0 or len(names) == words:
+            break
+        term = vectorizer.term(column)
+        # Skip terms already covered by a bigram in the name
+        if not any(term in name or name in term for name in names):
+            names.append(term)
+    return " & ".join(name.title() for name in names) or "Other Feedback"
+
+
+def extract_patterns(comments, max_patterns: int = MAX_PATTERNS, min_size: int = MIN_PATTERN_SIZE,
+                     examples: int = 3, seed: int = SEED) -> list:
+    """Cluster review comments into Key Patterns.
+
+    ``comments`` are ``pr_data.json`` comment records (only ``body`` and
+    ``file`` are used).  Patterns come largest first; clusters smaller than
+    ``min_size`` are not recurring and are dropped.  Issues are the comments
+    closest to each theme, improvements are its suggestions ("Consider…",
+    "Use…", "Extract…").
+    """
+    comments = [c for c in comments if (c.get("body") or "").strip()]
+    if not comments:
+        return []
+    vectorizer = Vectorizer()
+    matrix = vectorizer.transform(c["body"] for c in comments)
+    if matrix.n_columns == 0:
+        return []
+    k = max(1, min(max_patterns, matrix.n_rows // max(min_size, 1)))
+    labels, centroids = cluster(matrix, k, seed=seed)
+    similarity = matrix.dot_dense(centroids)[np.arange(matrix.n_rows), np.maximum(labels, 0)]
+
+    sizes = np.bincount(labels[labels >= 0], minlength=len(centroids))
+    patterns = []
+    for label in np.argsort(-sizes, kind="stable"):
+        if sizes[label] < min_size:
+            continue
+        members = np.flatnonzero(labels == label)
+        members = members[np.argsort(-similarity[members], kind="stable")]
+        issues, improvements, suggestions, seen = [], [], [], set()
+        for index in members:
+            comment = comments[index]
+            sentence = first_sentence(comment["body"])
+            if sentence in seen:
+                continue
+            seen.add(sentence)
+            where = f"**{comment['file']}**: " if comment.get("file") else ""
+            if SUGGESTION.match(sentence):
+                if len(improvements) < examples:
+                    improvements.append(sentence)
+                    suggestions.append(f"{where}{sentence}")
+            elif len(issues) < examples:
+                issues.append(f"{where}{sentence}")
+            if len(issues) == examples and len(improvements) == examples:
+                break
+        # A theme made only of suggestions still needs something to show as issues
+        issues = issues or suggestions
+        patterns.append({
+            "name": _pattern_name(vectorizer, centroids[label]),
+            "issues": issues,
+            "improvements": improvements,
+            "comments": int(sizes[label]),
+        })
+    return patterns
+
+
+def patterns_from_file(path) -> list:
+    """Extract Key Patterns from the comments in a ``pr_data.json`` file."""
+    from .ingest import iter_records
+    from .records import Comment
+
+    # extract_patterns keeps every comment, so hold them as compact records
+    return extract_patterns(Comment.from_json(record) for section, record in iter_records(path) if section == "comments")
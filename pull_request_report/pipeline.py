@@ -0,0 +1,491 @@
+"""
+Report pipeline for every repository and author in config.json
+
+Each (repository, author) pair is one job that moves through the stages
+fetch → analyze → summarize → render → pdf.  Work that every job shares (the
+engineering-docs sync and compiling the report template) runs once as a
+shared stage that the jobs depend on.  ``Scheduler`` runs the resulting task
+graph on a thread pool: a task starts as soon as its dependencies finished,
+so one job can be rendering while others are still fetching, and per-stage
+limits cap how many fetches or PDF renders run at once.  PDFs render on one
+warm process pool shared by every job.
+
+Every finished task is checkpointed together with the size and mtime of the
+file it wrote: appended as one line to ``reports/.state/pipeline.jsonl`` and
+folded into ``reports/.state/pipeline.json`` when the run ends.  Every output
+is written through a temp file and renamed.  ``run --resume`` reuses a task
+whose checkpoint still matches its output, so a run that died on one PDF
+picks up at that PDF instead of fetching everything again.  A failed task
+only blocks the later stages of its own job.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import prometheus
+from .cache import atomic_open, atomic_write_json
+from .profiling import span
+
+STAGES = ("fetch", "analyze", "summarize", "render", "pdf")
+SHARED = "*"
+DEFAULT_STATE_FILE = Path("reports") / ".state" / "pipeline.json"
+# Default ceilings for stages that hit external resources
+DEFAULT_LIMITS = {"fetch": 4, "pdf": 1}
+DRAFT_MARKER = "<!-- draft summary written by pr-report run -->"
+
+
+class PipelineError(RuntimeError):
+    """Raised by a stage that cannot produce its output."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _stamp(path: Path):
+    """Size and mtime of ``path``, or None if it is missing."""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class Job:
+    """One (repository, author) report."""
+
+    __slots__ = ("repo", "name", "author", "report_dir", "config")
+
+    def __init__(self, repo: str, name: str, author: str, report_dir: Path, config: dict):
+        self.repo = repo
+        self.name = name
+        self.author = author
+        self.report_dir = Path(report_dir)
+        self.config = config
+
+    @property
+    def id(self) -> str:
+        return f"{self.repo}@{self.author}" if self.author else self.repo
+
+    def path(self, stage: str) -> Path:
+        """The file ``stage`` writes for this job."""
+        return self.report_dir / {
+            "fetch": "pr_data.json",
+            "analyze": "analysis.json",
+            "summarize": "summary.md",
+            "render": "analysis-report.html",
+            "pdf": "analysis-report.pdf",
+        }[stage]
+
+
+def expand_jobs(config: dict, reports_dir: Path = Path("reports"), repos=None, authors=None) -> list:
+    """One job per configured repository × author.
+
+    Authors come from ``analysis_settings.authors`` (or the single
+    ``author``); ``repos`` and ``authors`` narrow the selection.  Reports go
+    to ``reports/<repo>/`` for a single author and ``reports/<repo>/<author>/``
+    when there are several.
+    """
+    from .fetch import repo_slug
+
+    settings = config.get("analysis_settings", {})
+    if authors is None:
+        authors = settings.get("authors") or ([settings["author"]] if settings.get("author") else [None])
+    entries = config.get("repositories", [])
+    if repos:
+        wanted = {repo_slug(repo) for repo in repos}
+        entries = [entry for entry in entries if repo_slug(entry) in wanted]
+        known = {repo_slug(entry) for entry in entries}
+        entries += [{"name": slug.split("/")[-1], "github_url": slug} for slug in sorted(wanted - known)]
+
+    jobs = []
+    for entry in entries:
+        slug = repo_slug(entry)
+        name = entry.get("name") or slug.split("/")[-1]
+        for author in authors:
+            report_dir = Path(reports_dir) / name
+            if len(authors) > 1:
+                report_dir = report_dir / author
+            # Rendering reads the first repository and the author from the config
+            job_config = {
+                **config,
+                "repositories": [entry],
+                "analysis_settings": {**settings, "author": author},
+            }
+            jobs.append(Job(slug, name, author, report_dir, job_config))
+    return jobs
+
+
+class PipelineState:
+    """Checkpoints of finished tasks.
+
+    Each checkpoint is appended to a journal next to ``path`` as it happens;
+    ``compact`` folds the journal into ``path`` and removes it.  Loading
+    replays a journal left behind by a run that died, skipping a torn last line.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STATE_FILE):
+        self.path = Path(path)
+        self.journal = self.path.with_suffix(".jsonl")
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self.tasks = json.load(f).get("tasks", {})
+        except (FileNotFoundError, ValueError):
+            self.tasks = {}
+        try:
+            with open(self.journal, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        job_id, stage, checkpoint = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.tasks.setdefault(job_id, {})[stage] = checkpoint
+        except FileNotFoundError:
+            pass
+
+    def get(self, job_id: str, stage: str) -> dict:
+        return self.tasks.get(job_id, {}).get(stage, {})
+
+    def record(self, job_id: str, stage: str, status: str, output: Path = None, **info) -> None:
+        """Checkpoint a task; ``output`` is stamped so later edits invalidate it."""
+        if output is not None and status == "done":
+            info["output"] = _stamp(output)
+        checkpoint = {"status": status, "at": _now(), **info}
+        line = json.dumps([job_id, stage, checkpoint]) + "\n"
+        with self._lock:
+            self.tasks.setdefault(job_id, {})[stage] = checkpoint
+            self.journal.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def finished(self, job_id: str, stage: str, output: Path = None) -> bool:
+        """True when the task finished and its output is unchanged since."""
+        checkpoint = self.get(job_id, stage)
+        if checkpoint.get("status") != "done":
+            return False
+        return output is None or (checkpoint.get("output") is not None and checkpoint["output"] == _stamp(output))
+
+    def reset(self, job_ids) -> None:
+        with self._lock:
+            for job_id in job_ids:
+                self.tasks.pop(job_id, None)
+            self._compact()
+
+    def compact(self) -> None:
+        """Write every checkpoint to ``path`` and drop the journal."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        atomic_write_json(self.path, {"tasks": self.tasks})
+        self.journal.unlink(missing_ok=True)
+
+
+class Task:
+    __slots__ = ("job_id", "stage", "run", "deps", "output")
+
+    def __init__(self, job_id: str, stage: str, run, deps=(), output: Path = None):
+        self.job_id = job_id
+        self.stage = stage
+        self.run = run
+        self.deps = tuple(deps)
+        self.output = output
+
+    @property
+    def key(self) -> tuple:
+        return (self.job_id, self.stage)
+
+
+class Scheduler:
+    """Run a graph of ``Task`` on a thread pool with per-stage concurrency limits."""
+
+    def __init__(self, tasks: list, state: PipelineState, workers: int = 4, limits: dict = None,
+                 on_update=None):
+        self.tasks = {task.key: task for task in tasks}
+        self.state = state
+        self.workers = max(1, workers)
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.on_update = on_update
+        self.status = {}
+
+    def _set(self, task: Task, status: str, **info) -> None:
+        self.status[task.key] = status
+        if status in ("done", "failed"):
+            self.state.record(task.job_id, task.stage, status, output=task.output, **info)
+        if status == "failed":
+            prometheus.inc("pr_report_failures_total", repo=task.job_id.split("@")[0], stage=task.stage)
+        if self.on_update:
+            self.on_update(task, status, info)
+
+    def run(self, resume: bool = False) -> dict:
+        """Run every task; returns ``{(job_id, stage): status}``.
+
+        Status is ``done``, ``cached`` (checkpoint reused on resume),
+        ``failed`` or ``blocked`` (a dependency failed).  With ``resume`` a
+        task is reused only when everything it depends on was reused too.
+        """
+        try:
+            return self._run(resume)
+        finally:
+            self.state.compact()
+
+    def _run(self, resume: bool) -> dict:
+        waiting = list(self.tasks.values())
+        running = {}
+        per_stage = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while waiting or running:
+                for task in list(waiting):
+                    deps = [self.status.get(dep) for dep in task.deps]
+                    if any(status in ("failed", "blocked") for status in deps):
+                        waiting.remove(task)
+                        self._set(task, "blocked")
+                    elif all(status in ("done", "cached") for status in deps):
+                        # Work redone upstream invalidates this task's checkpoint
+                        fresh_inputs = all(status == "cached" for status in deps)
+                        if resume and fresh_inputs and self.state.finished(task.job_id, task.stage, task.output):
+                            waiting.remove(task)
+                            self._set(task, "cached")
+                            continue
+                        limit = self.limits.get(task.stage, self.workers)
+                        if len(running) >= self.workers or per_stage.get(task.stage, 0) >= limit:
+                            continue
+                        waiting.remove(task)
+                        per_stage[task.stage] = per_stage.get(task.stage, 0) + 1
+                        self._set(task, "running")
+                        running[pool.submit(self._timed, task)] = task
+                if not running:
+                    # Tasks whose status changed may have unblocked others
+                    if waiting and not any(
+                        all(self.status.get(dep) in ("done", "cached") for dep in task.deps)
+                        or any(self.status.get(dep) in ("failed", "blocked") for dep in task.deps)
+                        for task in waiting
+                    ):
+                        raise PipelineError("task graph has a cycle or an unknown dependency")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    per_stage[task.stage] -= 1
+                    try:
+                        seconds, info = future.result()
+                    except Exception as e:
+                        self._set(task, "failed", error=f"{type(e).__name__}: {e}")
+                    else:
+                        self._set(task, "done", seconds=round(seconds, 3), **(info or {}))
+        return dict(self.status)
+
+    @staticmethod
+    def _timed(task: Task):
+        start = time.perf_counter()
+        with span(f"{task.stage} stage", job=task.job_id):
+            info = task.run()
+        return time.perf_counter() - start, info
+
+
+class ReportPipeline:
+    """Build and run the task graph for a set of jobs."""
+
+    def __init__(self, config: dict, jobs: list, reports_dir: Path = Path("reports"), pdf: bool = True,
+                 backend: str = "auto", fetch_jobs: int = 8, cache=None, gh: str = "gh", limiter=None,
+                 api: str = "rest", shared_css: bool = False, pdf_workers: int = 1):
+        from .docs_sync import rule_index_path
+
+        self.config = config
+        self.jobs = jobs
+        self.reports_dir = Path(reports_dir)
+        self.pdf = pdf
+        self.backend = backend
+        self.fetch_jobs = fetch_jobs
+        self.cache = cache
+        self.gh = gh
+        # One limiter for every job: they all spend the same GitHub budget
+        self.limiter = limiter
+        self.api = api
+        # Where sync_docs below leaves the rule index the standards come from
+        self.rule_index = rule_index_path(self.reports_dir)
+        # One report.<hash>.css in reports_dir, linked by every report
+        self.shared_css = shared_css
+        # PDF renders at once, on the pool open while ``run`` is
+        self.pdf_workers = max(1, pdf_workers)
+        self.pdf_pool = None
+
+    # Shared stages
+
+    def sync_docs(self):
+        from .docs_sync import DocsSyncError, docs_cache_dir, sync_docs
+
+        try:
+            result = sync_docs(self.config, docs_cache_dir(self.reports_dir))
+        except DocsSyncError as e:
+            # Jobs still run against the last synced rules, if any
+            return {"warning": str(e)}
+        return {"rules": result["rules"], "commit": result["commit"]} if result else {}
+
+    def compile_template(self):
+        import convert_to_pdf
+
+        convert_to_pdf.report_template()
+        convert_to_pdf.report_css()
+        if self.shared_css:
+            return {"css": str(convert_to_pdf.write_shared_css(self.reports_dir))}
+        return {}
+
+    # Per-job stages
+
+    def fetch(self, job: Job):
+        from .fetch import make_fetcher, write_pr_data
+
+        settings = job.config.get("analysis_settings", {})
+        fetcher = make_fetcher(
+            self.api,
+            jobs=self.fetch_jobs,
+            count=settings.get("pr_limit", 10),
+            author=job.author,
+            include_drafts=settings.get("include_draft_prs", False),
+            include_closed=settings.get("include_closed_prs", True),
+            gh=self.gh,
+            cache=self.cache,
+            limiter=self.limiter,
+        )
+        data = fetcher.fetch_all([job.repo])[job.repo]
+        if "error" in data:
+            raise PipelineError(data["error"])
+        write_pr_data(data, job.path("fetch"))
+        return {"prs": [pr["number"] for pr in data["pr_list"]], "comments": len(data["comments"])}
+
+    def analyze(self, job: Job):
+        """Validate pr_data.json and keep what the summary draft needs in analysis.json."""
+        import convert_to_pdf
+
+        from .ingest import iter_records
+
+        counts = {"pr_list": 0, "comments": 0, "reviews": 0}
+        prs = []
+        for section, record in iter_records(job.path("fetch")):
+            counts[section] += 1
+            if section == "pr_list":
+                prs.append({"number": record["number"], "title": record["title"]})
+        pr_data = job.path("fetch")
+        analysis = {
+            "repo": job.repo,
+            "author": job.author,
+            "counts": counts,
+            "prs": prs,
+            "patterns": convert_to_pdf.report_patterns(pr_data) or [],
+            "standards_compliance": convert_to_pdf.report_standards(
+                convert_to_pdf.load_standards_index(job.config, self.rule_index), pr_data
+            ) or "",
+        }
+        atomic_write_json(job.path("analyze"), analysis, indent=2)
+        return {"prs": counts["pr_list"], "patterns": len(analysis["patterns"])}
+
+    def summarize(self, job: Job):
+        """Write a draft summary.md unless one written by hand (or by Claude) is there."""
+        summary = job.path("summarize")
+        if summary.exists() and DRAFT_MARKER not in summary.read_text(encoding="utf-8"):
+            return {"draft": False}
+        with open(job.path("analyze")) as f:
+            analysis = json.load(f)
+        with atomic_open(summary, encoding="utf-8") as f:
+            f.write(draft_summary(analysis))
+        return {"draft": True}
+
+    def render(self, job: Job):
+        import convert_to_pdf
+
+        (result,) = convert_to_pdf.convert_summaries(
+            [job.path("summarize")], job.config, pdf=False, shared_css=self.shared_css, css_root=self.reports_dir,
+            rule_index=self.rule_index,
+        )
+        if result["error"]:
+            raise PipelineError(result["error"])
+        return {"cached": bool(result["cached"])}
+
+    def render_pdf(self, job: Job):
+        import convert_to_pdf
+
+        (result,) = convert_to_pdf.convert_summaries(
+            [job.path("summarize")], job.config, pdf=True, backend=self.backend, shared_css=self.shared_css,
+            css_root=self.reports_dir, rule_index=self.rule_index, pdf_pool=self.pdf_pool,
+        )
+        if result["error"]:
+            raise PipelineError(result["error"])
+        return {"cached": "pdf" in result["cached"]}
+
+    def tasks(self) -> list:
+        tasks = [
+            Task(SHARED, "docs", self.sync_docs),
+            Task(SHARED, "template", self.compile_template),
+        ]
+        runners = {
+            "fetch": (self.fetch, ()),
+            "analyze": (self.analyze, ((SHARED, "docs"),)),
+            "summarize": (self.summarize, ()),
+            "render": (self.render, ((SHARED, "template"),)),
+            "pdf": (self.render_pdf, ()),
+        }
+        for job in self.jobs:
+            previous = None
+            for stage in STAGES if self.pdf else STAGES[:-1]:
+                run, shared = runners[stage]
+                deps = list(shared) + ([(job.id, previous)] if previous else [])
+                tasks.append(Task(job.id, stage, lambda run=run, job=job: run(job), deps, job.path(stage)))
+                previous = stage
+        return tasks
+
+    def run(self, state: PipelineState, workers: int = 4, limits: dict = None, resume: bool = False,
+            on_update=None) -> dict:
+        """Run every job; without ``resume`` the jobs' old checkpoints are dropped first."""
+        import convert_to_pdf
+
+        if not resume:
+            state.reset([SHARED] + [job.id for job in self.jobs])
+        limits = {"pdf": self.pdf_workers, **(limits or {})}
+        scheduler = Scheduler(self.tasks(), state, workers=workers, limits=limits, on_update=on_update)
+        if not self.pdf or self.pdf_workers == 1:
+            return scheduler.run(resume=resume)
+        # Workers start with the first PDF and stay warm for the rest
+        with convert_to_pdf.pdf_worker_pool(self.pdf_workers) as pool:
+            self.pdf_pool = pool
+            try:
+                return scheduler.run(resume=resume)
+            finally:
+                self.pdf_pool = None
+
+
+def draft_summary(analysis: dict) -> str:
+    """A summary.md in the format ``parse_markdown_summary`` reads, built from analysis.json."""
+    who = f" by {analysis['author']}" if analysis.get("author") else ""
+    lines = [
+        "# Pull Request Analysis Summary",
+        DRAFT_MARKER,
+        "",
+        "## Overview",
+        "",
+        f"Analyzed {analysis['counts']['pr_list']} recent pull requests{who} from the {analysis['repo']} "
+        f"repository, with {analysis['counts']['comments']} review comments and "
+        f"{analysis['counts']['reviews']} reviews.",
+        "",
+        "**PRs Analyzed:**",
+        *(f"- PR #{pr['number']}: {pr['title']}" for pr in analysis["prs"]),
+        "",
+        "## Key Patterns Identified",
+        "",
+    ]
+    for number, pattern in enumerate(analysis["patterns"], 1):
+        lines += [f"### {number}. **{pattern['name']}**", "", "**Recurring Issues:**"]
+        lines += [f"- {issue}" for issue in pattern["issues"]]
+        if pattern["improvements"]:
+            lines += ["", "**Improvement Actions:**"]
+            lines += [f"- {improvement}" for improvement in pattern["improvements"]]
+        lines.append("")
+    if analysis.get("standards_compliance"):
+        lines += ["## Standards Compliance", "", analysis["standards_compliance"].rstrip(), ""]
+    return "\n".join(lines) + "\n"
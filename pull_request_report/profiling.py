@@ -0,0 +1,144 @@
+"""
+Timed spans for finding where a run spends its time
+
+Stages wrap themselves in ``span("parse")``, ``span("gh api", path=...)``
+and so on.  Finished spans go to every registered sink: the ``Profiler`` of
+``profiling()`` and the Prometheus exporter.  With no sink a span only checks
+one global, so the hooks stay in place permanently.  The profiler records
+every span with its thread, which gives a per-stage table (``profile_table``), a Chrome
+trace-event file for chrome://tracing or https://ui.perfetto.dev, and
+optionally a cProfile dump of the same run.
+
+Spans opened in worker processes (``convert --workers`` with weasyprint) are
+not collected; the parent's ``pdf`` span still covers them.  cProfile only
+sees the thread that started profiling, so fetch threads show up in the
+spans and the trace but not in the pstats dump.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_sinks = ()
+
+
+def add_sink(sink) -> None:
+    """Send finished spans to ``sink.add(name, start, seconds, args)``."""
+    global _sinks
+    _sinks = (*_sinks, sink)
+
+
+def remove_sink(sink) -> None:
+    global _sinks
+    _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+class Profiler:
+    """Collects finished spans as ``(name, start, seconds, thread, args)``."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, seconds: float, args: dict) -> None:
+        with self._lock:
+            self.spans.append((name, start, seconds, threading.get_native_id(), args))
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self) -> list:
+        """Per span name: calls, total, mean and max seconds, in order of first use."""
+        stages = {}
+        for name, _, seconds, _, _ in self.spans:
+            stage = stages.setdefault(name, {"name": name, "calls": 0, "total": 0.0, "max": 0.0})
+            stage["calls"] += 1
+            stage["total"] += seconds
+            stage["max"] = max(stage["max"], seconds)
+        for stage in stages.values():
+            stage["mean"] = stage["total"] / stage["calls"]
+        return list(stages.values())
+
+    def chrome_trace(self) -> dict:
+        """The spans as complete ("X") events of the Chrome trace-event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name, "ph": "X", "pid": pid, "tid": thread,
+                "ts": round((start - self.started) * 1e6, 1), "dur": round(seconds * 1e6, 1),
+                "args": {key: str(value) for key, value in args.items()},
+            }
+            for name, start, seconds, thread, args in sorted(self.spans, key=lambda span: span[1])
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path) -> None:
+        from .cache import atomic_write_json
+
+        atomic_write_json(path, self.chrome_trace())
+
+
+@contextmanager
+def span(name: str, **args):
+    """Time the block as one ``name`` span when profiling or metrics are on."""
+    sinks = _sinks
+    if not sinks:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        for sink in sinks:
+            sink.add(name, start, seconds, args)
+
+
+@contextmanager
+def profiling(stats_path=None, trace_path=None):
+    """Record spans (and cProfile stats when ``stats_path`` is set) for the block.
+
+    Yields the ``Profiler``; the stats and trace files are written on exit.
+    """
+    profiler = Profiler()
+    cprofile = None
+    if stats_path:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+    add_sink(profiler)
+    if cprofile:
+        cprofile.enable()
+    try:
+        yield profiler
+    finally:
+        if cprofile:
+            cprofile.disable()
+        remove_sink(profiler)
+        profiler.finished = time.perf_counter()
+        if cprofile:
+            cprofile.dump_stats(str(stats_path))
+        if trace_path:
+            profiler.write_trace(trace_path)
+
+
+def profile_table(profiler: Profiler):
+    """A rich table of the per-stage summary."""
+    from rich.table import Table
+
+    wall = profiler.wall_seconds
+    table = Table(title=f"Profile ({wall:.2f}s)")
+    table.add_column("Stage")
+    for column in ("Calls", "Total s", "Mean ms", "Max ms", "% of run"):
+        table.add_column(column, justify="right")
+    for stage in profiler.summary():
+        table.add_row(
+            stage["name"], str(stage["calls"]), f"{stage['total']:.3f}", f"{stage['mean'] * 1000:.1f}",
+            f"{stage['max'] * 1000:.1f}", f"{stage['total'] / wall:.0%}" if wall else "–",
+        )
+    table.caption = "Concurrent spans overlap, so totals can exceed 100%"
+    return table
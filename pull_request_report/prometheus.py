@@ -0,0 +1,234 @@
+"""
+Prometheus metrics for scheduled report runs
+
+``exporting()`` turns on a process-wide ``Exporter`` that the fetch layer,
+the response cache, the pipeline and the PDF converter report into through
+``inc``/``set_gauge``/``observe``.  Those are no-ops while no exporter is on.
+The exporter is also a span sink (see ``profiling``), so every timed stage,
+from a single ``gh api`` call to a whole PDF render, lands in the
+``pr_report_stage_seconds`` histogram.
+
+Metrics are served in the Prometheus text format in two ways.  A textfile is
+rewritten atomically every few seconds and once more at the end, for
+node_exporter's textfile collector.  A local HTTP endpoint serves the live
+values while a long run is in progress.  The format is simple enough to
+write directly, so prometheus_client is not needed.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import profiling
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+PAGE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+# How often a textfile is rewritten during a run
+TEXTFILE_INTERVAL = 15.0
+
+# name: (type, help, label names, histogram buckets)
+METRICS = {
+    "pr_report_prs_fetched_total": ("counter", "Pull requests fetched from GitHub", ("repo",), None),
+    "pr_report_prs_fetched_per_second": (
+        "gauge", "Pull requests fetched per second since the run started", (), None,
+    ),
+    "pr_report_github_api_calls_total": ("counter", "gh api calls by HTTP status (0: gh failed)", ("status",), None),
+    "pr_report_github_throttled_total": ("counter", "gh api calls rejected by a rate limit and retried", (), None),
+    "pr_report_github_rate_limit_remaining": (
+        "gauge", "Calls left in the current GitHub rate-limit window", (), None,
+    ),
+    "pr_report_cache_requests_total": (
+        "counter", "Response cache lookups: hits, revalidated (304) or misses", ("result",), None,
+    ),
+    "pr_report_cache_hit_ratio": ("gauge", "Share of cache lookups answered without downloading", (), None),
+    "pr_report_failures_total": ("counter", "Failed repositories by pipeline stage", ("repo", "stage"), None),
+    "pr_report_stage_seconds": ("histogram", "Duration of each timed stage", ("stage",), STAGE_BUCKETS),
+    "pr_report_pdf_pages": ("histogram", "Pages per rendered PDF", (), PAGE_BUCKETS),
+}
+
+_exporter = None
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class Exporter:
+    """Current values of every metric in ``METRICS``."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.last_fetch = None
+        self.values = {name: {} for name in METRICS}
+        self.url = None
+        self._lock = threading.Lock()
+
+    def _key(self, name: str, labels: dict) -> tuple:
+        return tuple(str(labels.get(label, "")) for label in METRICS[name][2])
+
+    def inc(self, name: str, amount: float = 1, labels: dict = None) -> None:
+        key = self._key(name, labels or {})
+        with self._lock:
+            series = self.values[name]
+            series[key] = series.get(key, 0) + amount
+            if name == "pr_report_prs_fetched_total":
+                self.last_fetch = time.time()
+
+    def set(self, name: str, value: float, labels: dict = None) -> None:
+        key = self._key(name, labels or {})
+        with self._lock:
+            self.values[name][key] = value
+
+    def observe(self, name: str, value: float, labels: dict = None) -> None:
+        buckets = METRICS[name][3]
+        key = self._key(name, labels or {})
+        with self._lock:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            counts, total, count = self.values[name].get(key) or ([0] * (len(buckets) + 1), 0.0, 0)
+            counts[bisect.bisect_left(buckets, value)] += 1
+            self.values[name][key] = (counts, total + value, count + 1)
+
+    def add(self, name: str, start: float, seconds: float, args: dict) -> None:  # noqa: ARG002 - span sink
+        self.observe("pr_report_stage_seconds", seconds, {"stage": name})
+
+    def _derive(self) -> None:
+        fetched = sum(self.values["pr_report_prs_fetched_total"].values())
+        if self.last_fetch is not None and self.last_fetch > self.started:
+            self.values["pr_report_prs_fetched_per_second"][()] = fetched / (self.last_fetch - self.started)
+        lookups = self.values["pr_report_cache_requests_total"]
+        total = sum(lookups.values())
+        if total:
+            answered = lookups.get(("hits",), 0) + lookups.get(("revalidated",), 0)
+            self.values["pr_report_cache_hit_ratio"][()] = answered / total
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            self._derive()
+            for name, (kind, help_text, label_names, buckets) in METRICS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                series = self.values[name]
+                if kind == "counter" and not label_names and not series:
+                    series = {(): 0}
+                for key, value in sorted(series.items()):
+                    if kind != "histogram":
+                        lines.append(f"{name}{_labels(label_names, key)} {_number(value)}")
+                        continue
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket in zip((*buckets, "+Inf"), counts):
+                        cumulative += bucket
+                        le = f'le="{_number(bound) if bound != "+Inf" else bound}"'
+                        lines.append(f"{name}_bucket{_labels(label_names, key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(label_names, key)} {_number(total)}")
+                    lines.append(f"{name}_count{_labels(label_names, key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path) -> None:
+        """Replace ``path`` atomically, as the textfile collector requires."""
+        from .cache import atomic_open
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(path) as f:
+            f.write(self.render())
+
+
+def serve(exporter: Exporter, port: int = 0, host: str = "127.0.0.1"):
+    """Serve ``/metrics`` from a background thread; returns the started server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = exporter.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    exporter.url = f"http://{host}:{server.server_address[1]}/metrics"
+    return server
+
+
+@contextmanager
+def exporting(textfile=None, port: int = None, interval: float = TEXTFILE_INTERVAL):
+    """Collect metrics for the block, serving them on ``port`` and/or writing ``textfile``.
+
+    ``port`` 0 picks a free port; the exporter's ``url`` says which.
+    """
+    global _exporter
+    exporter = Exporter()
+    server = serve(exporter, port) if port is not None else None
+    stop = threading.Event()
+    writer = None
+    if textfile:
+        def rewrite():
+            while not stop.wait(interval):
+                exporter.write_textfile(textfile)
+
+        writer = threading.Thread(target=rewrite, daemon=True)
+        writer.start()
+    _exporter = exporter
+    profiling.add_sink(exporter)
+    try:
+        yield exporter
+    finally:
+        profiling.remove_sink(exporter)
+        _exporter = None
+        stop.set()
+        if writer:
+            writer.join()
+        if textfile:
+            exporter.write_textfile(textfile)
+        if server:
+            server.shutdown()
+            server.server_close()
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    exporter = _exporter
+    if exporter is not None:
+        exporter.inc(name, amount, labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    exporter = _exporter
+    if exporter is not None:
+        exporter.set(name, value, labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    exporter = _exporter
+    if exporter is not None:
+        exporter.observe(name, value, labels)
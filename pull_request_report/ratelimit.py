@@ -0,0 +1,174 @@
+"""
+GitHub rate-limit aware scheduling of API calls
+
+GitHub allows a fixed number of REST calls per window (the primary limit) and
+rejects bursts of rapid or concurrent calls with 403/429 (secondary limits).
+``RateLimiter`` is a token bucket shared by every fetch thread: each call takes
+a token.  While plenty of the window's budget is left the bucket refills at
+once and calls go out at burst speed; once less than ``reserve`` of it
+remains, the refill rate is re-planned from the ``X-RateLimit-*`` headers of
+every response so the rest is spread evenly until the window resets instead
+of running out minutes in.  Callers waiting for a
+token are served by priority, so cheap PR metadata calls go ahead of comment
+and review pagination.
+
+A throttled call pauses every caller: until ``Retry-After`` or the window
+reset when GitHub says when, otherwise for an exponentially growing delay.
+Each throttling episode also halves the number of calls allowed in flight,
+which then grows back by about one per round of successful calls.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+PRIORITY_METADATA = 0
+PRIORITY_PAGES = 1
+# GitHub asks clients to wait at least a minute after an unexplained secondary limit
+DEFAULT_BACKOFF = 60.0
+MAX_RETRIES = 5
+# Pace calls once less than this share of the window's budget is left
+DEFAULT_RESERVE = 0.2
+# GitHub's hourly REST budget for authenticated users, when X-RateLimit-Limit is missing
+DEFAULT_LIMIT = 5000
+
+
+class RateLimiter:
+    """Token bucket whose rate follows GitHub's rate-limit headers."""
+
+    def __init__(self, burst: int = 8, rate: float = None, backoff: float = DEFAULT_BACKOFF,
+                 max_retries: int = MAX_RETRIES, reserve: float = DEFAULT_RESERVE):
+        # ``rate`` is calls per second; None means calls are not paced
+        self.burst = max(1, burst)
+        self.rate = rate
+        self.reserve = reserve
+        self.backoff = backoff
+        self.max_retries = max_retries
+        self.tokens = float(self.burst)
+        self.updated = time.time()
+        self.paused_until = 0.0
+        # Calls allowed in flight, cut on throttling and regrown on success
+        self.concurrency = float(self.burst)
+        self.in_flight = 0
+        self.remaining = None
+        self.reset_at = None
+        self.failures = 0
+        self.waited = 0.0
+        self.throttled = 0
+        self._cond = threading.Condition()
+        self._queue = []
+        self._tickets = itertools.count()
+
+    def _refill(self, now: float) -> None:
+        if self.reset_at is not None and now >= self.reset_at:
+            # A fresh window: unpaced until the next response re-plans the rate
+            self.rate = self.remaining = self.reset_at = None
+        if self.rate is None:
+            # Unpaced, but never more calls than the window has left
+            self.tokens = float(self.burst if self.remaining is None else min(self.burst, max(self.remaining, 0)))
+        else:
+            # Nothing accrues while paused, so a pause never ends in a burst
+            start = max(self.updated, min(self.paused_until, now))
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self.updated = now
+
+    def _delay(self, now: float):
+        """Seconds until the first waiter can go, or None to wait for a notify."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.concurrency):
+            return None
+        if self.tokens >= 1:
+            return 0.0
+        if self.rate is None:
+            # Calls already sent spent the window
+            return max(self.reset_at - now, 0.0)
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self, priority: int = PRIORITY_METADATA) -> float:
+        """Block until a call may go out and return the seconds spent waiting.
+
+        Every ``acquire`` must be followed by a ``release`` once the response
+        (or error) is in.
+        """
+        start = time.time()
+        with self._cond:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.time()
+                    self._refill(now)
+                    delay = self._delay(now) if self._queue[0] == ticket else None
+                    if delay == 0.0:
+                        self.tokens -= 1
+                        self.in_flight += 1
+                        if self.remaining is not None:
+                            self.remaining -= 1
+                        break
+                    self._cond.wait(delay)
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+            waited = time.time() - start
+            self.waited += waited
+        return waited
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def update(self, headers: dict) -> None:
+        """Re-plan the refill rate from a successful response's headers."""
+        with self._cond:
+            self.failures = 0
+            self.concurrency = min(self.burst, self.concurrency + 1 / self.concurrency)
+            remaining = headers.get("x-ratelimit-remaining")
+            reset = headers.get("x-ratelimit-reset")
+            if remaining is not None and reset is not None:
+                now = time.time()
+                # Calls still in flight may not be counted in the header yet
+                self.remaining = int(remaining) - self.in_flight
+                self.reset_at = float(reset)
+                if self.remaining < int(headers.get("x-ratelimit-limit", DEFAULT_LIMIT)) * self.reserve:
+                    # Running low: spread what is left evenly over the rest of the window
+                    self.rate = max(self.remaining, 1) / max(self.reset_at - now, 1.0)
+                    self.tokens = min(self.tokens, self.remaining)
+                else:
+                    self.rate = None
+                if self.remaining <= 0:
+                    self.paused_until = max(self.paused_until, self.reset_at)
+            self._cond.notify_all()
+
+    def throttle(self, status: int, headers: dict = None, message: str = "", attempt: int = 0) -> bool:
+        """Record a rejected call; True when it was rate limited and should be retried.
+
+        A 403 only counts as throttling when GitHub says so, through the
+        headers or the error message; anything else is a real permission error.
+        """
+        headers = headers or {}
+        exhausted = headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers
+        if status not in (403, 429):
+            return False
+        if status == 403 and not (exhausted or "retry-after" in headers or "rate limit" in message.lower()):
+            return False
+        with self._cond:
+            now = time.time()
+            self.throttled += 1
+            if now >= self.paused_until:
+                # A new throttling episode rather than another call of the same one
+                self.failures += 1
+                self.concurrency = max(1.0, self.concurrency / 2)
+            if "retry-after" in headers:
+                until = now + float(headers["retry-after"])
+            elif exhausted:
+                until = float(headers["x-ratelimit-reset"])
+            else:
+                until = now + self.backoff * 2 ** (self.failures - 1)
+            self.paused_until = max(self.paused_until, until)
+            self.tokens = 0.0
+            self._cond.notify_all()
+        return attempt < self.max_retries
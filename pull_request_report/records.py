@@ -0,0 +1,166 @@
+"""
+Compact record types for PRs, comments and reviews
+
+``pr_data.json`` decodes into one dict per record, each with its own hash
+table and its own copy of every login and file path.  For histories with
+millions of comments that overhead dominates memory, so these slotted
+classes hold the same fields without a per-instance ``__dict__``; states are
+shared enum members and logins and paths are interned, so repeated values
+cost one pointer each.
+
+``from_json``/``to_json`` convert to and from the ``pr_data.json`` shapes,
+and records answer ``record["field"]`` and ``record.get("field")`` like those
+dicts, so fetching, merging, metrics, patterns and the store take either.
+"""
+
+import sys
+from dataclasses import dataclass
+from enum import Enum
+
+
+class PRState(str, Enum):
+    OPEN = "OPEN"
+    CLOSED = "CLOSED"
+    MERGED = "MERGED"
+
+
+class ReviewState(str, Enum):
+    APPROVED = "APPROVED"
+    CHANGES_REQUESTED = "CHANGES_REQUESTED"
+    COMMENTED = "COMMENTED"
+
+
+_intern = sys.intern
+
+
+class _Record:
+    """Dict-style read access to a record's fields."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+
+@dataclass
+class Reviewer(_Record):
+    __slots__ = ("login", "state")
+    login: str
+    state: ReviewState
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Reviewer":
+        return cls(_intern(data["login"]), ReviewState(data["state"]))
+
+    def to_json(self) -> dict:
+        return {"login": self.login, "state": self.state.value}
+
+
+@dataclass
+class PullRequest(_Record):
+    __slots__ = ("number", "title", "state", "author", "created_at", "merged_at",
+                 "reviewers", "changed_files", "additions", "deletions")
+    number: int
+    title: str
+    state: PRState
+    author: str
+    created_at: str
+    merged_at: str
+    reviewers: tuple
+    changed_files: int
+    additions: int
+    deletions: int
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PullRequest":
+        return cls(
+            data["number"],
+            data["title"],
+            PRState(data["state"]),
+            _intern(data["author"]),
+            data["created_at"],
+            data.get("merged_at"),
+            tuple(Reviewer.from_json(r) for r in data.get("reviewers", ())),
+            data.get("changed_files", 0),
+            data.get("additions", 0),
+            data.get("deletions", 0),
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "number": self.number,
+            "title": self.title,
+            "state": self.state.value,
+            "author": self.author,
+            "created_at": self.created_at,
+            "merged_at": self.merged_at,
+            "reviewers": [r.to_json() for r in self.reviewers],
+            "changed_files": self.changed_files,
+            "additions": self.additions,
+            "deletions": self.deletions,
+        }
+
+
+@dataclass
+class Comment(_Record):
+    __slots__ = ("pr_number", "user", "body", "file", "line")
+    pr_number: int
+    user: str
+    body: str
+    file: str
+    line: int
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Comment":
+        return cls(data["pr_number"], _intern(data["user"]), data["body"], _intern(data["file"]), data["line"])
+
+    def to_json(self) -> dict:
+        return {"pr_number": self.pr_number, "user": self.user, "body": self.body,
+                "file": self.file, "line": self.line}
+
+
+@dataclass
+class Review(_Record):
+    __slots__ = ("pr_number", "user", "state", "body")
+    pr_number: int
+    user: str
+    state: ReviewState
+    body: str
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Review":
+        return cls(data["pr_number"], _intern(data["user"]), ReviewState(data["state"]), data["body"])
+
+    def to_json(self) -> dict:
+        return {"pr_number": self.pr_number, "user": self.user, "state": self.state.value, "body": self.body}
+
+
+RECORD_TYPES = {"pr_list": PullRequest, "comments": Comment, "reviews": Review}
+
+
+def typed_records(records):
+    """Convert a stream of ``(section, dict)`` pairs into record objects."""
+    for section, record in records:
+        yield section, RECORD_TYPES[section].from_json(record)
+
+
+def record_json(record):
+    """``json.dump`` ``default`` hook writing records in their ``pr_data.json`` shape."""
+    if isinstance(record, _Record):
+        return record.to_json()
+    raise TypeError(f"{type(record).__name__} is not JSON serializable")
+
+
+def from_pr_data(data: dict) -> dict:
+    """Convert ``pr_data.json``-shaped data into lists of record objects."""
+    return {section: [cls.from_json(r) for r in data.get(section, ())] for section, cls in RECORD_TYPES.items()}
+
+
+def to_pr_data(records: dict) -> dict:
+    """Convert record objects back into ``pr_data.json``-shaped dicts."""
+    return {section: [r.to_json() for r in records.get(section, ())] for section in RECORD_TYPES}
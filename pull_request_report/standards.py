@@ -0,0 +1,241 @@
+"""
+Engineering standards rules and a compiled index for tagging review comments
+
+The standards document that ``config.json`` ``engineering_docs`` points to is
+parsed once into rules, one per ``###`` heading: the heading, its bold bullet
+labels (minus qualifiers such as "ZERO" or "Prefer") and its code spans become
+the rule's keywords, and a ``- **Keywords**: a, b, c`` bullet adds more.
+
+All keywords of all rules are compiled into one regular expression shaped as
+a character trie, so tagging a comment is a single scan of its body whose
+cost barely grows with the number of rules.  Keywords that appear inside a longer keyword inherit that
+keyword's rules as well, which makes the leftmost-longest matches of the
+combined pattern report every rule a comment touches.
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+
+HEADING = re.compile(r"^(#{2,3})\s+(.+?)\s*$")
+BOLD_LABEL = re.compile(r"^\s*-\s+\*\*(.+?)\*\*:?\s*(.*)$")
+# Identifier-like code spans only; paths and snippets make poor keywords
+CODE_SPAN = re.compile(r"`([A-Za-z_][\w.]*)`")
+FENCE = re.compile(r"^\s*```")
+CRITICAL = re.compile(r"^CRITICAL:\s*", re.IGNORECASE)
+
+# Bullet labels that describe the bullet rather than the standard, and words
+# too common in review comments to indicate any one standard
+GENERIC_LABELS = frozenset({
+    "mandatory", "structure", "rationale", "example", "violation", "consistency",
+    "mandatory fields", "direct usage", "patterns", "responses",
+})
+# Leading words that qualify a keyword instead of naming the subject
+QUALIFIERS = frozenset({
+    "zero", "pure", "prefer", "avoid", "extract", "use", "consistent", "proper", "comprehensive",
+    "explicitly", "shared", "minimize", "no", "all",
+})
+MIN_KEYWORD_CHARS = 4
+# Each standard lists at most this many of its most commented files
+EXAMPLE_FILES = 3
+
+
+class Rule:
+    """One engineering standard and the keywords that indicate it."""
+
+    __slots__ = ("name", "section", "critical", "keywords")
+
+    def __init__(self, name: str, section: str = "", critical: bool = False, keywords=()):
+        self.name = name
+        self.section = section
+        self.critical = critical
+        self.keywords = list(keywords)
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, keywords={self.keywords!r})"
+
+
+def normalize_keyword(text: str) -> str:
+    """Lowercase ``text`` and drop punctuation, parentheticals and leading qualifiers."""
+    text = re.sub(r"\(.*?\)", " ", text.lower())
+    words = re.findall(r"[a-z0-9]+", text)
+    while words and words[0] in QUALIFIERS:
+        words.pop(0)
+    return " ".join(words)
+
+
+def _add_keyword(rule: Rule, text: str, explicit: bool = False):
+    keyword = normalize_keyword(text)
+    if not explicit and (len(keyword) < MIN_KEYWORD_CHARS or keyword in GENERIC_LABELS):
+        return
+    if keyword and keyword not in rule.keywords:
+        rule.keywords.append(keyword)
+
+
+def parse_standards(source) -> list:
+    """Parse a standards markdown document into a list of ``Rule``.
+
+    ``source`` is the markdown text or an open text file.  ``##`` headings
+    name the section, and every ``###`` heading below them starts a rule;
+    headings prefixed with ``CRITICAL:`` mark critical rules.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    rules, section, rule, in_fence = [], "", None, False
+    for line in lines:
+        if FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        heading = HEADING.match(line)
+        if heading:
+            title = heading.group(2)
+            if heading.group(1) == "##":
+                section, rule = title, None
+            else:
+                name = CRITICAL.sub("", title)
+                rule = Rule(name, section, critical=name != title)
+                _add_keyword(rule, name)
+                rules.append(rule)
+            continue
+        if rule is None:
+            continue
+        bullet = BOLD_LABEL.match(line)
+        if bullet:
+            label, rest = bullet.groups()
+            if label.lower() == "keywords":
+                for keyword in rest.split(","):
+                    _add_keyword(rule, keyword, explicit=True)
+                continue
+            _add_keyword(rule, label)
+        for span in CODE_SPAN.findall(line):
+            _add_keyword(rule, span)
+    return rules
+
+
+def load_rules(path) -> list:
+    """Load rules from ``path``: a markdown file, a directory of them, or a
+    ``rules.json`` index written by ``pr-report sync-docs``."""
+    path = Path(path)
+    if path.suffix == ".json":
+        from .docs_sync import index_rules, read_rule_index
+
+        return index_rules(read_rule_index(path))
+    files = sorted(path.rglob("*.md")) if path.is_dir() else [path]
+    rules = []
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            rules.extend(parse_standards(f))
+    return rules
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a character trie of keywords: shared prefixes are matched once.
+
+    A plain alternation tries every keyword at every position of the text;
+    the trie form branches only where keywords differ, so scanning costs
+    about the same for ten rules or a thousand.
+    """
+    branches = [
+        (r"[\s_-]+" if char == " " else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # A keyword ending here: the longer continuation is tried first
+    return f"(?:{pattern})?" if "" in node else pattern
+
+
+def compile_keywords(keywords) -> re.Pattern:
+    """One case-insensitive whole-word pattern matching any of ``keywords``.
+
+    Words may be joined by spaces, hyphens or underscores, and a trailing
+    plural "s" is allowed.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return re.compile(r"(?<![a-z0-9])" + _trie_pattern(trie) + r"s?(?![a-z0-9])", re.IGNORECASE)
+
+
+class StandardsIndex:
+    """Every rule keyword compiled into a single pattern, built once per document."""
+
+    def __init__(self, rules: list):
+        self.rules = list(rules)
+        owners = {}
+        for number, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                owners.setdefault(keyword, set()).add(number)
+
+        # A keyword found inside a longer one is also reported by the longer match
+        padded = {keyword: f" {keyword} " for keyword in owners}
+        self._rules_for = {}
+        for keyword, rule_numbers in owners.items():
+            numbers = set(rule_numbers)
+            for other, other_numbers in owners.items():
+                if other != keyword and padded[other] in padded[keyword]:
+                    numbers |= other_numbers
+            self._rules_for[keyword] = tuple(sorted(numbers))
+
+        self.pattern = compile_keywords(owners) if owners else None
+
+    @classmethod
+    def from_file(cls, path) -> "StandardsIndex":
+        return cls(load_rules(path))
+
+    def _rules_of_match(self, text: str) -> tuple:
+        keyword = " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+        numbers = self._rules_for.get(keyword)
+        if numbers is None and keyword.endswith("s"):
+            numbers = self._rules_for.get(keyword[:-1])
+        return numbers or ()
+
+    def match(self, text: str) -> list:
+        """Return the rules ``text`` touches, in document order."""
+        if self.pattern is None or not text:
+            return []
+        numbers = set()
+        for found in self.pattern.finditer(text):
+            numbers.update(self._rules_of_match(found.group()))
+        return [self.rules[number] for number in sorted(numbers)]
+
+    def tag_comments(self, comments):
+        """Yield ``(comment, rules)`` for every comment, streaming."""
+        for comment in comments:
+            yield comment, self.match(comment.get("body") or "")
+
+
+def compliance_summary(index: StandardsIndex, comments) -> str:
+    """Render the Standards Compliance section from the comments each rule tags.
+
+    One line per standard that review comments touched, most comments first,
+    in the ``**Standard**: N comments`` form the report already renders.
+    """
+    counts = Counter()
+    files = {}
+    for comment, rules in index.tag_comments(comments):
+        for rule in rules:
+            counts[rule.name] += 1
+            if comment.get("file"):
+                files.setdefault(rule.name, Counter())[comment["file"]] += 1
+
+    critical = {rule.name for rule in index.rules if rule.critical}
+    lines = []
+    for name, count in counts.most_common():
+        where = ", ".join(file for file, _ in files.get(name, Counter()).most_common(EXAMPLE_FILES))
+        flag = " (critical)" if name in critical else ""
+        comments_text = f"{count} comment" + ("s" if count != 1 else "")
+        lines.append(f"**{name}**{flag}: {comments_text}" + (f" ({where})" if where else ""))
+    return "".join(line + "\n" for line in lines)
+
+
+def standards_from_file(index: StandardsIndex, pr_data_path) -> str:
+    """Standards Compliance text for the comments in a ``pr_data.json`` file."""
+    from .ingest import iter_records
+
+    return compliance_summary(index, (record for section, record in iter_records(pr_data_path) if section == "comments"))
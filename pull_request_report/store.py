@@ -0,0 +1,265 @@
+"""
+Indexed local store for PR history
+
+``pr_data.json`` keeps ``pr_list``, ``comments`` and ``reviews`` as separate
+arrays joined on ``pr_number``, which means every report scans everything.
+This module loads the same records into SQLite, indexed by repository, author,
+reviewer, file path, state and date, so queries such as "CHANGES_REQUESTED
+reviews by senior-dev on database/ files in Q2" touch only matching rows and
+stream them back from a cursor.
+
+Reviews and comments carry no timestamp of their own, so date ranges apply to
+the PR's ``created_at``.  A review matches a path prefix when its PR has a
+review comment on a file under that prefix.
+"""
+
+import sqlite3
+from pathlib import Path
+
+DEFAULT_STORE = Path("reports") / "pr_history.sqlite"
+BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prs (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT,
+    state TEXT,
+    author TEXT,
+    created_at TEXT,
+    merged_at TEXT,
+    changed_files INTEGER,
+    additions INTEGER,
+    deletions INTEGER,
+    PRIMARY KEY (repo, number)
+);
+CREATE TABLE IF NOT EXISTS pr_reviewers (
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    login TEXT,
+    state TEXT
+);
+CREATE TABLE IF NOT EXISTS comments (
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    user TEXT,
+    body TEXT,
+    file TEXT,
+    line INTEGER
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    user TEXT,
+    state TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS prs_author ON prs (author, created_at);
+CREATE INDEX IF NOT EXISTS prs_state ON prs (state, created_at);
+CREATE INDEX IF NOT EXISTS prs_created ON prs (created_at);
+CREATE INDEX IF NOT EXISTS pr_reviewers_pr ON pr_reviewers (repo, pr_number);
+CREATE INDEX IF NOT EXISTS pr_reviewers_login ON pr_reviewers (login, state);
+CREATE INDEX IF NOT EXISTS comments_pr ON comments (repo, pr_number);
+CREATE INDEX IF NOT EXISTS comments_user ON comments (user);
+CREATE INDEX IF NOT EXISTS comments_file ON comments (file, repo, pr_number);
+CREATE INDEX IF NOT EXISTS reviews_pr ON reviews (repo, pr_number);
+CREATE INDEX IF NOT EXISTS reviews_user ON reviews (user, state);
+"""
+
+PR_COLUMNS = ("number", "title", "state", "author", "created_at", "merged_at",
+              "changed_files", "additions", "deletions")
+CHILD_TABLES = ("pr_reviewers", "comments", "reviews")
+CHILD_COLUMNS = {
+    "comments": ("pr_number", "user", "body", "file", "line"),
+    "reviews": ("pr_number", "user", "state", "body"),
+}
+PR_SQL = (f"INSERT OR REPLACE INTO prs (repo, {', '.join(PR_COLUMNS)}) "
+          f"VALUES ({', '.join('?' * (len(PR_COLUMNS) + 1))})")
+REVIEWER_SQL = "INSERT INTO pr_reviewers (repo, pr_number, login, state) VALUES (?, ?, ?, ?)"
+
+
+def prefix_bounds(prefix: str):
+    """Return ``(low, high)`` so ``low <= value < high`` matches ``prefix*``.
+
+    Unlike ``LIKE``, a range comparison can use the column's index.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PRStore:
+    """SQLite-backed store of PRs, reviewers, comments and reviews."""
+
+    def __init__(self, path: Path = DEFAULT_STORE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _clear(self, table: str, repo: str, numbers) -> None:
+        self.conn.executemany(
+            f"DELETE FROM {table} WHERE repo = ? AND pr_number = ?",
+            ((repo, n) for n in numbers),
+        )
+
+    def _flush(self, repo: str, section: str, batch: list, cleared: dict) -> None:
+        """Write one batch, first dropping stored rows of PRs seen for the first time."""
+        if section == "pr_list":
+            numbers = {pr["number"] for pr in batch}
+            # Stale reviewer lists, comments and reviews go with their PR
+            for table in CHILD_TABLES:
+                self._clear(table, repo, numbers - cleared[table])
+                cleared[table] |= numbers
+            self.conn.executemany(PR_SQL, ((repo, *(pr.get(c) for c in PR_COLUMNS)) for pr in batch))
+            self.conn.executemany(REVIEWER_SQL, (
+                (repo, pr["number"], reviewer.get("login"), reviewer.get("state"))
+                for pr in batch for reviewer in pr.get("reviewers", ())
+            ))
+            return
+        numbers = {row["pr_number"] for row in batch} - cleared[section]
+        self._clear(section, repo, numbers)
+        cleared[section] |= numbers
+        columns = CHILD_COLUMNS[section]
+        self.conn.executemany(
+            f"INSERT INTO {section} (repo, {', '.join(columns)}) VALUES ({', '.join('?' * (len(columns) + 1))})",
+            ((repo, *(row.get(c) for c in columns)) for row in batch),
+        )
+
+    def ingest_records(self, repo: str, records) -> dict:
+        """Load ``(section, record)`` pairs, e.g. from ``ingest.iter_records``.
+
+        Records are written in batches as they arrive, in any order, inside
+        one transaction; every PR seen replaces whatever was stored for it.
+        Returns the number of records written per section.
+        """
+        batches = {"pr_list": [], "comments": [], "reviews": []}
+        counts = dict.fromkeys(batches, 0)
+        cleared = {table: set() for table in CHILD_TABLES}
+        with self.conn:
+            for section, record in records:
+                batch = batches[section]
+                batch.append(record)
+                counts[section] += 1
+                if len(batch) >= BATCH_SIZE:
+                    self._flush(repo, section, batch, cleared)
+                    batch.clear()
+            for section, batch in batches.items():
+                if batch:
+                    self._flush(repo, section, batch, cleared)
+        return counts
+
+    def ingest(self, repo: str, data: dict) -> dict:
+        """Load one repository's ``pr_data.json``-shaped data."""
+        return self.ingest_records(
+            repo, ((section, record) for section in ("pr_list", "comments", "reviews")
+                   for record in data.get(section, ()))
+        )
+
+    @staticmethod
+    def _filters(table, repo=None, author=None, since=None, until=None, path_prefix=None):
+        """WHERE clauses shared by every query.
+
+        ``table`` is the alias of the queried table; ``p`` is always prs.
+        """
+        clauses, params = [], []
+        if repo:
+            clauses.append("p.repo = ?")
+            params.append(repo)
+        if author:
+            clauses.append("p.author = ?")
+            params.append(author)
+        if since:
+            clauses.append("p.created_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("p.created_at < ?")
+            params.append(until)
+        if path_prefix:
+            if table == "c":
+                clauses.append("c.file >= ? AND c.file < ?")
+            else:
+                clauses.append(
+                    "EXISTS (SELECT 1 FROM comments c WHERE c.file >= ? AND c.file < ? "
+                    "AND c.repo = p.repo AND c.pr_number = p.number)"
+                )
+            params += prefix_bounds(path_prefix)
+        return clauses, params
+
+    @staticmethod
+    def _sql(select: str, clauses: list, params: list):
+        if clauses:
+            select += " WHERE " + " AND ".join(clauses)
+        return select + " ORDER BY p.created_at DESC", params
+
+    def _reviews_sql(self, reviewer=None, state=None, **filters):
+        clauses, params = self._filters("r", **filters)
+        if reviewer:
+            clauses.append("r.user = ?")
+            params.append(reviewer)
+        if state:
+            clauses.append("r.state = ?")
+            params.append(state)
+        return self._sql(
+            "SELECT r.repo, r.pr_number, r.user, r.state, r.body, p.author, p.title, p.created_at "
+            "FROM reviews r JOIN prs p ON p.repo = r.repo AND p.number = r.pr_number",
+            clauses, params,
+        )
+
+    def _comments_sql(self, user=None, **filters):
+        clauses, params = self._filters("c", **filters)
+        if user:
+            clauses.append("c.user = ?")
+            params.append(user)
+        return self._sql(
+            "SELECT c.repo, c.pr_number, c.user, c.body, c.file, c.line, p.author, p.title, p.created_at "
+            "FROM comments c JOIN prs p ON p.repo = c.repo AND p.number = c.pr_number",
+            clauses, params,
+        )
+
+    def _prs_sql(self, state=None, reviewer=None, **filters):
+        clauses, params = self._filters("p", **filters)
+        if state:
+            clauses.append("p.state = ?")
+            params.append(state)
+        if reviewer:
+            clauses.append("EXISTS (SELECT 1 FROM pr_reviewers v WHERE v.login = ? "
+                           "AND v.repo = p.repo AND v.pr_number = p.number)")
+            params.append(reviewer)
+        return self._sql("SELECT p.* FROM prs p", clauses, params)
+
+    def _rows(self, sql: str, params: list):
+        for row in self.conn.execute(sql, params):
+            yield dict(row)
+
+    def query_reviews(self, reviewer: str = None, state: str = None, **filters):
+        """Yield reviews joined with their PR's author, title and date.
+
+        Every query accepts the keyword filters ``repo``, ``author``, ``since``
+        (inclusive) and ``until`` (exclusive) ISO timestamps, and
+        ``path_prefix``.  Rows come newest PR first, straight off the cursor.
+        """
+        return self._rows(*self._reviews_sql(reviewer, state, **filters))
+
+    def query_comments(self, user: str = None, **filters):
+        """Yield review comments joined with their PR's author, title and date."""
+        return self._rows(*self._comments_sql(user, **filters))
+
+    def query_prs(self, state: str = None, reviewer: str = None, **filters):
+        """Yield PRs, optionally only those ``reviewer`` is listed on."""
+        return self._rows(*self._prs_sql(state, reviewer, **filters))
+
+    def explain(self, kind: str, **query) -> list:
+        """Return SQLite's query plan for ``query_<kind>(**query)``."""
+        sql, params = getattr(self, f"_{kind}_sql")(**query)
+        return [row["detail"] for row in self.conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
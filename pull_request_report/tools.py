@@ -0,0 +1,111 @@
+"""
+Cached discovery of external tools
+
+``pr-report`` is run from shell loops and pre-commit hooks, so forking
+``gh --version`` on every invocation is noticeable.  Discovered tools are
+remembered in a small JSON file keyed by ``PATH``; an entry is reused for as
+long as ``PATH`` is unchanged and the executable's mtime still matches, which
+costs one ``stat`` instead of a process.  Missing tools are never cached, so
+installing one takes effect on the next run.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+
+def default_cache_path() -> Path:
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "pull-request-report" / "tools.json"
+
+
+class ToolInfo:
+    """Location and ``--version`` output of one executable"""
+
+    def __init__(self, name: str, path: str, version: str):
+        self.name = name
+        self.path = path
+        self.version = version
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _probe_version(path: str):
+    """Run ``<tool> --version``; None if it does not run cleanly."""
+    import subprocess
+
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    return lines[0] if lines else ""
+
+
+class ToolCache:
+    """Discover executables on ``PATH``, remembering them between runs."""
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else default_cache_path()
+        self._data = None
+        self._dirty = False
+
+    def _entries(self) -> dict:
+        if self._data is None:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") != CACHE_VERSION:
+                data = {"version": CACHE_VERSION, "paths": {}}
+            self._data = data
+        return self._data["paths"].setdefault(os.environ.get("PATH", ""), {})
+
+    def find(self, name: str):
+        """Return a ToolInfo for ``name``, or None if it is missing or broken."""
+        entries = self._entries()
+        entry = entries.get(name)
+        if entry and _mtime(entry["path"]) == entry["mtime"]:
+            return ToolInfo(name, entry["path"], entry["version"])
+
+        path = shutil.which(name)
+        version = _probe_version(path) if path else None
+        if version is None:
+            if entries.pop(name, None):
+                self._dirty = True
+            return None
+        entries[name] = {"path": path, "mtime": _mtime(path), "version": version}
+        self._dirty = True
+        return ToolInfo(name, path, version)
+
+    def save(self) -> None:
+        """Write the cache back if anything changed; failures are ignored."""
+        if not self._dirty:
+            return
+        from .cache import atomic_write_json
+
+        try:
+            atomic_write_json(self.path, self._data)
+        except OSError:
+            # A read-only home directory only costs the cache
+            return
+        self._dirty = False
+
+
+def find_tools(names, cache_path: Path = None) -> dict:
+    """Return ``{name: ToolInfo or None}`` and persist what was discovered."""
+    cache = ToolCache(cache_path)
+    found = {name: cache.find(name) for name in names}
+    cache.save()
+    return found
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the GitHub CLI
+
+Tests install this script on PATH as ``gh``.  ``gh api <path>`` is answered from
+the JSON routes file named by FAKE_GH_ROUTES (keyed by path without the query
+string).  ``-i`` prints an HTTP status line and headers, including an ETag that
+``-H "If-None-Match: ..."`` is checked against to answer 304.  Every call is appended to FAKE_GH_LOG as ``start end argv`` so tests
+can count calls and check how many ran at once.
+
+``gh api graphql`` answers the queries GraphQLFetcher sends (by operation
+name, with offset cursors) from the same REST routes, grouping each PR's
+comments into one review thread per file and line.
+
+With FAKE_GH_SERVER set, calls are instead forwarded over HTTP to that base
+URL (see mock_github.py) and its status, headers and body are printed the way
+gh prints them.
+"""
+
+import hashlib
+import json
+import os
+import re
+import stat
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+
+def rest_routes(pr_data: dict, repo: str) -> dict:
+    """Build REST-shaped responses for ``repo`` from sample_pr_data.json"""
+    routes = {}
+    pulls = []
+    for pr in pr_data["pr_list"]:
+        rest = {
+            "number": pr["number"],
+            "title": pr["title"],
+            "state": "open" if pr["state"] == "OPEN" else "closed",
+            "draft": False,
+            "user": {"login": pr["author"]},
+            "created_at": pr["created_at"],
+            "merged_at": pr.get("merged_at"),
+            "updated_at": pr.get("merged_at") or pr["created_at"],
+        }
+        pulls.append(rest)
+        routes[f"repos/{repo}/pulls/{pr['number']}"] = {
+            **rest,
+            "changed_files": pr["changed_files"],
+            "additions": pr["additions"],
+            "deletions": pr["deletions"],
+        }
+        routes[f"repos/{repo}/pulls/{pr['number']}/comments"] = [
+            {"user": {"login": c["user"]}, "body": c["body"], "path": c["file"], "line": c["line"]}
+            for c in pr_data["comments"]
+            if c["pr_number"] == pr["number"]
+        ]
+        routes[f"repos/{repo}/pulls/{pr['number']}/reviews"] = [
+            {"user": {"login": r["user"]}, "state": r["state"], "body": r["body"]}
+            for r in pr_data["reviews"]
+            if r["pr_number"] == pr["number"]
+        ]
+    routes[f"repos/{repo}/pulls"] = sorted(pulls, key=lambda p: p["created_at"], reverse=True)
+    return routes
+
+
+def install(bin_dir: Path, routes: dict, delay: float = 0.0, server: str = None) -> dict:
+    """Write a ``gh`` executable into bin_dir and return the env it needs"""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    routes_file = bin_dir / "routes.json"
+    routes_file.write_text(json.dumps(routes))
+    gh = bin_dir / "gh"
+    gh.write_text(f"#!/bin/sh\nexec '{sys.executable}' '{Path(__file__).resolve()}' \"$@\"\n")
+    gh.chmod(gh.stat().st_mode | stat.S_IEXEC)
+    env = {
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        "FAKE_GH_ROUTES": str(routes_file),
+        "FAKE_GH_LOG": str(bin_dir / "calls.log"),
+        "FAKE_GH_DELAY": str(delay),
+    }
+    if server:
+        env["FAKE_GH_SERVER"] = server
+    return env
+
+
+@contextmanager
+def patched_env(env: dict):
+    """Set ``env`` in os.environ for the duration of the block, then restore it"""
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield env
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def load_sample() -> dict:
+    """The PR data in sample_pr_data.json, freshly decoded"""
+    with open(Path(__file__).parent / "sample_pr_data.json") as f:
+        return json.load(f)
+
+
+def read_log(env: dict) -> list:
+    """Return logged calls as ``(start, end, argv)`` tuples"""
+    log = Path(env["FAKE_GH_LOG"])
+    if not log.exists():
+        return []
+    calls = []
+    for line in log.read_text().splitlines():
+        start, end, argv = line.split(" ", 2)
+        calls.append((float(start), float(end), json.loads(argv)))
+    return calls
+
+
+def forward(server: str, path: str, request_headers: dict, include: bool) -> int:
+    """Answer from the mock HTTP server, printing what gh would print"""
+    # Imported here: urllib.request alone doubles the start-up time of every fake call
+    from urllib.error import HTTPError
+    from urllib.request import Request, urlopen
+
+    try:
+        with urlopen(Request(f"{server}/{path}", headers=request_headers)) as response:
+            status, headers, text = response.status, response.headers, response.read().decode()
+    except HTTPError as e:
+        status, headers, text = e.code, e.headers, e.read().decode()
+    if include:
+        print(f"HTTP/1.1 {status}")
+        for name, value in headers.items():
+            print(f"{name}: {value}")
+        print()
+    print(text)
+    if status >= 300:
+        print(f"gh: {json.loads(text or '{}').get('message', '')} (HTTP {status})", file=sys.stderr)
+        return 1
+    return 0
+
+
+def connection(items: list, first, after) -> dict:
+    """A GraphQL connection page with offsets as cursors"""
+    start = int(after or 0)
+    nodes = items[start : start + int(first)]
+    end = start + len(nodes)
+    return {"pageInfo": {"hasNextPage": end < len(items), "endCursor": str(end)}, "nodes": nodes}
+
+
+def graphql_threads(routes: dict, repo: str, number: int) -> list:
+    threads = {}
+    for comment in routes.get(f"repos/{repo}/pulls/{number}/comments", []):
+        node = {
+            "author": comment["user"], "body": comment["body"], "path": comment["path"],
+            "line": comment["line"], "originalLine": comment["line"],
+        }
+        key = (comment["path"], comment["line"])
+        threads.setdefault(key, {"id": f"{repo}#{number}/{len(threads)}", "comments": []})["comments"].append(node)
+    return list(threads.values())
+
+
+def graphql_feedback(routes: dict, repo: str, number: int, fields: dict) -> dict:
+    reviews = [
+        {"author": review["user"], "state": review["state"], "body": review["body"]}
+        for review in routes.get(f"repos/{repo}/pulls/{number}/reviews", [])
+    ]
+    threads = [
+        {"id": thread["id"], "comments": connection(thread["comments"], fields["comments"], None)}
+        for thread in graphql_threads(routes, repo, number)
+    ]
+    return {
+        "number": number,
+        "reviews": connection(reviews, fields["reviews"], None),
+        "reviewThreads": connection(threads, fields["threads"], None),
+    }
+
+
+def graphql(fields: dict, routes: dict) -> dict:
+    """Answer one GraphQLFetcher query from the REST routes"""
+    operation = re.search(r"query (\w+)", fields["query"]).group(1)
+    if operation == "MoreThreadComments":
+        repo, _, rest = fields["id"].partition("#")
+        number, index = map(int, rest.split("/"))
+        thread = graphql_threads(routes, repo, number)[index]
+        return {"data": {"node": {"comments": connection(thread["comments"], fields["first"], fields["after"])}}}
+
+    repo = f"{fields['owner']}/{fields['name']}"
+    if f"repos/{repo}/pulls" not in routes:
+        message = f"Could not resolve to a Repository with the name '{repo}'."
+        return {"data": {"repository": None}, "errors": [{"type": "NOT_FOUND", "message": message}]}
+
+    if operation == "PullRequests":
+        pulls = routes[f"repos/{repo}/pulls"]
+        if fields["order"] == "UPDATED_AT":
+            pulls = sorted(pulls, key=lambda pr: pr["updated_at"], reverse=True)
+        nodes = []
+        for pr in pulls:
+            detail = routes.get(f"repos/{repo}/pulls/{pr['number']}", pr)
+            nodes.append({
+                "number": pr["number"], "title": pr["title"], "author": pr["user"], "isDraft": pr["draft"],
+                "state": "MERGED" if pr.get("merged_at") else pr["state"].upper(),
+                "createdAt": pr["created_at"], "mergedAt": pr.get("merged_at"), "updatedAt": pr["updated_at"],
+                "changedFiles": detail.get("changed_files", 0), "additions": detail.get("additions", 0),
+                "deletions": detail.get("deletions", 0),
+            })
+        pull_requests = connection(nodes, fields["first"], fields.get("after"))
+        return {"data": {"repository": {"pullRequests": pull_requests}}}
+
+    if operation == "PullRequestFeedback":
+        aliases = re.findall(r"(\w+): pullRequest\(number: \$(\w+)\)", fields["query"])
+        return {"data": {"repository": {
+            alias: graphql_feedback(routes, repo, fields[variable], fields) for alias, variable in aliases
+        }}}
+
+    number = fields["number"]
+    if operation == "MoreReviews":
+        sizes = {"reviews": 10**6, "threads": 0, "comments": 0}
+        reviews = graphql_feedback(routes, repo, number, sizes)["reviews"]
+        page = connection(reviews["nodes"], fields["first"], fields["after"])
+        return {"data": {"repository": {"pullRequest": {"reviews": page}}}}
+    sizes = {"reviews": 0, "threads": 10**6, "comments": fields["comments"]}
+    threads = graphql_feedback(routes, repo, number, sizes)["reviewThreads"]
+    page = connection(threads["nodes"], fields["first"], fields["after"])
+    return {"data": {"repository": {"pullRequest": {"reviewThreads": page}}}}
+
+
+def main(argv: list) -> int:
+    start = time.time()
+    if argv[:1] == ["--version"]:
+        print("gh version 2.0.0 (fake)")
+        return 0
+    if argv[:1] != ["api"]:
+        print(f"fake gh: unsupported command {argv}", file=sys.stderr)
+        return 1
+
+    path = argv[-1]
+    include = "-i" in argv
+    request_headers = {}
+    for flag, value in zip(argv, argv[1:]):
+        if flag == "-H":
+            name, _, header_value = value.partition(":")
+            request_headers[name.strip().lower()] = header_value.strip()
+    fields = {}
+    for flag, value in zip(argv, argv[1:]):
+        if flag in ("-f", "-F"):
+            name, _, field_value = value.partition("=")
+            fields[name] = int(field_value) if flag == "-F" and field_value.lstrip("-").isdigit() else field_value
+
+    if os.environ.get("FAKE_GH_SERVER"):
+        status = forward(os.environ["FAKE_GH_SERVER"], path, request_headers, include)
+        with open(os.environ["FAKE_GH_LOG"], "a") as f:
+            f.write(f"{start} {time.time()} {json.dumps(argv)}\n")
+        return status
+
+    url = urlsplit(path)
+    routes = json.loads(Path(os.environ["FAKE_GH_ROUTES"]).read_text())
+    time.sleep(float(os.environ.get("FAKE_GH_DELAY", "0")))
+
+    status = 0
+    if path == "graphql":
+        body = graphql(fields, routes)
+        if include:
+            print("HTTP/2.0 200 OK\nContent-Type: application/json\n")
+        print(json.dumps(body))
+        if body.get("errors"):
+            # Real gh exits 1 when the response carries errors
+            print(f"gh: {body['errors'][0]['message']}", file=sys.stderr)
+            status = 1
+    elif url.path not in routes:
+        if include:
+            print("HTTP/2.0 404 Not Found\n")
+        print(f"gh: Not Found (HTTP 404) {url.path}", file=sys.stderr)
+        status = 1
+    else:
+        body = routes[url.path]
+        if isinstance(body, list):
+            query = parse_qs(url.query)
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            body = body[(page - 1) * per_page : page * per_page]
+        text = json.dumps(body)
+        etag = '"' + hashlib.sha1(text.encode()).hexdigest() + '"'
+        if request_headers.get("if-none-match") == etag:
+            # Real gh prints the headers but exits 1 for anything above 299
+            print(f"HTTP/2.0 304 Not Modified\nEtag: {etag}\n")
+            print("gh: HTTP 304", file=sys.stderr)
+            status = 1
+        else:
+            if include:
+                print(f"HTTP/2.0 200 OK\nContent-Type: application/json\nEtag: {etag}\n")
+            print(text)
+
+    with open(os.environ["FAKE_GH_LOG"], "a") as f:
+        f.write(f"{start} {time.time()} {json.dumps(argv)}\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for wkhtmltopdf
+
+Accepts the same command line as the real tool (options, then input and output
+paths) and writes a tiny PDF with one page per PAGE_CHARS of HTML.  Like
+0.12.6, a linked stylesheet outside the directories given with ``--allow``
+is blocked: the PDF is still written, with a warning and exit status 1.
+Each conversion starts its stderr with ``Loading pages``, as the real
+progress output does.  With ``--read-args-from-stdin`` every stdin line
+is appended to the command line and converted in turn, all in one process.  Inputs whose text contains FAIL_RENDER fail the
+way wkhtmltopdf does: a message on stderr and a non-zero exit.  Every
+conversion is appended to FAKE_WKHTMLTOPDF_LOG as ``pid ppid input``.
+"""
+
+import os
+import re
+import shlex
+import stat
+import sys
+from pathlib import Path
+
+# Options that take a value, as used by convert_to_pdf
+# Characters of HTML per page of the fake output
+PAGE_CHARS = 4000
+VALUE_OPTIONS = {"--page-size", "--margin-top", "--margin-bottom", "--margin-left", "--margin-right", "--allow"}
+STYLESHEET_LINK = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+
+
+def install(bin_dir: Path) -> dict:
+    """Write a ``wkhtmltopdf`` executable into bin_dir and return the env it needs"""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    exe = bin_dir / "wkhtmltopdf"
+    exe.write_text(f"#!/bin/sh\nexec '{sys.executable}' '{Path(__file__).resolve()}' \"$@\"\n")
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return {
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        "FAKE_WKHTMLTOPDF_LOG": str(bin_dir / "wkhtmltopdf.log"),
+    }
+
+
+def read_log(env: dict) -> list:
+    """Return logged conversions as ``(pid, ppid, input)`` tuples"""
+    log = Path(env["FAKE_WKHTMLTOPDF_LOG"])
+    if not log.exists():
+        return []
+    return [tuple(line.split(" ", 2)) for line in log.read_text().splitlines()]
+
+
+def fake_pdf(pages: int) -> bytes:
+    """A PDF skeleton with an uncompressed page tree of ``pages`` pages"""
+    kids = " ".join(f"{n + 2} 0 R" for n in range(pages))
+    objects = [f"1 0 obj << /Type /Pages /Kids [{kids}] /Count {pages} >> endobj"]
+    objects += [f"{n + 2} 0 obj << /Type /Page /Parent 1 0 R >> endobj" for n in range(pages)]
+    return ("%PDF-1.4\n% fake wkhtmltopdf output\n" + "\n".join(objects) + "\n%%EOF\n").encode()
+
+
+def split_args(argv: list):
+    """Return the positional (input, output) paths from a wkhtmltopdf command line"""
+    positional = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("--"):
+            positional.append(arg)
+    return positional
+
+
+def convert(argv: list) -> int:
+    positional = split_args(argv)
+    if len(positional) != 2:
+        print("Error: expected an input and an output", file=sys.stderr)
+        return 1
+    source, target = positional
+    print("Loading pages (1/6)", file=sys.stderr)
+    with open(os.environ["FAKE_WKHTMLTOPDF_LOG"], "a") as f:
+        f.write(f"{os.getpid()} {os.getppid()} {source}\n")
+    html = Path(source).read_text()
+    if "FAIL_RENDER" in html:
+        print(f"Error: Failed loading page {source}", file=sys.stderr)
+        return 1
+    Path(target).write_bytes(fake_pdf(max(1, len(html) // PAGE_CHARS)))
+    allowed = [Path(value).resolve() for option, value in zip(argv, argv[1:]) if option == "--allow"]
+    status = 0
+    for href in STYLESHEET_LINK.findall(html):
+        css = (Path(source).parent / href).resolve()
+        if not css.exists() or not any(css.is_relative_to(folder) for folder in allowed):
+            print(f"Warning: Blocked access to file {css}", file=sys.stderr)
+            status = 1
+    return status
+
+
+def main(argv: list) -> int:
+    if argv[:1] == ["--version"]:
+        print("wkhtmltopdf 0.12.6 (fake)")
+        return 0
+    if "--read-args-from-stdin" in argv:
+        base = [arg for arg in argv if arg != "--read-args-from-stdin"]
+        failed = 0
+        for line in sys.stdin:
+            if line.strip():
+                failed += convert(base + shlex.split(line)) != 0
+        return 1 if failed else 0
+    return convert(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""
+Local HTTP stand-in for the GitHub REST API that enforces rate limits
+
+Serves the same routes as ``fake_gh.rest_routes`` (with ``per_page``/``page``
+pagination) and sends ``X-RateLimit-*`` headers.  Once ``limit`` calls were
+made in the current window it answers 403 with ``X-RateLimit-Remaining: 0``
+like GitHub's primary limit; more than ``max_concurrent`` calls in flight get
+a 429 with ``Retry-After`` like its secondary limits.  Windows start on whole
+seconds because ``X-RateLimit-Reset`` is an integer epoch timestamp.
+"""
+
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class MockGitHub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, routes: dict, limit: int = 5000, window: float = 3600, max_concurrent: int = None,
+                 delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.routes = routes
+        self.limit = limit
+        self.window = window
+        self.max_concurrent = max_concurrent
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.reset_at = 0
+        self.used = 0
+        self.in_flight = 0
+        # (time, path, status) of every request
+        self.log = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    def admit(self):
+        """Return the status and rate-limit headers for a new request."""
+        with self.lock:
+            now = time.time()
+            if now >= self.reset_at:
+                self.reset_at = math.ceil(now + self.window)
+                self.used = 0
+            if self.max_concurrent is not None and self.in_flight >= self.max_concurrent:
+                return 429, {"Retry-After": "1"}
+            if self.used >= self.limit:
+                return 403, self._headers(0)
+            self.used += 1
+            self.in_flight += 1
+            return 200, self._headers(self.limit - self.used)
+
+    def _headers(self, remaining: int) -> dict:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+        }
+
+    def statuses(self) -> list:
+        return [status for _, _, status in self.log]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        path = url.path.lstrip("/")
+        status, headers = server.admit()
+        admitted = status == 200
+        try:
+            if admitted:
+                time.sleep(server.delay)
+                if path in server.routes:
+                    body = server.routes[path]
+                    if isinstance(body, list):
+                        query = parse_qs(url.query)
+                        per_page = int(query.get("per_page", ["30"])[0])
+                        page = int(query.get("page", ["1"])[0])
+                        body = body[(page - 1) * per_page : page * per_page]
+                else:
+                    status, body = 404, {"message": "Not Found"}
+            elif status == 403:
+                body = {"message": "API rate limit exceeded"}
+            else:
+                body = {"message": "You have exceeded a secondary rate limit"}
+        finally:
+            if admitted:
+                with server.lock:
+                    server.in_flight -= 1
+        with server.lock:
+            server.log.append((time.time(), path, status))
+
+        text = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in {**headers, "Content-Type": "application/json"}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(text)))
+        self.end_headers()
+        self.wfile.write(text)
+
+    def log_message(self, *args):
+        pass
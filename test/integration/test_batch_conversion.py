@@ -0,0 +1,207 @@
+"""
+Integration tests for converting many summaries in one process
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+
+import convert_to_pdf  # noqa: E402
+from convert_to_pdf import convert_summaries, expand_summary_paths  # noqa: E402
+
+
+def make_reports(root: Path, names):
+    for name in names:
+        (root / "reports" / name).mkdir(parents=True)
+        shutil.copy(FIXTURES / "sample_summary.md", root / "reports" / name / "summary.md")
+
+
+def test_glob_expansion():
+    """Test that glob patterns expand and literal paths pass through"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["beta", "alpha"])
+
+        paths = expand_summary_paths([f"{root}/reports/*/summary.md", f"{root}/reports/alpha/summary.md"])
+        assert paths == [root / "reports" / "alpha" / "summary.md", root / "reports" / "beta" / "summary.md"]
+        assert expand_summary_paths([f"{root}/missing.md"]) == [root / "missing.md"]
+        assert expand_summary_paths([f"{root}/reports/*/none.md"]) == []
+
+
+def test_convert_summaries_renders_each_report():
+    """Test that every summary gets its own HTML next to it"""
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["api", "frontend", "worker"])
+        summaries = expand_summary_paths([f"{root}/reports/*/summary.md"])
+
+        results = convert_summaries(summaries, config, pdf=False)
+
+        assert len(results) == 3
+        for result in results:
+            assert result["error"] is None
+            assert result["html"] == result["summary"].parent / "analysis-report.html"
+            assert "Key Patterns Identified" in result["html"].read_text()
+
+
+def test_bad_summary_fails_only_itself():
+    """Test that an undecodable summary or a broken config is a per-file error, not a crash"""
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["api", "latin1", "worker"])
+        (root / "reports" / "latin1" / "summary.md").write_bytes("# Résumé\n".encode("latin-1"))
+        summaries = expand_summary_paths([f"{root}/reports/*/summary.md"])
+
+        results = convert_summaries(summaries, config, pdf=False)
+        manifests = [result["manifest"].exists() for result in results]
+        unnamed = convert_summaries(summaries[:1], {**config, "repositories": [{"github_url": "acme/api"}]},
+                                    pdf=False, force=True)
+
+    assert [result["summary"].parent.name for result in results] == ["api", "latin1", "worker"]
+    assert results[1]["error"].startswith("UnicodeDecodeError") and results[1]["html"] is None
+    assert results[0]["error"] is None and results[2]["error"] is None
+    assert manifests == [True, False, True]
+    assert unnamed[0]["error"] == "KeyError: 'name'"
+
+
+def test_script_accepts_glob():
+    """Test that convert_to_pdf.py converts a whole glob in one invocation"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["api", "frontend"])
+
+        result = subprocess.run(
+            [sys.executable, str(REPO_ROOT / "convert_to_pdf.py"),
+             "--summary", "reports/*/summary.md", "--html-only"],
+            capture_output=True, text=True, cwd=root,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.count("HTML report generated") == 2
+        assert (root / "reports" / "frontend" / "analysis-report.html").exists()
+
+
+def test_overview_includes_review_metrics():
+    """Test that pr_data.json next to a summary adds metrics and is part of the cache key"""
+    from convert_to_pdf import metrics_available
+
+    if not metrics_available():
+        return
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["api"])
+        summary = root / "reports" / "api" / "summary.md"
+        (first,) = convert_summaries([summary], config, pdf=False)
+        assert "Review Metrics" not in first["html"].read_text()
+
+        shutil.copy(FIXTURES / "sample_pr_data.json", summary.parent / "pr_data.json")
+        (second,) = convert_summaries([summary], config, pdf=False)
+        html = second["html"].read_text()
+
+        assert second["cached"] == [] and second["html_key"] != first["html_key"]
+        assert "Review Metrics" in html
+        assert "<td>senior-dev</td><td>2</td><td>1</td><td>50%</td>" in html
+
+        # A second author adds the per-repository table, named from the config,
+        # not from the report directory
+        pr_data = json.loads((summary.parent / "pr_data.json").read_text())
+        pr_data["pr_list"][1]["author"] = "otheruser"
+        (summary.parent / "pr_data.json").write_text(json.dumps(pr_data))
+        (third,) = convert_summaries([summary], config, pdf=False)
+        html = third["html"].read_text()
+
+        assert "<tr><td>test-api</td><td>otheruser</td>" in html and "<tr><td>api</td>" not in html
+
+
+def test_convert_profile_reports_stages():
+    """Test that --profile times each stage and writes the trace and cProfile stats"""
+    import pstats
+
+    sys.path.insert(0, str(FIXTURES))
+    import fake_wkhtmltopdf
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["api", "frontend"])
+        shutil.copy(FIXTURES / "sample_config.json", root / "config.json")
+        env = {**os.environ, **fake_wkhtmltopdf.install(root / "bin")}
+        result = subprocess.run(
+            [sys.executable, "-m", "pull_request_report.cli", "convert", "--pdf", "--backend", "wkhtmltopdf",
+             "--profile-stats", "run.prof", "--trace", "trace.json"],
+            capture_output=True, text=True, cwd=root, env={**env, "PYTHONPATH": str(REPO_ROOT)},
+        )
+        names = [event["name"] for event in json.loads((root / "trace.json").read_text())["traceEvents"]]
+        stats = pstats.Stats(str(root / "run.prof")).stats
+        script = subprocess.run(
+            [sys.executable, str(REPO_ROOT / "convert_to_pdf.py"), "--summary", "reports/*/summary.md",
+             "--html-only", "--force", "--profile"],
+            capture_output=True, text=True, cwd=root,
+        )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    for stage in ("config load", "parse", "render", "pdf", "wkhtmltopdf"):
+        assert stage in result.stdout
+    assert names.count("parse") == names.count("render") == 2
+    # Both PDFs come from one batched wkhtmltopdf process inside the pdf stage
+    assert names.count("wkhtmltopdf") == 1 and names.index("pdf") < names.index("wkhtmltopdf")
+    assert any(name == "parse_markdown_summary" for _, _, name in stats)
+    assert script.returncode == 0, script.stderr
+    assert "Profile (" in script.stdout and "render" in script.stdout
+
+
+def test_convert_shared_css_links_one_stylesheet():
+    """Test that --shared-css writes one hashed stylesheet in the reports root and links it"""
+    sys.path.insert(0, str(FIXTURES))
+    import fake_wkhtmltopdf
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_reports(root, ["api", "frontend"])
+        shutil.copy(FIXTURES / "sample_config.json", root / "config.json")
+        env = {**os.environ, **fake_wkhtmltopdf.install(root / "bin"), "PYTHONPATH": str(REPO_ROOT)}
+        command = [sys.executable, "-m", "pull_request_report.cli", "convert", "--pdf", "--backend", "wkhtmltopdf"]
+        shared = subprocess.run([*command, "--shared-css"], capture_output=True, text=True, cwd=root, env=env)
+        stylesheets = sorted((root / "reports").glob("report.*.css"))
+        css = stylesheets[0].read_text() if stylesheets else None
+        linked = [(root / "reports" / name / "analysis-report.html").read_text() for name in ("api", "frontend")]
+        pdfs = [(root / "reports" / name / "analysis-report.pdf").exists() for name in ("api", "frontend")]
+        inline = subprocess.run(command, capture_output=True, text=True, cwd=root, env=env)
+        inlined = (root / "reports" / "api" / "analysis-report.html").read_text()
+
+    assert shared.returncode == 0, shared.stdout + shared.stderr
+    assert [path.name for path in stylesheets] == [convert_to_pdf.shared_css_name()]
+    assert css == convert_to_pdf.report_css()
+    for html in linked:
+        assert f'<link rel="stylesheet" href="../{stylesheets[0].name}">' in html and "<style>" not in html
+    assert pdfs == [True, True]
+    # Switching back re-renders with the stylesheet inlined
+    assert inline.returncode == 0 and "(unchanged)" not in inline.stdout
+    assert "<style>" in inlined and len(linked[0]) < len(inlined) - 2000
+
+
+if __name__ == "__main__":
+    test_glob_expansion()
+    test_convert_summaries_renders_each_report()
+    test_bad_summary_fails_only_itself()
+    test_script_accepts_glob()
+    test_overview_includes_review_metrics()
+    test_convert_profile_reports_stages()
+    test_convert_shared_css_links_one_stylesheet()
+    print("✅ Batch conversion tests passed!")
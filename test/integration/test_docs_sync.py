@@ -0,0 +1,214 @@
+"""
+Integration tests for syncing engineering docs from a local bare git repository
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+
+from pull_request_report.docs_sync import (  # noqa: E402
+    DocsMirror,
+    DocsSyncError,
+    docs_cache_dir,
+    read_rule_index,
+    rule_index_path,
+    sync_docs,
+)
+from pull_request_report.standards import StandardsIndex  # noqa: E402
+
+GIT_ENV = ["-c", "user.name=Docs Author", "-c", "user.email=docs@example.com", "-c", "init.defaultBranch=main"]
+
+
+def run_git(*args, cwd: Path):
+    subprocess.run(["git", *GIT_ENV, *args], cwd=cwd, check=True, capture_output=True)
+
+
+def make_docs_remote(root: Path):
+    """Create a bare docs repository and a working clone that pushes to it"""
+    remote = root / "docs.git"
+    work = root / "docs-work"
+    run_git("init", "--bare", str(remote), cwd=root)
+    run_git("init", str(work), cwd=root)
+    run_git("remote", "add", "origin", str(remote), cwd=work)
+    (work / "standards.md").write_text((FIXTURES / "sample_engineering_docs.md").read_text())
+    (work / "team").mkdir()
+    (work / "team" / "config.md").write_text("## Config\n### Configuration\n- **Keywords**: environment variables\n")
+    (work / "notes.txt").write_text("not markdown")
+    commit_and_push(work, "Initial docs")
+    return remote, work
+
+
+def commit_and_push(work: Path, message: str):
+    run_git("add", "-A", cwd=work)
+    run_git("commit", "-m", message, cwd=work)
+    run_git("push", "origin", "HEAD:main", cwd=work)
+
+
+def test_first_sync_parses_every_document():
+    """Test that the first sync mirrors the docs and indexes every markdown file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        remote, _ = make_docs_remote(root)
+        mirror = DocsMirror(root / "cache")
+
+        result = mirror.sync(str(remote))
+        assert result["changed"] == ["standards.md", "team/config.md"]
+        assert result["removed"] == [] and result["rules"] == 12
+
+        index = StandardsIndex.from_file(result["index"])
+        assert [rule.name for rule in index.match("Read environment variables, no business logic")] == [
+            "Repository Layer Purity", "Configuration",
+        ]
+
+
+def test_resync_only_reparses_changed_files():
+    """Test that later syncs re-parse changed files, drop removed ones and skip unchanged runs"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        remote, work = make_docs_remote(root)
+        mirror = DocsMirror(root / "cache")
+        first = mirror.sync(str(remote))
+
+        again = mirror.sync(str(remote))
+        assert again["commit"] == first["commit"] and again["changed"] == again["removed"] == []
+
+        (work / "team" / "config.md").write_text(
+            "## Config\n### Configuration\n- **Keywords**: environment variables, feature flags\n"
+        )
+        (work / "team" / "security.md").write_text("## Security\n### CRITICAL: Secrets\n- **Keywords**: api key\n")
+        (work / "notes.txt").write_text("still not markdown, changed")
+        commit_and_push(work, "Update config docs")
+        updated = mirror.sync(str(remote))
+        assert updated["changed"] == ["team/config.md", "team/security.md"]
+        assert updated["rules"] == 13
+
+        (work / "standards.md").unlink()
+        commit_and_push(work, "Drop old standards")
+        trimmed = mirror.sync(str(remote))
+        assert trimmed["changed"] == [] and trimmed["removed"] == ["standards.md"]
+
+        index = StandardsIndex.from_file(mirror.index_path)
+        assert [rule.name for rule in index.rules] == ["Configuration", "Secrets"]
+        assert index.rules[1].critical
+        assert read_rule_index(mirror.index_path)["commit"] == trimmed["commit"]
+
+        forced = mirror.sync(str(remote), force=True)
+        assert forced["changed"] == ["team/config.md", "team/security.md"]
+
+
+def test_sync_docs_updates_config_and_reports_errors():
+    """Test the config-driven entry point, last_synced and a missing remote"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        remote, _ = make_docs_remote(root)
+        with open(FIXTURES / "sample_config.json") as f:
+            config = json.load(f)
+
+        config["engineering_docs"]["enabled"] = False
+        assert sync_docs(config, root / "cache") is None
+
+        config["engineering_docs"].update(enabled=True, github_url=str(remote))
+        result = sync_docs(config, root / "cache")
+        assert config["engineering_docs"]["last_synced"] == result["synced_at"]
+        assert result["synced_at"] > "2025-06-16T00:00:00Z"
+
+        config["engineering_docs"]["github_url"] = str(root / "missing.git")
+        try:
+            sync_docs(config, root / "cache")
+        except DocsSyncError as e:
+            assert "git fetch failed" in str(e)
+        else:
+            raise AssertionError("expected DocsSyncError")
+
+
+def test_sync_docs_command():
+    """Test that pr-report sync-docs writes the index and last_synced to config.json"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        remote, _ = make_docs_remote(root)
+        config = json.loads((FIXTURES / "sample_config.json").read_text())
+        config["engineering_docs"]["github_url"] = str(remote)
+        config_path = root / "config.json"
+        config_path.write_text(json.dumps(config, indent=2))
+
+        result = subprocess.run(
+            [sys.executable, "-m", "pull_request_report.cli", "sync-docs",
+             "--config", str(config_path), "--cache-dir", str(root / "cache")],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert "12 rules" in result.stdout
+        saved = json.loads(config_path.read_text())
+        assert saved["engineering_docs"]["last_synced"] != "2025-06-16T00:00:00Z"
+        assert (root / "cache" / "rules.json").exists()
+
+
+def test_analyze_syncs_docs_without_rewriting_config():
+    """Test that analyze syncs the rule index into --reports-dir but leaves config.json untouched"""
+    import os
+
+    sys.path.insert(0, str(FIXTURES))
+    import fake_gh
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        remote, _ = make_docs_remote(root)
+        config = json.loads((FIXTURES / "sample_config.json").read_text())
+        config["engineering_docs"]["github_url"] = str(remote)
+        config_path = root / "config.json"
+        config_path.write_text(json.dumps(config))
+        before = config_path.read_bytes()
+        sample = json.loads((FIXTURES / "sample_pr_data.json").read_text())
+        env = {**os.environ, **fake_gh.install(root / "bin", fake_gh.rest_routes(sample, "acme/api"))}
+
+        result = subprocess.run(
+            [sys.executable, "-m", "pull_request_report.cli", "analyze", "--repo", "acme/api",
+             "--config", str(config_path), "--reports-dir", str(root / "out")],
+            cwd=REPO_ROOT, capture_output=True, text=True, env=env,
+        )
+        after = config_path.read_bytes()
+        synced = rule_index_path(root / "out").exists()
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Engineering docs" in result.stdout and synced
+    assert after == before
+
+
+def test_convert_uses_index_synced_under_reports_dir():
+    """Test that rendering finds the rule index synced under a non-default reports directory"""
+    import convert_to_pdf
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        remote, _ = make_docs_remote(root)
+        DocsMirror(docs_cache_dir(root / "out")).sync(str(remote))
+        config = json.loads((FIXTURES / "sample_config.json").read_text())
+        config["engineering_docs"] = {"enabled": True, "github_url": str(remote)}
+        summary = root / "out" / "api" / "summary.md"
+        summary.parent.mkdir(parents=True)
+        summary.write_text((FIXTURES / "sample_summary.md").read_text())
+        rule_index = rule_index_path(root / "out")
+
+        index = convert_to_pdf.load_standards_index(config, rule_index)
+        keys = {convert_to_pdf.html_cache_key(summary, config, rule_index=path) for path in (None, rule_index)}
+
+    assert convert_to_pdf.load_standards_index(config) is None
+    assert index is not None and len(index.rules) == 12
+    # The synced docs are part of what the rendered HTML depends on
+    assert len(keys) == 2
+
+
+if __name__ == "__main__":
+    test_first_sync_parses_every_document()
+    test_resync_only_reparses_changed_files()
+    test_sync_docs_updates_config_and_reports_errors()
+    test_sync_docs_command()
+    test_analyze_syncs_docs_without_rewriting_config()
+    test_convert_uses_index_synced_under_reports_dir()
+    print("✅ Docs sync tests passed!")
@@ -0,0 +1,248 @@
+"""
+Integration tests for concurrent PR fetching against a fake gh executable
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(FIXTURES))
+sys.path.insert(0, str(REPO_ROOT / "test" / "unit"))
+
+import fake_gh  # noqa: E402
+
+from pull_request_report.cache import ResponseCache  # noqa: E402
+from pull_request_report.fetch import PRFetcher, repo_slug  # noqa: E402
+from pull_request_report.records import PullRequest, to_pr_data  # noqa: E402
+
+
+@contextmanager
+def fake_gh_env(routes, delay=0.0):
+    """Put a fake gh on PATH for the duration of the block"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = fake_gh.install(Path(temp_dir) / "bin", routes, delay=delay)
+        with fake_gh.patched_env(env):
+            yield env
+
+
+def test_repo_slug():
+    """Test that config entries and URLs resolve to owner/name"""
+    assert repo_slug("owner/repo") == "owner/repo"
+    assert repo_slug({"github_url": "https://github.com/owner/repo-name"}) == "owner/repo-name"
+    assert repo_slug("git@github.com:owner/repo.git") == "owner/repo"
+
+
+def test_fetch_matches_sample_shape():
+    """Test that fetched data normalizes to the sample_pr_data.json shape"""
+    sample = fake_gh.load_sample()
+    with fake_gh_env(fake_gh.rest_routes(sample, "acme/api")):
+        results = PRFetcher(jobs=4, count=10).fetch_all(["acme/api"])
+
+    assert "error" not in results["acme/api"]
+    assert isinstance(results["acme/api"]["pr_list"][0], PullRequest)
+    data = to_pr_data(results["acme/api"])
+    fetched = {pr["number"]: pr for pr in data["pr_list"]}
+    for expected in sample["pr_list"]:
+        pr = fetched[expected["number"]]
+        # Reviewers come from submitted reviews; the fixture also lists some
+        # who never submitted one, so compare everything else directly
+        assert {k: v for k, v in pr.items() if k != "reviewers"} == {
+            k: v for k, v in expected.items() if k != "reviewers"
+        }
+        for reviewer in pr["reviewers"]:
+            assert reviewer in expected["reviewers"]
+    key = lambda r: (r["pr_number"], r["user"], r["body"])  # noqa: E731
+    assert sorted(data["comments"], key=key) == sorted(sample["comments"], key=key)
+    assert sorted(data["reviews"], key=key) == sorted(sample["reviews"], key=key)
+
+
+def test_fetch_runs_calls_concurrently():
+    """Test that gh calls for many repos overlap but never exceed --jobs"""
+    sample = fake_gh.load_sample()
+    repos = [f"acme/repo-{i}" for i in range(4)]
+    routes = {}
+    for repo in repos:
+        routes.update(fake_gh.rest_routes(sample, repo))
+
+    jobs = 3
+    with fake_gh_env(routes, delay=0.2) as env:
+        results = PRFetcher(jobs=jobs, count=10).fetch_all(repos)
+        calls = fake_gh.read_log(env)
+
+    assert all("error" not in data for data in results.values())
+    # One list call plus detail, comments and reviews for each PR
+    assert len(calls) == len(repos) * (1 + 3 * len(sample["pr_list"]))
+
+    edges = sorted([(start, 1) for start, _, _ in calls] + [(end, -1) for _, end, _ in calls])
+    running = peak = 0
+    for _, delta in edges:
+        running += delta
+        peak = max(peak, running)
+    assert 1 < peak <= jobs, f"Expected bounded overlap, peak was {peak}"
+
+
+def test_fetch_isolates_failing_repo():
+    """Test that one missing repo is reported without losing the others"""
+    sample = fake_gh.load_sample()
+    with fake_gh_env(fake_gh.rest_routes(sample, "acme/api")):
+        results = PRFetcher(jobs=2).fetch_all(["acme/api", "acme/missing"])
+
+    assert len(results["acme/api"]["pr_list"]) == len(sample["pr_list"])
+    assert "error" in results["acme/missing"]
+
+
+def test_fetch_filters_by_author():
+    """Test that --author keeps only that author's PRs"""
+    sample = fake_gh.load_sample()
+    sample["pr_list"][0]["author"] = "someone-else"
+    with fake_gh_env(fake_gh.rest_routes(sample, "acme/api")):
+        results = PRFetcher(jobs=2, author="testuser").fetch_all(["acme/api"])
+
+    numbers = [pr["number"] for pr in results["acme/api"]["pr_list"]]
+    assert numbers == [sample["pr_list"][1]["number"]]
+
+
+def test_cache_skips_unchanged_data():
+    """Test that repeat runs reuse merged PRs and revalidate open ones"""
+    sample = fake_gh.load_sample()
+    sample["pr_list"][1]["state"] = "OPEN"
+    sample["pr_list"][1]["merged_at"] = None
+    routes = fake_gh.rest_routes(sample, "acme/api")
+
+    with tempfile.TemporaryDirectory() as cache_dir, fake_gh_env(routes) as env:
+        first = PRFetcher(cache=ResponseCache(Path(cache_dir), ttl=0)).fetch_all(["acme/api"])
+        first_calls = len(fake_gh.read_log(env))
+
+        cache = ResponseCache(Path(cache_dir), ttl=0)
+        second = PRFetcher(cache=cache).fetch_all(["acme/api"])
+        calls = fake_gh.read_log(env)[first_calls:]
+
+    assert second == first
+    # The list and the open PR are revalidated; the merged PR is not requested
+    assert len(calls) == 4
+    assert all("If-None-Match" in " ".join(argv) for _, _, argv in calls)
+    assert not any("/pulls/123" in argv[-1] for _, _, argv in calls)
+    assert (cache.hits, cache.revalidated, cache.misses) == (3, 4, 0)
+
+
+def test_new_prs_appear_within_cache_ttl():
+    """Test that the PR list is revalidated even while cached PR data is still fresh"""
+    sample = fake_gh.load_sample()
+    older = {**sample, "pr_list": sample["pr_list"][:1]}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with fake_gh_env(fake_gh.rest_routes(older, "acme/api")):
+            first = PRFetcher(cache=ResponseCache(Path(cache_dir))).fetch_all(["acme/api"])
+        with fake_gh_env(fake_gh.rest_routes(sample, "acme/api")) as env:
+            second = PRFetcher(cache=ResponseCache(Path(cache_dir))).fetch_all(["acme/api"])
+            calls = fake_gh.read_log(env)
+
+    assert [pr["number"] for pr in first["acme/api"]["pr_list"]] == [123]
+    assert sorted(pr["number"] for pr in second["acme/api"]["pr_list"]) == [123, 124]
+    # PR 123's own data is still served from the cache
+    assert not any("/pulls/123" in argv[-1] for _, _, argv in calls)
+
+
+def test_fetch_since_high_water_mark():
+    """Test that incremental fetches skip PRs at or before the mark"""
+    sample = fake_gh.load_sample()
+    with fake_gh_env(fake_gh.rest_routes(sample, "acme/api")) as env:
+        results = PRFetcher().fetch_all(["acme/api"], since={"acme/api": "2025-06-02T15:30:00Z"})
+        calls = fake_gh.read_log(env)
+
+    assert [pr["number"] for pr in results["acme/api"]["pr_list"]] == [124]
+    assert {c["pr_number"] for c in results["acme/api"]["comments"]} == {124}
+    assert "sort=updated" in calls[0][2][-1]
+    assert not any("/pulls/123" in argv[-1] for _, _, argv in calls)
+
+
+def test_fetch_since_ignores_count():
+    """Test that more new PRs than --count are all fetched, so the mark skips none of them"""
+    sample = fake_gh.load_sample()
+    template = sample["pr_list"][0]
+    sample["pr_list"] = [
+        {**template, "number": number, "created_at": f"2025-07-{number:02d}T10:00:00Z",
+         "merged_at": f"2025-07-{number:02d}T12:00:00Z"}
+        for number in range(1, 16)
+    ]
+    with fake_gh_env(fake_gh.rest_routes(sample, "acme/api")):
+        fresh = PRFetcher(count=10).fetch_all(["acme/api"])["acme/api"]
+        since = PRFetcher(count=10).fetch_all(["acme/api"], since={"acme/api": "2025-07-03T12:00:00Z"})["acme/api"]
+
+    assert len(fresh["pr_list"]) == 10
+    assert sorted(pr["number"] for pr in since["pr_list"]) == list(range(4, 16))
+
+
+def test_analyze_profile_times_each_gh_call():
+    """Test that analyze --profile prints the stage table and traces every gh call"""
+    with tempfile.TemporaryDirectory() as temp_dir, fake_gh_env(fake_gh.rest_routes(fake_gh.load_sample(), "acme/api")) as env:
+        root = Path(temp_dir)
+        result = subprocess.run(
+            [sys.executable, "-m", "pull_request_report.cli", "analyze", "--repo", "acme/api",
+             "--config", str(root / "config.json"), "--reports-dir", str(root / "reports"),
+             "--profile", "--trace", str(root / "trace.json")],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        events = json.loads((root / "trace.json").read_text())["traceEvents"]
+        calls = fake_gh.read_log(env)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "Profile (" in result.stdout and "gh api" in result.stdout and "Trace:" in result.stdout
+    gh_events = [event for event in events if event["name"] == "gh api"]
+    assert len(gh_events) == len(calls)
+    assert {event["args"]["path"] for event in gh_events} == {argv[-1] for _, _, argv in calls}
+    fetch_event = next(event for event in events if event["name"] == "fetch")
+    assert all(fetch_event["ts"] <= event["ts"] <= fetch_event["ts"] + fetch_event["dur"] for event in gh_events)
+
+
+def test_analyze_metrics_file():
+    """Test that analyze --metrics-file writes PR, API call, cache and stage metrics"""
+    from test_prometheus import samples
+
+    with tempfile.TemporaryDirectory() as temp_dir, fake_gh_env(fake_gh.rest_routes(fake_gh.load_sample(), "acme/api")) as env:
+        root = Path(temp_dir)
+        metrics_file = root / "textfile" / "pr_report.prom"
+        command = [sys.executable, "-m", "pull_request_report.cli", "analyze", "--repo", "acme/api",
+                   "--config", str(root / "config.json"), "--reports-dir", str(root / "reports"),
+                   "--metrics-file", str(metrics_file)]
+        first = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+        calls = len(fake_gh.read_log(env))
+        cold = metrics_file.read_text()
+        second = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+        warm = metrics_file.read_text()
+
+    assert first.returncode == 0 and second.returncode == 0, first.stdout + first.stderr
+    assert "Metrics written to" in first.stdout
+    values, rerun = samples(cold), samples(warm)
+    assert values['pr_report_prs_fetched_total{repo="acme/api"}'] == len(fake_gh.load_sample()["pr_list"])
+    assert values['pr_report_github_api_calls_total{status="200"}'] == calls
+    assert values['pr_report_cache_requests_total{result="misses"}'] == calls
+    assert values['pr_report_stage_seconds_count{stage="gh api"}'] == calls
+    assert values['pr_report_stage_seconds_count{stage="fetch"}'] == 1
+    assert values["pr_report_cache_hit_ratio"] == 0
+    assert rerun["pr_report_cache_hit_ratio"] == 1
+    # Only the PR list page is asked for again, and it comes back 304
+    assert rerun['pr_report_cache_requests_total{result="hits"}'] == calls - 1
+    assert rerun['pr_report_cache_requests_total{result="revalidated"}'] == 1
+    assert rerun['pr_report_github_api_calls_total{status="304"}'] == 1
+
+
+if __name__ == "__main__":
+    test_repo_slug()
+    test_fetch_matches_sample_shape()
+    test_fetch_runs_calls_concurrently()
+    test_fetch_isolates_failing_repo()
+    test_fetch_filters_by_author()
+    test_cache_skips_unchanged_data()
+    test_new_prs_appear_within_cache_ttl()
+    test_fetch_since_high_water_mark()
+    test_fetch_since_ignores_count()
+    test_analyze_profile_times_each_gh_call()
+    test_analyze_metrics_file()
+    print("✅ Fetch tests passed!")
@@ -0,0 +1,187 @@
+"""
+Integration tests for the GraphQL fetch backend against a fake gh executable
+"""
+
+import json
+import re
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(FIXTURES))
+
+import fake_gh  # noqa: E402
+
+from pull_request_report.fetch import PRFetcher  # noqa: E402
+from pull_request_report.graphql import GraphQLFetcher, feedback_query  # noqa: E402
+
+REPO = "testorg/test-api"
+
+
+
+def many_prs(count: int) -> dict:
+    """PR data with ``count`` PRs, two comments in one thread plus one elsewhere, and two reviews each"""
+    data = {"pr_list": [], "comments": [], "reviews": []}
+    for number in range(1, count + 1):
+        data["pr_list"].append({
+            "number": number, "title": f"Change {number}", "state": "MERGED" if number % 4 else "OPEN",
+            "author": f"dev-{number % 3}", "created_at": f"2025-06-01T{number // 60:02d}:{number % 60:02d}:00Z",
+            "merged_at": f"2025-06-02T{number // 60:02d}:{number % 60:02d}:00Z" if number % 4 else None,
+            "changed_files": number % 7 + 1, "additions": number * 3, "deletions": number,
+        })
+        for line, body in ((10, "Handle the error here"), (10, "Agreed, and log it"), (42, "Add a test")):
+            data["comments"].append({"pr_number": number, "user": "senior-dev", "body": body,
+                                     "file": f"src/module_{number}.py", "line": line})
+        data["reviews"].append({"pr_number": number, "user": "senior-dev", "state": "CHANGES_REQUESTED",
+                                "body": "See comments"})
+        data["reviews"].append({"pr_number": number, "user": "lead-dev", "state": "APPROVED", "body": ""})
+    return data
+
+
+@contextmanager
+def fake_gh_env(routes, delay=0.0):
+    """Put a fake gh on PATH for the duration of the block"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = fake_gh.install(Path(temp_dir) / "bin", routes, delay=delay)
+        with fake_gh.patched_env(env):
+            yield env
+
+
+def canonical(data: dict) -> dict:
+    """PR data with comments in a backend-independent order"""
+    comments = sorted(data["comments"], key=lambda c: (c["pr_number"], c["file"], c["line"], c["body"]))
+    return {**data, "comments": comments}
+
+
+def test_feedback_query_aliases():
+    """Test that each PR of a batch gets its own alias and variable"""
+    query = feedback_query(3)
+    assert "pr2: pullRequest(number: $n2) { ...Feedback }" in query
+    assert "$n2: Int!" in query and "$n3" not in query
+    assert "reviewThreads(first: $threads)" in query and "path line originalLine" in query
+
+
+def test_graphql_matches_rest():
+    """Test that both backends produce the same pr_data for the sample repository"""
+    sample = fake_gh.load_sample()
+    sample["pr_list"][1]["author"] = "other-dev"
+    with fake_gh_env(fake_gh.rest_routes(sample, REPO)) as env:
+        rest = PRFetcher(count=10).fetch_all([REPO])[REPO]
+        bulk = GraphQLFetcher(count=10).fetch_all([REPO])[REPO]
+        graphql_calls = [argv for _, _, argv in fake_gh.read_log(env) if argv[-1] == "graphql"]
+        by_author = GraphQLFetcher(count=10, author="other-dev").fetch_all([REPO])[REPO]
+        missing = GraphQLFetcher(count=10).fetch_all(["testorg/missing"])["testorg/missing"]
+
+    assert canonical(bulk) == canonical(rest)
+    assert bulk["pr_list"][0]["reviewers"] == rest["pr_list"][0]["reviewers"]
+    assert len(graphql_calls) == 2
+    assert [pr["number"] for pr in by_author["pr_list"]] == [124]
+    assert {c["pr_number"] for c in by_author["comments"]} == {124}
+    assert "Could not resolve to a Repository" in missing["error"]
+
+
+def test_graphql_follows_nested_pages():
+    """Test that reviews, threads and thread comments beyond one page are all fetched"""
+    data = many_prs(3)
+    with fake_gh_env(fake_gh.rest_routes(data, REPO)) as env:
+        rest = PRFetcher(count=3).fetch_all([REPO])[REPO]
+        Path(env["FAKE_GH_LOG"]).unlink()
+        bulk = GraphQLFetcher(count=3, batch_size=2, page_sizes=(1, 1, 1)).fetch_all([REPO])[REPO]
+        operations = [re.search(r"query (\w+)", " ".join(argv)).group(1) for _, _, argv in fake_gh.read_log(env)]
+
+    assert canonical(bulk) == canonical(rest)
+    assert len(bulk["comments"]) == 9 and len(bulk["reviews"]) == 6
+    assert operations.count("PullRequests") == 1 and operations.count("PullRequestFeedback") == 2
+    # One more review, one more thread and one more comment in the first thread, per PR
+    assert operations.count("MoreReviews") == operations.count("MoreThreads") == 3
+    assert operations.count("MoreThreadComments") == 3
+
+
+def test_graphql_since_ignores_count():
+    """Test that incremental GraphQL fetches return every PR past the mark, like REST"""
+    since = {REPO: "2025-06-01T00:00:00Z"}
+    with fake_gh_env(fake_gh.rest_routes(many_prs(15), REPO)):
+        rest = PRFetcher(count=10).fetch_all([REPO], since=since)[REPO]
+        bulk = GraphQLFetcher(count=10).fetch_all([REPO], since=since)[REPO]
+
+    assert sorted(pr["number"] for pr in bulk["pr_list"]) == sorted(pr["number"] for pr in rest["pr_list"])
+    assert len(bulk["pr_list"]) == 15
+
+
+class VanishingFetcher(GraphQLFetcher):
+    """Answers every follow-up page as if the PR or thread had been deleted meanwhile"""
+
+    def graphql(self, *_args, **_variables):
+        return {"repository": {"pullRequest": None}, "node": None}
+
+
+def test_graphql_reports_vanished_nodes():
+    """Test that a null PR or thread on a later page is a ValueError, not a TypeError"""
+    more = {"nodes": [], "pageInfo": {"hasNextPage": True, "endCursor": "c1"}}
+    fetcher = VanishingFetcher(count=1)
+    errors = []
+    for call in (lambda: fetcher._all(REPO, 7, {"reviews": more}, "reviews"),
+                 lambda: fetcher._thread_comments({"id": "T1", "comments": more})):
+        try:
+            call()
+        except ValueError as e:
+            errors.append(str(e))
+
+    assert errors == [f"pull request #7 in {REPO} not found", "review thread T1 not found"]
+
+
+def test_graphql_cuts_request_count():
+    """Test that --count 100 takes an order of magnitude fewer calls than REST"""
+    with fake_gh_env(fake_gh.rest_routes(many_prs(10), REPO)) as env:
+        PRFetcher(count=10).fetch_all([REPO])
+        # A list page, then detail, comments and reviews for every PR
+        assert len(fake_gh.read_log(env)) == 1 + 3 * 10
+
+    with fake_gh_env(fake_gh.rest_routes(many_prs(100), REPO)) as env:
+        bulk = GraphQLFetcher(count=100).fetch_all([REPO])[REPO]
+        graphql_calls = len(fake_gh.read_log(env))
+
+    assert len(bulk["pr_list"]) == 100 and len(bulk["comments"]) == 300 and len(bulk["reviews"]) == 200
+    assert bulk["pr_list"][0]["number"] == 100 and bulk["pr_list"][0]["additions"] == 300
+    # One list page plus one feedback query per 25 PRs
+    assert graphql_calls == 5
+    rest_calls = 1 + 3 * 100
+    assert graphql_calls * 10 <= rest_calls
+
+
+def test_analyze_with_graphql_api():
+    """Test that pr-report analyze --api graphql writes the same pr_data.json"""
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+    config["engineering_docs"]["enabled"] = False
+    config["repositories"] = [{"name": "test-api", "github_url": REPO}]
+    with tempfile.TemporaryDirectory() as temp_dir, fake_gh_env(fake_gh.rest_routes(fake_gh.load_sample(), REPO)) as env:
+        config_path = Path(temp_dir) / "config.json"
+        config_path.write_text(json.dumps(config))
+        reports = Path(temp_dir) / "reports"
+        result = subprocess.run(
+            [sys.executable, "-m", "pull_request_report.cli", "analyze", "--api", "graphql",
+             "--config", str(config_path), "--reports-dir", str(reports)],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        paths = {argv[-1] for _, _, argv in fake_gh.read_log(env)}
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert paths == {"graphql"}
+    assert "✓ testorg/test-api" in result.stdout
+
+
+if __name__ == "__main__":
+    test_feedback_query_aliases()
+    test_graphql_matches_rest()
+    test_graphql_follows_nested_pages()
+    test_graphql_since_ignores_count()
+    test_graphql_reports_vanished_nodes()
+    test_graphql_cuts_request_count()
+    test_analyze_with_graphql_api()
+    print("✅ GraphQL fetch tests passed!")
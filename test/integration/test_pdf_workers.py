@@ -0,0 +1,172 @@
+"""
+Integration tests for parallel and batched PDF rendering
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(FIXTURES))
+
+import fake_gh  # noqa: E402
+import fake_wkhtmltopdf  # noqa: E402
+
+from convert_to_pdf import (  # noqa: E402
+    convert_batch_with_wkhtmltopdf,
+    convert_html_to_pdf,
+    convert_in_process_pool,
+    convert_many_to_pdf,
+    pdf_worker_pool,
+    wkhtmltopdf_options,
+)
+
+
+@contextmanager
+def fake_wkhtmltopdf_env():
+    """Put a fake wkhtmltopdf on PATH for the duration of the block"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = fake_wkhtmltopdf.install(Path(temp_dir) / "bin")
+        with fake_gh.patched_env(env):
+            yield env, Path(temp_dir)
+
+
+def make_jobs(root: Path, count: int, failing=()):
+    jobs = []
+    for i in range(count):
+        html = root / f"report-{i}.html"
+        html.write_text("<html><body>FAIL_RENDER</body></html>" if i in failing else f"<html>{i}</html>")
+        jobs.append((html, root / f"report-{i}.pdf"))
+    return jobs
+
+
+def test_worker_pool_renders_every_file():
+    """Test that a pool of at most three workers renders all files, none in this process"""
+    with fake_wkhtmltopdf_env() as (env, root):
+        jobs = make_jobs(root, 8)
+        errors = convert_in_process_pool(jobs, workers=3, backend="wkhtmltopdf")
+        log = fake_wkhtmltopdf.read_log(env)
+        assert all(pdf.read_bytes().startswith(b"%PDF") for _, pdf in jobs)
+
+    assert errors == {html: None for html, _ in jobs}
+    worker_pids = {ppid for _, ppid, _ in log}
+    assert os.getpid() not in {int(pid) for pid in worker_pids}
+    # How the files spread over the workers is up to the scheduler
+    assert 1 <= len(worker_pids) <= 3
+
+
+def test_caller_pool_stays_warm_across_calls():
+    """Test that files converted in separate calls share the caller's worker processes"""
+    with fake_wkhtmltopdf_env() as (env, root), pdf_worker_pool(2) as pool:
+        jobs = make_jobs(root, 6)
+        first = convert_in_process_pool(jobs[:3], workers=8, backend="wkhtmltopdf", pool=pool)
+        second = convert_in_process_pool(jobs[3:], workers=8, backend="wkhtmltopdf", pool=pool)
+        log = fake_wkhtmltopdf.read_log(env)
+
+    assert set(first.values()) == set(second.values()) == {None}
+    worker_pids = {int(ppid) for _, ppid, _ in log}
+    assert len(log) == 6 and 1 <= len(worker_pids) <= 2 and os.getpid() not in worker_pids
+
+
+def test_worker_pool_reports_errors_per_file():
+    """Test that one failing file does not affect the rest"""
+    with fake_wkhtmltopdf_env() as (_, root):
+        jobs = make_jobs(root, 4, failing={2})
+        errors = convert_in_process_pool(jobs, workers=2, backend="wkhtmltopdf")
+        assert not jobs[2][1].exists()
+
+    assert errors[jobs[2][0]] == "PDF generation failed"
+    assert [errors[html] for html, _ in jobs if html != jobs[2][0]] == [None, None, None]
+
+
+def test_wkhtmltopdf_batch_uses_one_process():
+    """Test that a batch is converted by a single wkhtmltopdf invocation"""
+    with fake_wkhtmltopdf_env() as (env, root):
+        jobs = make_jobs(root, 5, failing={1})
+        # Paths with spaces and quotes must survive the stdin argument lines
+        odd = root / 'my "odd" report.html'
+        odd.write_text("<html>odd</html>")
+        jobs.append((odd, root / "my odd report.pdf"))
+
+        errors = convert_batch_with_wkhtmltopdf(jobs)
+        log = fake_wkhtmltopdf.read_log(env)
+        assert jobs[-1][1].exists()
+
+    assert len(log) == len(jobs)
+    assert len({pid for pid, _, _ in log}) == 1
+    assert errors[jobs[1][0]].startswith("wkhtmltopdf error: Error: Failed loading page")
+    assert str(jobs[1][0]) in errors[jobs[1][0]]
+    assert [html for html, error in errors.items() if error] == [jobs[1][0]]
+
+
+def test_wkhtmltopdf_batch_fails_files_with_load_errors():
+    """Test that a written PDF still fails when its stylesheet could not be loaded, as in single-file mode"""
+    with fake_wkhtmltopdf_env() as (_, root):
+        jobs = make_jobs(root, 3)
+        jobs[1][0].write_text('<html><head><link rel="stylesheet" href="missing.css"></head></html>')
+        errors = convert_batch_with_wkhtmltopdf(jobs)
+        written = [pdf.exists() for _, pdf in jobs]
+        single = convert_html_to_pdf(*jobs[1], "wkhtmltopdf")
+
+    assert written == [True, True, True]
+    assert errors[jobs[0][0]] is None and errors[jobs[2][0]] is None
+    assert errors[jobs[1][0]].startswith("wkhtmltopdf error: Warning: Blocked access to file")
+    assert single is False
+
+
+def test_wkhtmltopdf_batches_spread_over_workers():
+    """Test that many files are split into one long-lived process per worker"""
+    with fake_wkhtmltopdf_env() as (env, root):
+        jobs = make_jobs(root, 9)
+        errors = convert_many_to_pdf(jobs, workers=3, backend="wkhtmltopdf")
+        log = fake_wkhtmltopdf.read_log(env)
+
+    assert set(errors.values()) == {None}
+    assert len(log) == 9
+    assert len({pid for pid, _, _ in log}) == 3
+
+
+def test_missing_wkhtmltopdf_fails_every_file():
+    """Test that an unavailable renderer is reported per file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jobs = make_jobs(Path(temp_dir), 2)
+        with fake_gh.patched_env({"PATH": temp_dir}):
+            errors = convert_many_to_pdf(jobs, backend="wkhtmltopdf")
+
+    assert set(errors.values()) == {"wkhtmltopdf is not available"}
+
+
+def test_only_shared_stylesheet_directory_is_allowed():
+    """Test that local file access is opened just for reports linking a shared stylesheet"""
+    with fake_wkhtmltopdf_env() as (_, root):
+        css = root / "site" / "report.0123abcd.css"
+        css.parent.mkdir()
+        css.write_text("body { color: black; }")
+        html = root / "site" / "api" / "report.html"
+        html.parent.mkdir()
+        # A long title must not hide the link
+        html.write_text(f'<html><head><title>{"x" * 5000}</title>'
+                        f'<link rel="stylesheet" href="../{css.name}"></head></html>')
+        pdf = root / "report.pdf"
+        blocked = convert_html_to_pdf(html, pdf, "wkhtmltopdf")
+        allowed = convert_html_to_pdf(html, pdf, "wkhtmltopdf", shared_css=css)
+
+    assert "--enable-local-file-access" not in wkhtmltopdf_options() and "--allow" not in wkhtmltopdf_options()
+    assert wkhtmltopdf_options(css)[-2:] == ("--allow", str(css.parent))
+    assert not blocked and allowed
+
+
+if __name__ == "__main__":
+    test_worker_pool_renders_every_file()
+    test_caller_pool_stays_warm_across_calls()
+    test_worker_pool_reports_errors_per_file()
+    test_wkhtmltopdf_batch_uses_one_process()
+    test_wkhtmltopdf_batch_fails_files_with_load_errors()
+    test_wkhtmltopdf_batches_spread_over_workers()
+    test_missing_wkhtmltopdf_fails_every_file()
+    test_only_shared_stylesheet_directory_is_allowed()
+    print("✅ PDF worker tests passed!")
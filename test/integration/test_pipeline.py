@@ -0,0 +1,357 @@
+"""
+Integration tests for the repository × author report pipeline
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(FIXTURES))
+sys.path.insert(0, str(REPO_ROOT / "test" / "unit"))
+
+import fake_gh  # noqa: E402
+import fake_wkhtmltopdf  # noqa: E402
+
+from pull_request_report.pipeline import (  # noqa: E402
+    DRAFT_MARKER,
+    PipelineState,
+    ReportPipeline,
+    Scheduler,
+    Task,
+    expand_jobs,
+)
+
+REPOS = ("testorg/test-api", "testorg/frontend-app")
+AUTHORS = ["testuser", "other-dev"]
+
+
+def load_config():
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+    config["engineering_docs"]["enabled"] = False
+    config["analysis_settings"]["authors"] = AUTHORS
+    return config
+
+
+def sample_routes(repos=REPOS) -> dict:
+    """REST routes where PR #124 of every repository is by other-dev"""
+    sample = fake_gh.load_sample()
+    sample["pr_list"][1]["author"] = "other-dev"
+    routes = {}
+    for repo in repos:
+        routes.update(fake_gh.rest_routes(sample, repo))
+    return routes
+
+
+@contextmanager
+def fake_tools(routes, delay=0.0, wkhtmltopdf=True):
+    """Put fake gh and wkhtmltopdf on PATH for the duration of the block"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = fake_gh.install(Path(temp_dir) / "bin", routes, delay=delay)
+        if wkhtmltopdf:
+            env.update({**fake_wkhtmltopdf.install(Path(temp_dir) / "bin"), "PATH": env["PATH"]})
+        with fake_gh.patched_env(env):
+            yield env
+
+
+def test_expand_jobs():
+    """Test that every repository × author becomes a job with its own config"""
+    config = load_config()
+    jobs = expand_jobs(config, Path("out"))
+    assert [job.id for job in jobs] == [f"{repo}@{author}" for repo in REPOS for author in AUTHORS]
+    assert jobs[1].report_dir == Path("out/test-api/other-dev")
+    assert jobs[2].config["repositories"][0]["name"] == "frontend-app"
+    assert jobs[1].config["analysis_settings"]["author"] == "other-dev"
+
+    single = expand_jobs(config, Path("out"), repos=["testorg/test-api", "acme/extra"], authors=["testuser"])
+    assert [(job.id, job.report_dir) for job in single] == [
+        ("testorg/test-api@testuser", Path("out/test-api")),
+        ("acme/extra@testuser", Path("out/extra")),
+    ]
+
+
+def test_pipeline_renders_every_report():
+    """Test the full fetch → pdf chain for four jobs, with shared stages run once"""
+    with tempfile.TemporaryDirectory() as temp_dir, fake_tools(sample_routes(), delay=0.1) as env:
+        reports = Path(temp_dir) / "reports"
+        jobs = expand_jobs(load_config(), reports)
+        pipeline = ReportPipeline(load_config(), jobs, reports_dir=reports, backend="wkhtmltopdf")
+        updates = []
+        status = pipeline.run(PipelineState(reports / "state.json"), workers=4,
+                              on_update=lambda task, s, _info: updates.append((task.key, s)))
+        calls = fake_gh.read_log(env)
+
+        assert set(status.values()) == {"done"} and len(status) == 2 + 4 * 5
+        assert sum(1 for key, s in updates if key == ("*", "template") and s == "done") == 1
+        for job in jobs:
+            summary = job.path("summarize").read_text()
+            assert DRAFT_MARKER in summary
+            number = 123 if job.author == "testuser" else 124
+            assert f"- PR #{number}:" in summary and summary.count("- PR #") == 1
+            assert job.path("render").exists() and job.path("pdf").read_bytes().startswith(b"%PDF")
+            html = job.path("render").read_text()
+            assert job.config["repositories"][0]["name"] in html
+
+        # Fetches of different jobs overlapped instead of running one after another
+        starts = sorted(start for start, _, _ in calls)
+        ends = sorted(end for _, end, _ in calls)
+        assert starts[1] < ends[0]
+
+
+def test_pdf_stage_uses_warm_pool():
+    """Test that pdf_workers PDFs render at once, all on one pool kept for the run"""
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+    pools = set()
+
+    class CountingPipeline(ReportPipeline):
+        def render_pdf(self, job):
+            with lock:
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                pools.add(id(self.pdf_pool))
+            try:
+                time.sleep(0.1)
+                return super().render_pdf(job)
+            finally:
+                with lock:
+                    running["now"] -= 1
+
+    with tempfile.TemporaryDirectory() as temp_dir, fake_tools(sample_routes()):
+        reports = Path(temp_dir) / "reports"
+        jobs = expand_jobs(load_config(), reports)
+        pipeline = CountingPipeline(load_config(), jobs, reports_dir=reports, backend="wkhtmltopdf", pdf_workers=3)
+        status = pipeline.run(PipelineState(reports / "state.json"), workers=4)
+        assert all(job.path("pdf").read_bytes().startswith(b"%PDF") for job in jobs)
+
+    assert set(status.values()) == {"done"}
+    assert running["peak"] == 3
+    assert len(pools) == 1 and id(None) not in pools and pipeline.pdf_pool is None
+
+
+def test_failed_job_is_isolated_and_resumed():
+    """Test that one broken repository blocks only its own stages and resume redoes just those"""
+    config = load_config()
+    config["analysis_settings"]["authors"] = ["testuser"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        reports = Path(temp_dir) / "reports"
+        state = reports / "state.json"
+        jobs = expand_jobs(config, reports)
+
+        with fake_tools(sample_routes(REPOS[:1])):
+            status = ReportPipeline(config, jobs, reports_dir=reports, pdf=False).run(PipelineState(state))
+        assert [status[("testorg/test-api@testuser", stage)] for stage in ("fetch", "render")] == ["done", "done"]
+        assert status[("testorg/frontend-app@testuser", "fetch")] == "failed"
+        assert status[("testorg/frontend-app@testuser", "render")] == "blocked"
+        saved = json.loads(state.read_text())["tasks"]
+        assert "404" in saved["testorg/frontend-app@testuser"]["fetch"]["error"]
+
+        with fake_tools(sample_routes()) as env:
+            status = ReportPipeline(config, jobs, reports_dir=reports, pdf=False).run(PipelineState(state), resume=True)
+            fetched = {argv[-1].split("/")[2] for _, _, argv in fake_gh.read_log(env)}
+        assert status[("testorg/test-api@testuser", "render")] == "cached"
+        assert status[("testorg/frontend-app@testuser", "render")] == "done"
+        assert fetched == {"frontend-app"}
+
+
+def test_state_journal_replays_and_compacts():
+    """Test that checkpoints are cheap appends, survive a crash and fold into the state file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / ".state" / "pipeline.json"
+        state = PipelineState(path)
+        started = time.perf_counter()
+        for job in range(1000):
+            for stage in ("fetch", "analyze", "summarize", "render", "pdf"):
+                state.record(f"job{job}", stage, "done", seconds=0.1)
+        elapsed = time.perf_counter() - started
+        assert not path.exists()
+
+        # A run that died mid-write leaves a torn last line behind
+        with open(state.journal, "a") as f:
+            f.write('["job0", "pdf", {"status": "fai')
+        crashed = PipelineState(path)
+        assert crashed.tasks == state.tasks and len(crashed.tasks) == 1000
+
+        crashed.compact()
+        assert not crashed.journal.exists()
+        assert json.loads(path.read_text())["tasks"] == state.tasks
+        assert PipelineState(path).tasks == state.tasks
+
+    assert elapsed < 5
+
+
+def test_scheduler_respects_stage_limits():
+    """Test dependency order and per-stage concurrency ceilings"""
+    lock = threading.Lock()
+    running = {"slow": 0}
+    peak = {"slow": 0}
+    order = []
+
+    def slow(name):
+        def run():
+            with lock:
+                running["slow"] += 1
+                peak["slow"] = max(peak["slow"], running["slow"])
+            time.sleep(0.05)
+            with lock:
+                running["slow"] -= 1
+                order.append(name)
+        return run
+
+    tasks = [Task(f"job{i}", "slow", slow(f"job{i}")) for i in range(6)]
+    tasks.append(Task("*", "after", lambda: order.append("after"), [(f"job{i}", "slow") for i in range(6)]))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state = PipelineState(Path(temp_dir) / "state.json")
+        status = Scheduler(tasks, state, workers=4, limits={"slow": 2}).run()
+
+    assert set(status.values()) == {"done"}
+    assert peak["slow"] == 2 and order[-1] == "after"
+
+
+def test_resume_after_pdf_failure():
+    """Test that a resumed run only redoes the PDFs that failed"""
+    config = load_config()
+    config["analysis_settings"]["authors"] = ["testuser"]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        reports = Path(temp_dir) / "reports"
+        state = reports / "state.json"
+        jobs = expand_jobs(config, reports)
+        # No wkhtmltopdf on PATH: every PDF fails after the HTML was rendered
+        with fake_tools(sample_routes(), wkhtmltopdf=False):
+            status = ReportPipeline(config, jobs, reports_dir=reports, backend="wkhtmltopdf").run(PipelineState(state))
+        assert [status[(job.id, "pdf")] for job in jobs] == ["failed", "failed"]
+        assert all(status[(job.id, "render")] == "done" for job in jobs)
+
+        # Editing a summary invalidates that job's summarize checkpoint and everything after it
+        summary = jobs[1].path("summarize")
+        summary.write_text(summary.read_text().replace(DRAFT_MARKER, "").replace("- PR #123: ", "- PR #123: Reviewed by hand. "))
+        with fake_tools(sample_routes()) as env:
+            status = ReportPipeline(config, jobs, reports_dir=reports, backend="wkhtmltopdf").run(
+                PipelineState(state), resume=True
+            )
+            assert fake_gh.read_log(env) == []
+            rendered = [Path(source).parent.name for _, _, source in fake_wkhtmltopdf.read_log(env)]
+        assert [status[(jobs[0].id, stage)] for stage in ("fetch", "render", "pdf")] == ["cached", "cached", "done"]
+        assert [status[(jobs[1].id, stage)] for stage in ("analyze", "summarize", "render")] == [
+            "cached", "done", "done",
+        ]
+        assert sorted(rendered) == ["frontend-app", "test-api"]
+        assert "Reviewed by hand." in summary.read_text()
+        assert "Reviewed by hand." in jobs[1].path("render").read_text()
+
+
+def test_analyze_resume_skips_fetched_repositories():
+    """Test that pr-report analyze --resume only fetches repositories that failed before"""
+    config = load_config()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = Path(temp_dir) / "config.json"
+        config_path.write_text(json.dumps(config))
+        reports = Path(temp_dir) / "reports"
+        command = [sys.executable, "-m", "pull_request_report.cli", "analyze",
+                   "--config", str(config_path), "--reports-dir", str(reports), "--no-cache"]
+
+        with fake_tools(sample_routes(REPOS[:1])):
+            first = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+        assert first.returncode == 1 and "--resume" in first.stdout
+        state = json.loads((reports / ".state" / "analyze.json").read_text())["tasks"]
+        assert state["testorg/test-api"]["fetch"]["prs"] == [123]
+        assert state["testorg/frontend-app"]["fetch"]["status"] == "failed"
+
+        with fake_tools(sample_routes()) as env:
+            second = subprocess.run(command + ["--resume"], cwd=REPO_ROOT, capture_output=True, text=True)
+            fetched = {argv[-1].split("/")[2] for _, _, argv in fake_gh.read_log(env)}
+        assert second.returncode == 0, second.stdout
+        assert fetched == {"frontend-app"}
+        assert (reports / "frontend-app" / "pr_data.json").exists()
+
+
+def test_pipeline_stages_are_profiled():
+    """Test that every task and the gh and wkhtmltopdf calls inside it become spans"""
+    from pull_request_report.profiling import profiling
+
+    config = load_config()
+    with tempfile.TemporaryDirectory() as temp_dir, fake_tools(sample_routes()) as env:
+        reports = Path(temp_dir) / "reports"
+        jobs = expand_jobs(config, reports, repos=["testorg/test-api"], authors=["testuser"])
+        with profiling() as profiler:
+            ReportPipeline(config, jobs, reports_dir=reports, backend="wkhtmltopdf").run(PipelineState(reports / "state.json"))
+        calls = fake_gh.read_log(env)
+
+    stages = {stage["name"]: stage for stage in profiler.summary()}
+    for stage in ("fetch", "analyze", "summarize", "render", "pdf"):
+        assert stages[f"{stage} stage"]["calls"] == 1
+    assert stages["gh api"]["calls"] == len(calls)
+    # The pdf stage reuses the HTML the render stage wrote
+    assert stages["render"]["calls"] == 1 and stages["wkhtmltopdf"]["calls"] == 1
+    assert stages["fetch stage"]["total"] >= stages["gh api"]["max"]
+
+
+def test_pipeline_exports_metrics():
+    """Test PR, failure, stage and page metrics for a run where one repository is gone"""
+    from test_prometheus import samples
+
+    from pull_request_report.prometheus import exporting
+
+    config = load_config()
+    with tempfile.TemporaryDirectory() as temp_dir, fake_tools(sample_routes(("testorg/test-api",))):
+        reports = Path(temp_dir) / "reports"
+        jobs = expand_jobs(config, reports, authors=["testuser"])
+        with exporting(reports / "pr_report.prom") as exporter:
+            status = ReportPipeline(config, jobs, reports_dir=reports, backend="wkhtmltopdf").run(
+                PipelineState(reports / "state.json")
+            )
+            live = samples(exporter.render())
+        final = samples((reports / "pr_report.prom").read_text())
+
+    assert status[("testorg/frontend-app@testuser", "fetch")] == "failed"
+    assert live == final
+    assert final['pr_report_failures_total{repo="testorg/frontend-app",stage="fetch"}'] == 1
+    assert final['pr_report_prs_fetched_total{repo="testorg/test-api"}'] == 1
+    assert final['pr_report_github_api_calls_total{status="404"}'] >= 1
+    assert final['pr_report_stage_seconds_count{stage="fetch stage"}'] == 2
+    assert final['pr_report_stage_seconds_count{stage="pdf stage"}'] == 1
+    assert final['pr_report_stage_seconds_count{stage="wkhtmltopdf"}'] == 1
+    assert final["pr_report_pdf_pages_count"] == 1 and final["pr_report_pdf_pages_sum"] >= 1
+
+
+def test_pipeline_shared_css():
+    """Test that every report of a --shared-css run links the one stylesheet in reports_dir"""
+    import convert_to_pdf
+
+    with tempfile.TemporaryDirectory() as temp_dir, fake_tools(sample_routes()):
+        reports = Path(temp_dir) / "reports"
+        jobs = expand_jobs(load_config(), reports)
+        pipeline = ReportPipeline(load_config(), jobs, reports_dir=reports, backend="wkhtmltopdf", shared_css=True)
+        status = pipeline.run(PipelineState(reports / "state.json"))
+        stylesheets = [path.name for path in reports.glob("report.*.css")]
+        pages = [job.path("render").read_text() for job in jobs]
+        pdfs = [job.path("pdf").exists() for job in jobs]
+
+    assert set(status.values()) == {"done"}
+    assert stylesheets == [convert_to_pdf.shared_css_name()]
+    # Reports sit in reports/<repo>/<author>/
+    assert all(f'href="../../{stylesheets[0]}"' in html and "<style>" not in html for html in pages)
+    assert all(pdfs)
+
+
+if __name__ == "__main__":
+    test_expand_jobs()
+    test_pipeline_renders_every_report()
+    test_pdf_stage_uses_warm_pool()
+    test_failed_job_is_isolated_and_resumed()
+    test_state_journal_replays_and_compacts()
+    test_scheduler_respects_stage_limits()
+    test_resume_after_pdf_failure()
+    test_analyze_resume_skips_fetched_repositories()
+    test_pipeline_stages_are_profiled()
+    test_pipeline_exports_metrics()
+    test_pipeline_shared_css()
+    print("✅ Pipeline tests passed!")
@@ -0,0 +1,100 @@
+"""
+Integration tests for rate-limited fetching against a local mock GitHub server
+"""
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(FIXTURES))
+
+import fake_gh  # noqa: E402
+from mock_github import MockGitHub  # noqa: E402
+
+from pull_request_report.fetch import PRFetcher  # noqa: E402
+from pull_request_report.prometheus import exporting  # noqa: E402
+from pull_request_report.ratelimit import RateLimiter  # noqa: E402
+
+REPO = "testorg/busy-api"
+PRS = 6
+
+
+def busy_routes(prs: int = PRS) -> dict:
+    """Merged PRs with a comment and a review each: 1 + 3 * prs REST calls"""
+    pr_data = {"pr_list": [], "comments": [], "reviews": []}
+    for number in range(1, prs + 1):
+        pr_data["pr_list"].append({
+            "number": number, "title": f"Change {number}", "state": "MERGED", "author": "testuser",
+            "created_at": f"2025-06-{number:02d}T10:00:00Z", "merged_at": f"2025-06-{number:02d}T12:00:00Z",
+            "changed_files": 1, "additions": 10, "deletions": 2,
+        })
+        pr_data["comments"].append({"pr_number": number, "user": "senior-dev", "body": "Add a test",
+                                    "file": "app.py", "line": 3})
+        pr_data["reviews"].append({"pr_number": number, "user": "senior-dev", "state": "APPROVED", "body": ""})
+    return fake_gh.rest_routes(pr_data, REPO)
+
+
+@contextmanager
+def gh_via_server(server: MockGitHub):
+    """Put a fake gh that forwards to ``server`` on PATH for the duration of the block"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = fake_gh.install(Path(temp_dir) / "bin", {}, server=server.url)
+        with fake_gh.patched_env(env):
+            yield env
+
+
+def fetch(limiter=None, prs: int = PRS) -> dict:
+    return PRFetcher(jobs=8, count=prs, limiter=limiter).fetch_all([REPO])[REPO]
+
+
+def test_primary_limit_spreads_calls_over_windows():
+    """Test that an exhausted budget waits for the reset instead of failing the repository"""
+    with MockGitHub(busy_routes(), limit=8, window=1) as server, gh_via_server(server):
+        unlimited = fetch()
+        assert "rate limit exceeded" in unlimited["error"]
+
+    with MockGitHub(busy_routes(), limit=8, window=1) as server, gh_via_server(server), exporting() as exporter:
+        limiter = RateLimiter(burst=8)
+        data = fetch(limiter)
+        statuses = server.statuses()
+
+    assert "error" not in data
+    assert len(data["pr_list"]) == PRS and len(data["comments"]) == PRS and len(data["reviews"]) == PRS
+    assert statuses.count(200) == 1 + 3 * PRS
+    # Only calls already in flight when the budget ran out can be rejected
+    assert statuses.count(403) <= limiter.burst
+    assert limiter.throttled == statuses.count(403)
+    # Every call and throttle is counted, and the gauge follows the last response
+    metrics = exporter.values
+    assert metrics["pr_report_github_throttled_total"].get((), 0) == limiter.throttled
+    assert metrics["pr_report_github_api_calls_total"][("200",)] == statuses.count(200)
+    assert 0 <= metrics["pr_report_github_rate_limit_remaining"][()] < 8
+
+
+def test_secondary_limit_backs_off():
+    """Test that 429 Retry-After responses are retried after a shared pause"""
+    routes = busy_routes(4)
+    with MockGitHub(routes, window=60, max_concurrent=2, delay=0.1) as server, gh_via_server(server):
+        unlimited = fetch(prs=4)
+        assert "secondary rate limit" in unlimited["error"]
+
+    with MockGitHub(routes, window=60, max_concurrent=2, delay=0.1) as server, gh_via_server(server):
+        limiter = RateLimiter(burst=8, backoff=0.1)
+        data = fetch(limiter, prs=4)
+        statuses = server.statuses()
+
+    assert "error" not in data and len(data["pr_list"]) == 4
+    assert statuses.count(200) == 13
+    assert statuses.count(429) == limiter.throttled > 0
+    # Fewer calls go out at once after each throttle, so retries stay well below one per call
+    assert statuses.count(429) < 13 and limiter.concurrency < limiter.burst
+
+
+if __name__ == "__main__":
+    test_primary_limit_spreads_calls_over_windows()
+    test_secondary_limit_backs_off()
+    print("✅ Rate limit tests passed!")
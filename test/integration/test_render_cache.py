@@ -0,0 +1,113 @@
+"""
+Integration tests for skipping re-renders of unchanged reports
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FIXTURES = REPO_ROOT / "test" / "fixtures"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(FIXTURES))
+
+import fake_gh  # noqa: E402
+import fake_wkhtmltopdf  # noqa: E402
+
+from convert_to_pdf import convert_summaries  # noqa: E402
+
+
+def load_config():
+    with open(FIXTURES / "sample_config.json") as f:
+        return json.load(f)
+
+
+@contextmanager
+def report_dir():
+    """A summary in a temp dir with a fake wkhtmltopdf on PATH"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        env = fake_wkhtmltopdf.install(root / "bin")
+        summary = root / "reports" / "api" / "summary.md"
+        summary.parent.mkdir(parents=True)
+        shutil.copy(FIXTURES / "sample_summary.md", summary)
+        with fake_gh.patched_env(env):
+            yield env, summary
+
+
+def convert(summary, config, **kwargs):
+    (result,) = convert_summaries([summary], config, backend="wkhtmltopdf", **kwargs)
+    assert result["error"] is None
+    return result
+
+
+def test_unchanged_report_is_skipped():
+    """Test that a second run reuses both outputs without rendering"""
+    config = load_config()
+    with report_dir() as (env, summary):
+        first = convert(summary, config)
+        html_mtime = first["html"].stat().st_mtime_ns
+        second = convert(summary, config)
+
+        assert first["cached"] == []
+        assert second["cached"] == ["html", "pdf"]
+        assert second["html"].stat().st_mtime_ns == html_mtime
+        assert len(fake_wkhtmltopdf.read_log(env)) == 1
+        manifest = json.loads((summary.parent / "analysis-report.manifest.json").read_text())
+        assert manifest["html_key"] == second["html_key"]
+        assert manifest["pdf_key"] == second["pdf_key"]
+
+
+def test_changed_inputs_rerender():
+    """Test that the summary and rendered config fields are part of the key"""
+    config = load_config()
+    with report_dir() as (env, summary):
+        convert(summary, config)
+
+        # Config fields the template does not use leave the key alone
+        convert(summary, {**config, "analysis": {"pr_limit": 99}})
+        assert len(fake_wkhtmltopdf.read_log(env)) == 1
+
+        summary.write_text(summary.read_text() + "\nExtra line.\n")
+        assert convert(summary, config)["cached"] == []
+
+        renamed = {**config, "repositories": [{**config["repositories"][0], "name": "renamed"}]}
+        assert convert(summary, renamed)["cached"] == []
+        assert len(fake_wkhtmltopdf.read_log(env)) == 3
+
+
+def test_force_and_missing_outputs_rerender():
+    """Test that --force and deleted outputs bypass the manifest"""
+    config = load_config()
+    with report_dir() as (env, summary):
+        first = convert(summary, config)
+        assert convert(summary, config, force=True)["cached"] == []
+
+        first["pdf"].unlink()
+        assert convert(summary, config)["cached"] == ["html"]
+        assert first["pdf"].exists()
+        assert len(fake_wkhtmltopdf.read_log(env)) == 3
+
+
+def test_failed_pdf_is_retried():
+    """Test that a PDF failure is not recorded as up to date"""
+    config = load_config()
+    with report_dir() as (env, summary):
+        summary.write_text(summary.read_text() + "\nFAIL_RENDER\n")
+        (failed,) = convert_summaries([summary], config, backend="wkhtmltopdf")
+        assert failed["error"] and failed["pdf"] is None
+
+        (retried,) = convert_summaries([summary], config, backend="wkhtmltopdf")
+        assert retried["cached"] == ["html"]
+        assert len(fake_wkhtmltopdf.read_log(env)) == 2
+
+
+if __name__ == "__main__":
+    test_unchanged_report_is_skipped()
+    test_changed_inputs_rerender()
+    test_force_and_missing_outputs_rerender()
+    test_failed_pdf_is_retried()
+    print("✅ Render cache tests passed!")
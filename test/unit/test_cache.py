@@ -0,0 +1,100 @@
+"""
+Unit tests for the on-disk GitHub response cache
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pull_request_report.cache import ResponseCache, atomic_open, atomic_write_json  # noqa: E402
+
+
+def test_round_trip_and_validators():
+    """Test that bodies come back with their ETag and Last-Modified"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResponseCache(Path(temp_dir))
+        headers = {"etag": '"abc"', "last-modified": "Mon, 02 Jun 2025 15:30:00 GMT"}
+        cache.put("acme/api", 123, "pulls/123/comments?page=1", [{"body": "x"}], headers)
+
+        entry = cache.get("acme/api", 123, "pulls/123/comments?page=1")
+        assert entry["body"] == [{"body": "x"}]
+        assert cache.conditional_headers(entry) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 02 Jun 2025 15:30:00 GMT",
+        }
+        assert cache.get("acme/api", 124, "pulls/123/comments?page=1") is None
+
+
+def test_ttl_applies_only_to_open_prs():
+    """Test that open entries expire but closed/merged ones never do"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResponseCache(Path(temp_dir), ttl=60)
+        open_entry = cache.put("acme/api", 1, "pulls/1", {"state": "open"})
+        closed_entry = cache.put("acme/api", 2, "pulls/2", {"state": "closed"}, immutable=True)
+
+        assert cache.is_fresh(open_entry)
+        open_entry["fetched_at"] = closed_entry["fetched_at"] = time.time() - 3600
+        assert not cache.is_fresh(open_entry)
+        assert cache.is_fresh(closed_entry)
+
+
+def test_closing_a_pr_moves_it_out_of_the_open_bucket():
+    """Test that an immutable write replaces the open copy"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResponseCache(Path(temp_dir))
+        cache.put("acme/api", 1, "pulls/1", {"state": "open"})
+        cache.put("acme/api", 1, "pulls/1", {"state": "closed"}, immutable=True)
+
+        assert not list((Path(temp_dir) / "http" / "open").rglob("*.json"))
+        assert cache.get("acme/api", 1, "pulls/1")["body"] == {"state": "closed"}
+
+
+def test_prune_evicts_least_recently_used_open_entries():
+    """Test the LRU cap on open entries"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResponseCache(Path(temp_dir), max_open_entries=2)
+        for number in range(1, 4):
+            cache.put("acme/api", number, f"pulls/{number}", {"n": number})
+        cache.put("acme/api", 9, "pulls/9", {"n": 9}, immutable=True)
+
+        # PR 1 is the oldest write, but reading it makes PR 2 the LRU entry
+        open_dir = Path(temp_dir) / "http" / "open" / "acme__api"
+        for number, age in ((1, 300), (2, 200), (3, 100)):
+            for path in (open_dir / str(number)).glob("*.json"):
+                os.utime(path, (time.time() - age, time.time() - age))
+        cache.get("acme/api", 1, "pulls/1")
+
+        assert cache.prune() == 1
+        assert cache.get("acme/api", 2, "pulls/2") is None
+        assert cache.get("acme/api", 1, "pulls/1") is not None
+        assert cache.get("acme/api", 3, "pulls/3") is not None
+        assert cache.get("acme/api", 9, "pulls/9") is not None
+
+
+def test_atomic_writes_keep_normal_file_modes():
+    """Test that atomic writes get the umask default, or keep an existing file's mode"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        (root / "plain.txt").write_text("x")
+        atomic_write_json(root / "new.json", {"a": 1})
+        (root / "shared.css").write_text("")
+        os.chmod(root / "shared.css", 0o640)
+        with atomic_open(root / "shared.css") as f:
+            f.write("body {}")
+        modes = {path.name: path.stat().st_mode & 0o777 for path in root.iterdir()}
+
+    assert modes["new.json"] == modes["plain.txt"]
+    assert modes["shared.css"] == 0o640
+
+
+if __name__ == "__main__":
+    test_round_trip_and_validators()
+    test_ttl_applies_only_to_open_prs()
+    test_closing_a_pr_moves_it_out_of_the_open_bucket()
+    test_prune_evicts_least_recently_used_open_entries()
+    test_atomic_writes_keep_normal_file_modes()
+    print("✅ Cache tests passed!")
@@ -0,0 +1,110 @@
+"""
+Unit tests for CLI startup cost: lazy imports and cached tool discovery
+"""
+
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from pull_request_report.tools import find_tools  # noqa: E402
+
+# Loaded by commands that need them, never by ``import pull_request_report.cli``
+LAZY_MODULES = ("rich", "json", "convert_to_pdf", "jinja2", "pull_request_report.fetch", "sqlite3", "pull_request_report.ingest")
+
+
+def import_times(module: str) -> dict:
+    """Return ``{module: cumulative microseconds}`` from ``python -X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=REPO_ROOT, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def make_tool(bin_dir: Path, name: str) -> Path:
+    """Write an executable that logs every ``--version`` call"""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    exe = bin_dir / name
+    exe.write_text(f"#!/bin/sh\necho called >> '{bin_dir / (name + '.log')}'\necho '{name} version 1.2.3'\n")
+    exe.chmod(exe.stat().st_mode | stat.S_IEXEC)
+    return exe
+
+
+def calls(bin_dir: Path, name: str) -> int:
+    log = bin_dir / f"{name}.log"
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+
+def test_cli_import_is_lazy():
+    """Benchmark ``import pull_request_report.cli`` and check heavy modules stay unloaded"""
+    times = import_times("pull_request_report.cli")
+    loaded = [name for name in LAZY_MODULES if name in times]
+    assert not loaded, f"Imported at startup: {loaded}"
+    total = times["pull_request_report.cli"]
+    print(f"  import pull_request_report.cli: {total / 1000:.1f} ms "
+          f"(typer {times.get('typer', 0) / 1000:.1f} ms)")
+
+
+def test_tool_discovery_is_cached():
+    """Test that --version runs once per PATH and executable mtime"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        bin_dir = root / "bin"
+        exe = make_tool(bin_dir, "fake-tool")
+        cache_path = root / "tools.json"
+        saved_path = os.environ["PATH"]
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{saved_path}"
+        try:
+            first = find_tools(["fake-tool"], cache_path)["fake-tool"]
+            second = find_tools(["fake-tool"], cache_path)["fake-tool"]
+            assert (first.path, first.version) == (str(exe), "fake-tool version 1.2.3")
+            assert (second.path, second.version) == (first.path, first.version)
+            assert calls(bin_dir, "fake-tool") == 1
+
+            # Reinstalling the tool changes its mtime
+            os.utime(exe, ns=(0, exe.stat().st_mtime_ns + 1_000_000_000))
+            find_tools(["fake-tool"], cache_path)
+            assert calls(bin_dir, "fake-tool") == 2
+
+            # A different PATH gets its own entries
+            os.environ["PATH"] = f"{bin_dir}{os.pathsep}{root}{os.pathsep}{saved_path}"
+            find_tools(["fake-tool"], cache_path)
+            assert calls(bin_dir, "fake-tool") == 3
+        finally:
+            os.environ["PATH"] = saved_path
+
+
+def test_missing_tools_are_not_cached():
+    """Test that a tool installed after a failed lookup is found next time"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        cache_path = root / "tools.json"
+        saved_path = os.environ["PATH"]
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{saved_path}"
+        try:
+            assert find_tools(["late-tool"], cache_path) == {"late-tool": None}
+            make_tool(bin_dir, "late-tool")
+            assert find_tools(["late-tool"], cache_path)["late-tool"].path == str(bin_dir / "late-tool")
+        finally:
+            os.environ["PATH"] = saved_path
+
+
+if __name__ == "__main__":
+    test_cli_import_is_lazy()
+    test_tool_discovery_is_cached()
+    test_missing_tools_are_not_cached()
+    print("✅ CLI startup tests passed!")
@@ -0,0 +1,120 @@
+"""
+Unit tests for the template-based HTML renderer
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import convert_to_pdf  # noqa: E402
+from convert_to_pdf import generate_html, parse_markdown_summary, write_html  # noqa: E402
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+def load_inputs():
+    with open(FIXTURES / "sample_summary.md") as f:
+        data = parse_markdown_summary(f)
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+    return data, config
+
+
+def test_html_contains_every_parsed_item():
+    """Test that all parsed content reaches the rendered report"""
+    data, config = load_inputs()
+    html = generate_html(data, config)
+
+    assert html.startswith("<!DOCTYPE html>")
+    assert "from the test-api repository" in html
+    assert html.count('<div class="pattern-section">') == len(data["patterns"])
+    for pr in data["pr_list"]:
+        assert f"<li>{pr}</li>" in html
+    for pattern in data["patterns"]:
+        for item in pattern["issues"] + pattern["improvements"]:
+            assert convert_to_pdf.inline_markdown(item) in html
+    assert "<strong>Method Placement</strong>" in html
+    assert "**" not in html.split("</style>")[1]
+    assert ".pattern-section" in html
+
+
+def test_standards_compliance_bold_pairs():
+    """Test that bold markers become matched strong tags"""
+    data, config = load_inputs()
+    data["standards_compliance"] = "**Repository Layer Purity**: 2 comments\n**DRY Principle**: 1 comment\n"
+    html = generate_html(data, config)
+
+    assert "<strong>Repository Layer Purity</strong>: 2 comments" in html
+    assert "<strong>DRY Principle</strong>: 1 comment" in html
+
+
+def test_comment_markup_is_escaped():
+    """Test that HTML quoted from review comments is shown as text, not rendered"""
+    data, config = load_inputs()
+    data["patterns"][0]["issues"] = ["**api.py**: Use <img src=x onerror=alert(1)> List<Foo> here"]
+    data["patterns"][0]["improvements"] = ["Drop the <script>alert('x')</script> tag & retry"]
+    data["title"] = "Report <b>draft</b>"
+    html = generate_html(data, config)
+
+    assert "<img" not in html and "<script" not in html and "<b>" not in html
+    assert "<strong>api.py</strong>: Use &lt;img src=x onerror=alert(1)&gt; List&lt;Foo&gt; here" in html
+    assert "Drop the &lt;script&gt;alert(&#39;x&#39;)&lt;/script&gt; tag &amp; retry" in html
+    assert "<title>Report &lt;b&gt;draft&lt;/b&gt;</title>" in html
+    # The inlined stylesheet is trusted and keeps its child selectors
+    assert ".standards-compliance > div" in html
+
+
+def test_template_is_compiled_once():
+    """Test that repeated renders reuse the compiled template and CSS"""
+    data, config = load_inputs()
+    generate_html(data, config)
+    template = convert_to_pdf.report_template()
+    for _ in range(5):
+        generate_html(data, config)
+
+    assert convert_to_pdf.report_template() is template
+    assert convert_to_pdf.report_template.cache_info().currsize == 1
+    assert convert_to_pdf.report_css.cache_info().misses == 1
+
+
+def test_write_html_streams_same_document():
+    """Test that streaming to disk produces the same document as rendering to a string"""
+    data, config = load_inputs()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = write_html(data, config, Path(temp_dir) / "nested" / "report.html")
+        assert path.read_text() == generate_html(data, config)
+
+
+def test_shared_css_is_linked_instead_of_inlined():
+    """Test that a css_href links the stylesheet, written once under its content hash"""
+    data, config = load_inputs()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        css_path = convert_to_pdf.write_shared_css(root)
+        html_path = root / "acme" / "api" / "analysis-report.html"
+        href = convert_to_pdf.shared_css_href(css_path, html_path)
+        html = generate_html(data, config, css_href=href)
+        mtime = css_path.stat().st_mtime_ns
+        assert convert_to_pdf.write_shared_css(root) == css_path and css_path.stat().st_mtime_ns == mtime
+        assert css_path.read_text() == convert_to_pdf.report_css()
+
+    assert css_path.name.startswith("report.") and css_path.name.endswith(".css")
+    assert href == f"../../{css_path.name}"
+    assert f'<link rel="stylesheet" href="{href}">' in html and "<style>" not in html
+    assert ".pattern-section" not in html
+    assert html.replace(f'    <link rel="stylesheet" href="{href}">\n', "") == generate_html(data, config).replace(
+        "    <style>\n" + convert_to_pdf.report_css() + "\n    </style>\n", ""
+    )
+
+
+if __name__ == "__main__":
+    test_html_contains_every_parsed_item()
+    test_standards_compliance_bold_pairs()
+    test_comment_markup_is_escaped()
+    test_template_is_compiled_once()
+    test_write_html_streams_same_document()
+    test_shared_css_is_linked_instead_of_inlined()
+    print("✅ HTML render tests passed!")
@@ -0,0 +1,60 @@
+"""
+Unit tests for incremental analysis high-water marks
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "fixtures"))
+
+import fake_gh  # noqa: E402
+
+from pull_request_report.incremental import HighWaterMarks, merge_pr_data  # noqa: E402
+
+
+def test_marks_track_newest_created_or_merged():
+    """Test that the mark is the newest created_at/merged_at and persists"""
+    sample = fake_gh.load_sample()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "marks.json"
+        marks = HighWaterMarks(path)
+        assert marks.get("acme/api") is None
+
+        assert marks.advance("acme/api", sample["pr_list"]) == "2025-06-06T09:15:00Z"
+        # An older batch never moves the mark backwards
+        assert marks.advance("acme/api", sample["pr_list"][:1]) == "2025-06-06T09:15:00Z"
+        marks.save()
+
+        assert HighWaterMarks(path).get("acme/api") == "2025-06-06T09:15:00Z"
+
+
+def test_merge_replaces_refreshed_prs_only():
+    """Test that new PR data replaces stale records and keeps the rest"""
+    sample = fake_gh.load_sample()
+    old_pr, newer_pr = sample["pr_list"]
+    existing = {
+        "pr_list": [old_pr, {**newer_pr, "state": "OPEN"}],
+        "comments": sample["comments"],
+        "reviews": sample["reviews"],
+    }
+    new = {
+        "pr_list": [newer_pr, {**newer_pr, "number": 125, "created_at": "2025-06-10T08:00:00Z"}],
+        "comments": [{"pr_number": 124, "user": "db-expert", "body": "Updated", "file": "a.py", "line": 1}],
+        "reviews": [],
+    }
+
+    merged = merge_pr_data(existing, new)
+
+    assert [pr["number"] for pr in merged["pr_list"]] == [125, 124, 123]
+    assert merged["pr_list"][1]["state"] == "MERGED"
+    assert [c["body"] for c in merged["comments"] if c["pr_number"] == 124] == ["Updated"]
+    assert len([c for c in merged["comments"] if c["pr_number"] == 123]) == 2
+    assert all(r["pr_number"] == 123 for r in merged["reviews"])
+
+
+if __name__ == "__main__":
+    test_marks_track_newest_created_or_merged()
+    test_merge_replaces_refreshed_prs_only()
+    print("✅ Incremental tests passed!")
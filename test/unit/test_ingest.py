@@ -0,0 +1,132 @@
+"""
+Unit tests for streaming PR data ingestion
+"""
+
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "fixtures"))
+
+import fake_gh  # noqa: E402
+
+from pull_request_report.ingest import RecordError, iter_records, write_ndjson  # noqa: E402
+from pull_request_report.store import PRStore  # noqa: E402
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+SECTIONS = ("pr_list", "comments", "reviews")
+
+
+
+def collect(records) -> dict:
+    data = {section: [] for section in SECTIONS}
+    for section, record in records:
+        data[section].append(record)
+    return data
+
+
+def expect_error(path: Path, fragment: str):
+    try:
+        list(iter_records(path))
+    except RecordError as e:
+        assert fragment in str(e), str(e)
+    else:
+        raise AssertionError(f"{path.name} should not ingest")
+
+
+def test_stream_matches_json_load():
+    """Test that streaming yields the same records at any chunk boundary"""
+    sample = fake_gh.load_sample()
+    for chunk_size in (1, 7, 64, 1 << 16):
+        assert collect(iter_records(FIXTURES / "sample_pr_data.json", chunk_size)) == sample
+
+
+def test_unknown_keys_and_scalars_at_chunk_edges():
+    """Test that metadata entries are skipped and numbers split across chunks survive"""
+    sample = fake_gh.load_sample()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "dump.json"
+        path.write_text(json.dumps({"version": 1234567, "meta": {"repos": ["a", "b"]}, **sample, "total": 99}))
+        for chunk_size in (3, 5, 11):
+            assert collect(iter_records(path, chunk_size)) == sample
+
+
+def test_ndjson_round_trip():
+    """Test that NDJSON dumps stream back as the same records"""
+    sample = fake_gh.load_sample()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = write_ndjson(sample, Path(temp_dir) / "dump.ndjson")
+        assert len(path.read_text().splitlines()) == sum(len(sample[s]) for s in SECTIONS)
+        assert collect(iter_records(path)) == sample
+
+
+def test_invalid_records_are_rejected():
+    """Test that records breaking the pr_data schema name the bad record"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        cases = [
+            ({"pr_list": [{**fake_gh.load_sample()["pr_list"][0], "state": "DRAFT"}]}, "pr_list[0]: state 'DRAFT'"),
+            ({"pr_list": [{**fake_gh.load_sample()["pr_list"][0], "created_at": "yesterday"}]}, "created_at is not an ISO"),
+            ({"reviews": [{"pr_number": 1, "user": "a", "state": "PENDING", "body": ""}]}, "reviews[0]: state"),
+            ({"comments": [{"pr_number": "1", "user": "a", "body": "x", "file": "f", "line": 1}]}, "pr_number must be int"),
+            ({"comments": [{"pr_number": 1, "user": "a", "body": "x", "file": "f"}]}, "missing line"),
+        ]
+        for i, (data, fragment) in enumerate(cases):
+            path = root / f"case-{i}.json"
+            path.write_text(json.dumps(data))
+            expect_error(path, fragment)
+
+        truncated = root / "truncated.json"
+        truncated.write_text(json.dumps(fake_gh.load_sample())[:-40])
+        expect_error(truncated, "invalid JSON")
+
+        ndjson = root / "bad.ndjson"
+        ndjson.write_text('{"kind": "pr_review", "pr_number": 1}\n')
+        expect_error(ndjson, "line 1: kind must be one of")
+
+
+def test_memory_stays_flat():
+    """Test that peak memory is bounded by record size, not file size"""
+    sample = fake_gh.load_sample()
+    comment = sample["comments"][0]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "big.json"
+        with open(path, "w") as f:
+            f.write('{"pr_list": ' + json.dumps(sample["pr_list"]) + ', "comments": [')
+            f.write(", ".join(json.dumps(comment) for _ in range(60_000)))
+            f.write('], "reviews": []}')
+        size = path.stat().st_size
+
+        tracemalloc.start()
+        count = sum(1 for section, _ in iter_records(path) if section == "comments")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    assert count == 60_000
+    assert size > 8_000_000
+    assert peak < 1_000_000, f"Peak {peak} bytes for a {size} byte file"
+
+
+def test_stream_into_store():
+    """Test that streamed records load into the history store as they arrive"""
+    sample = fake_gh.load_sample()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        path = write_ndjson(sample, root / "dump.ndjson")
+        with PRStore(root / "store.sqlite") as store:
+            counts = store.ingest_records("acme/api", iter_records(path))
+            assert counts == {section: len(sample[section]) for section in SECTIONS}
+            assert len(list(store.query_reviews("senior-dev", "CHANGES_REQUESTED", path_prefix="database/"))) == 1
+
+
+if __name__ == "__main__":
+    test_stream_matches_json_load()
+    test_unknown_keys_and_scalars_at_chunk_edges()
+    test_ndjson_round_trip()
+    test_invalid_records_are_rejected()
+    test_memory_stays_flat()
+    test_stream_into_store()
+    print("✅ Ingest tests passed!")
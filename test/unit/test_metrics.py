@@ -0,0 +1,132 @@
+"""
+Unit tests for the NumPy review metrics engine
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "fixtures"))
+
+import fake_gh  # noqa: E402
+
+try:
+    import numpy as np
+
+    from pull_request_report.metrics import (
+        PRColumns,
+        compute_metrics,
+        grouped_percentiles,
+        metrics_for_pr_data,
+    )
+except ImportError:
+    # metrics is an optional extra; without NumPy there is nothing to test
+    np = None
+
+ISO = "%Y-%m-%dT%H:%M:%SZ"
+START = datetime(2025, 1, 1)
+
+
+
+def random_prs(count: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    logins = [f"dev-{i}" for i in range(6)]
+    pr_lists = {"acme/api": [], "acme/web": []}
+    for number in range(count):
+        created = START + timedelta(hours=rng.randrange(0, 24 * 90))
+        merged = created + timedelta(hours=rng.randrange(1, 200), minutes=rng.randrange(60))
+        pr_lists[rng.choice(list(pr_lists))].append({
+            "number": number,
+            "author": rng.choice(logins[:3]),
+            "created_at": created.strftime(ISO),
+            "merged_at": merged.strftime(ISO) if rng.random() < 0.7 else None,
+            "additions": rng.randrange(0, 500),
+            "deletions": rng.randrange(0, 200),
+            "changed_files": rng.randrange(1, 20),
+            "reviewers": [
+                {"login": login, "state": rng.choice(["APPROVED", "CHANGES_REQUESTED", "COMMENTED"])}
+                for login in rng.sample(logins, 2)
+            ],
+        })
+    return pr_lists
+
+
+def test_sample_metrics():
+    """Test metrics for the fixture PRs against hand-computed values"""
+    if np is None:
+        return
+    metrics = metrics_for_pr_data({"acme/api": fake_gh.load_sample()["pr_list"]})
+    overall = metrics["overall"]
+    # 29.5 h and 18.9 h to merge; churn 257 and 245
+    assert overall["prs"] == overall["merged"] == 2
+    assert overall["time_to_merge_hours"] == {"p50": 24.2, "p75": 26.9, "p90": 28.4}
+    assert (overall["churn_total"], overall["churn_mean"]) == (502, 251.0)
+    assert metrics["reviewers"][0] == {
+        "login": "senior-dev", "reviews": 2, "changes_requested": 1, "changes_requested_rate": 0.5,
+    }
+    assert [(g["repo"], g["author"], g["prs"]) for g in metrics["groups"]] == [("acme/api", "testuser", 2)]
+
+
+def test_grouped_percentiles_match_numpy():
+    """Test the sort-and-index percentiles against np.percentile per group"""
+    if np is None:
+        return
+    rng = np.random.default_rng(3)
+    groups = rng.integers(0, 5, 2000)
+    values = rng.exponential(40, 2000)
+    values[rng.random(2000) < 0.2] = np.nan
+    result = grouped_percentiles(groups, values, 6)
+    for group in range(5):
+        in_group = values[(groups == group) & ~np.isnan(values)]
+        assert np.allclose(result[group], np.percentile(in_group, [50, 75, 90]))
+    assert np.isnan(result[5]).all()
+
+
+def test_groups_match_python_loops():
+    """Test per repo/author and per reviewer figures against plain Python"""
+    if np is None:
+        return
+    pr_lists = random_prs(400)
+    metrics = compute_metrics(PRColumns(pr_lists))
+
+    for group in metrics["groups"]:
+        prs = [pr for pr in pr_lists[group["repo"]] if pr["author"] == group["author"]]
+        assert group["prs"] == len(prs)
+        assert group["merged"] == sum(1 for pr in prs if pr["merged_at"])
+        assert group["churn_total"] == sum(pr["additions"] + pr["deletions"] for pr in prs)
+        hours = [
+            (datetime.strptime(pr["merged_at"], ISO) - datetime.strptime(pr["created_at"], ISO)).total_seconds() / 3600
+            for pr in prs if pr["merged_at"]
+        ]
+        assert group["time_to_merge_hours"]["p90"] == round(float(np.percentile(hours, 90)), 1)
+        for reviewer in group["reviewers"]:
+            entries = [r for pr in prs for r in pr["reviewers"] if r["login"] == reviewer["login"]]
+            assert reviewer["reviews"] == len(entries)
+            assert reviewer["changes_requested"] == sum(r["state"] == "CHANGES_REQUESTED" for r in entries)
+
+    assert sum(g["prs"] for g in metrics["groups"]) == metrics["overall"]["prs"] == 400
+    assert sum(r["reviews"] for r in metrics["reviewers"]) == 800
+
+
+def test_empty_and_unmerged():
+    """Test that no PRs, or no merged PRs, give None rather than NaN"""
+    if np is None:
+        return
+    empty = metrics_for_pr_data({})
+    assert empty["overall"]["prs"] == 0 and empty["groups"] == [] and empty["reviewers"] == []
+
+    open_pr = {**fake_gh.load_sample()["pr_list"][0], "merged_at": None, "state": "OPEN"}
+    metrics = metrics_for_pr_data({"acme/api": [open_pr]})
+    assert metrics["overall"]["time_to_merge_hours"] == {"p50": None, "p75": None, "p90": None}
+    json.dumps(metrics, allow_nan=False)
+
+
+if __name__ == "__main__":
+    test_sample_metrics()
+    test_grouped_percentiles_match_numpy()
+    test_groups_match_python_loops()
+    test_empty_and_unmerged()
+    print("✅ Metrics tests passed!" if np is not None else "⏭️  NumPy not installed, metrics tests skipped")
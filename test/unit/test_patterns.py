@@ -0,0 +1,125 @@
+"""
+Unit tests for clustering review comments into Key Patterns
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from markupsafe import escape
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from convert_to_pdf import convert_summaries, generate_html, parse_markdown_summary  # noqa: E402
+
+try:
+    import numpy as np
+
+    from pull_request_report.patterns import (
+        Vectorizer,
+        extract_patterns,
+        first_sentence,
+        patterns_from_file,
+    )
+except ImportError:
+    # patterns needs the NumPy metrics extra; without it there is nothing to test
+    np = None
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+THEMES = (
+    ("Consider extracting the {x} logic into a separate utility function for reuse.", "auth/{x}.py"),
+    ("The connection pool for {x} is not closed; use a context manager to avoid resource leaks.", "database/{x}.py"),
+    ("Missing tests for the {x} edge cases, please add unit tests.", "tests/test_{x}.py"),
+)
+SUBJECTS = ("user", "order", "payment", "session", "invoice", "report")
+
+
+def themed_comments(per_theme: int = 60) -> list:
+    comments = []
+    for i in range(per_theme):
+        for body, path in THEMES:
+            subject = f"{SUBJECTS[i % len(SUBJECTS)]}{i}"
+            comments.append({
+                "pr_number": i + 1, "user": "senior-dev", "line": 1,
+                "body": body.format(x=subject), "file": path.format(x=subject),
+            })
+    return comments
+
+
+def test_themes_become_patterns():
+    """Test that each recurring theme comes out as one pattern with examples"""
+    if np is None:
+        return
+    patterns = extract_patterns(themed_comments(), max_patterns=3)
+
+    assert [p["comments"] for p in patterns] == [60, 60, 60]
+    for pattern in patterns:
+        assert set(pattern) == {"name", "issues", "improvements", "comments"}
+        assert pattern["name"] and len(pattern["issues"]) == 3
+        # Every example comes from the same theme
+        openings = {issue.split("**: ")[1].split()[0] for issue in pattern["issues"]}
+        assert len(openings) == 1
+    reuse = next(p for p in patterns if "extracting" in p["issues"][0])
+    assert reuse["improvements"][0].startswith("Consider extracting")
+    assert reuse["issues"][0].startswith("**auth/")
+
+
+def test_deterministic():
+    """Test that the same comments always give the same patterns, in any process"""
+    if np is None:
+        return
+    comments = themed_comments()
+    assert extract_patterns(comments) == extract_patterns(comments)
+    # crc32 hashing does not depend on PYTHONHASHSEED
+    assert Vectorizer()._feature("connection pool") == 252322
+
+
+def test_small_and_empty_inputs():
+    """Test fixture comments, blank bodies and no comments at all"""
+    if np is None:
+        return
+    assert extract_patterns([]) == []
+    assert extract_patterns([{"body": "  "}, {"body": None}]) == []
+
+    with open(FIXTURES / "sample_pr_data.json") as f:
+        comments = json.load(f)["comments"]
+    patterns = extract_patterns(comments)
+    assert sum(p["comments"] for p in patterns) <= len(comments)
+    assert all(p["issues"] for p in patterns)
+    assert first_sentence("Good implementation!  Make sure\nto add handling.") == "Good implementation!"
+
+
+def test_patterns_render_and_replace_summary():
+    """Test that derived patterns render through the report and are opt-in"""
+    if np is None:
+        return
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_dir = Path(temp_dir)
+        summary = report_dir / "summary.md"
+        summary.write_text((FIXTURES / "sample_summary.md").read_text())
+        pr_data = report_dir / "pr_data.json"
+        pr_data.write_text(json.dumps({"pr_list": [], "comments": themed_comments(10), "reviews": []}))
+
+        patterns = patterns_from_file(pr_data)
+        data = parse_markdown_summary(summary.read_text())
+        html = generate_html({**data, "patterns": patterns}, config)
+        # Names join terms with "&", which the template escapes
+        assert str(escape(patterns[0]["name"])) in html
+
+        (plain,) = convert_summaries([summary], config, pdf=False)
+        assert "Missing tests for the" not in plain["html"].read_text()
+        (derived,) = convert_summaries([summary], config, pdf=False, derive_patterns=True)
+        assert derived["html_key"] != plain["html_key"] and derived["cached"] == []
+        assert "Missing tests for the" in derived["html"].read_text()
+
+
+if __name__ == "__main__":
+    test_themes_become_patterns()
+    test_deterministic()
+    test_small_and_empty_inputs()
+    test_patterns_render_and_replace_summary()
+    print("✅ Pattern tests passed!" if np is not None else "⏭️  NumPy not installed, pattern tests skipped")
@@ -0,0 +1,106 @@
+"""
+Unit tests for the timed spans behind --profile
+"""
+
+import json
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pull_request_report import profiling as profiling_module  # noqa: E402
+from pull_request_report.profiling import profile_table, profiling, span  # noqa: E402
+
+
+def test_span_is_inert_without_profiling():
+    """Test that spans outside profiling() record nothing and still propagate errors"""
+    with span("parse"):
+        pass
+    assert profiling_module._sinks == ()
+    try:
+        with span("parse"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("the error was swallowed")
+
+
+def test_spans_are_summarized_per_stage():
+    """Test calls, totals and first-use order across nested spans and threads"""
+    def fetch():
+        with span("gh api", path="repos/x/pulls"):
+            time.sleep(0.02)
+
+    with profiling() as profiler:
+        with span("fetch"):
+            threads = [threading.Thread(target=fetch) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        with span("render"):
+            pass
+    assert profiling_module._sinks == ()
+
+    summary = {stage["name"]: stage for stage in profiler.summary()}
+    assert list(summary) == ["gh api", "fetch", "render"]
+    assert summary["gh api"]["calls"] == 3 and summary["gh api"]["total"] >= 0.06
+    assert summary["fetch"]["total"] >= summary["gh api"]["max"]
+    assert summary["fetch"]["total"] <= profiler.wall_seconds
+
+
+def test_chrome_trace_and_stats_files():
+    """Test that the trace holds one complete event per span and the stats load with pstats"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        stats_path = Path(temp_dir) / "run.prof"
+        trace_path = Path(temp_dir) / "trace.json"
+
+        def fetch():
+            with span("gh api"):
+                pass
+
+        with profiling(stats_path, trace_path) as profiler:
+            with span("parse", summary=Path("reports/api/summary.md")), span("render"):
+                sum(range(10_000))
+            worker = threading.Thread(target=fetch)
+            worker.start()
+            worker.join()
+
+        trace = json.loads(trace_path.read_text())
+        functions = pstats.Stats(str(stats_path)).stats
+
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["parse", "render", "gh api"]
+    parse, render, fetch_event = events
+    assert parse["ph"] == render["ph"] == "X" and parse["tid"] == render["tid"] != fetch_event["tid"]
+    assert parse["ts"] <= render["ts"] and render["ts"] + render["dur"] <= parse["ts"] + parse["dur"] + 1
+    assert parse["args"] == {"summary": "reports/api/summary.md"}
+    assert any(path.endswith("profiling.py") and name == "span" for path, _, name in functions)
+    assert len(profiler.spans) == 3
+
+
+def test_profile_table_lists_stages():
+    """Test that the rich table has a row per stage"""
+    from rich.console import Console
+
+    with profiling() as profiler:
+        for _ in range(2):
+            with span("parse"):
+                pass
+    console = Console(record=True, width=100)
+    console.print(profile_table(profiler))
+    text = console.export_text()
+    assert "Profile (" in text and "parse" in text and " 2 " in text
+
+
+if __name__ == "__main__":
+    test_span_is_inert_without_profiling()
+    test_spans_are_summarized_per_stage()
+    test_chrome_trace_and_stats_files()
+    test_profile_table_lists_stages()
+    print("✅ Profiling tests passed!")
@@ -0,0 +1,111 @@
+"""
+Unit tests for the Prometheus metrics exporter
+"""
+
+import re
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pull_request_report import prometheus  # noqa: E402
+from pull_request_report.profiling import span  # noqa: E402
+from pull_request_report.prometheus import Exporter, exporting  # noqa: E402
+
+
+def samples(text: str) -> dict:
+    """``{'name{labels}': value}`` for every sample line of an exposition"""
+    values = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            values[series] = float(value)
+    return values
+
+
+def test_helpers_are_inert_without_exporter():
+    """Test that reporting outside exporting() does nothing"""
+    assert not prometheus.enabled()
+    prometheus.inc("pr_report_prs_fetched_total", repo="acme/api")
+    prometheus.observe("pr_report_pdf_pages", 3)
+    with exporting() as exporter:
+        assert prometheus.enabled()
+    assert not prometheus.enabled()
+    assert exporter.values["pr_report_prs_fetched_total"] == {}
+
+
+def test_render_exposition_format():
+    """Test counters, gauges, label escaping, histogram buckets and derived gauges"""
+    exporter = Exporter()
+    exporter.inc("pr_report_prs_fetched_total", 3, {"repo": "acme/api"})
+    exporter.inc("pr_report_prs_fetched_total", 1, {"repo": 'odd "name"'})
+    exporter.inc("pr_report_github_api_calls_total", 1, {"status": 200})
+    exporter.set("pr_report_github_rate_limit_remaining", 4999)
+    for outcome in ("hits", "hits", "revalidated", "misses"):
+        exporter.inc("pr_report_cache_requests_total", 1, {"result": outcome})
+    for pages in (1, 3, 3, 700):
+        exporter.observe("pr_report_pdf_pages", pages)
+    text = exporter.render()
+    values = samples(text)
+
+    assert "# TYPE pr_report_pdf_pages histogram" in text
+    assert "# HELP pr_report_prs_fetched_total Pull requests fetched from GitHub" in text
+    assert values['pr_report_prs_fetched_total{repo="acme/api"}'] == 3
+    assert values['pr_report_prs_fetched_total{repo="odd \\"name\\""}'] == 1
+    assert values['pr_report_github_api_calls_total{status="200"}'] == 1
+    assert values["pr_report_github_rate_limit_remaining"] == 4999
+    assert values["pr_report_github_throttled_total"] == 0
+    assert values["pr_report_cache_hit_ratio"] == 0.75
+    assert values['pr_report_pdf_pages_bucket{le="1"}'] == 1
+    assert values['pr_report_pdf_pages_bucket{le="2"}'] == 1
+    assert values['pr_report_pdf_pages_bucket{le="5"}'] == 3
+    assert values['pr_report_pdf_pages_bucket{le="500"}'] == 3
+    assert values['pr_report_pdf_pages_bucket{le="+Inf"}'] == 4
+    assert values["pr_report_pdf_pages_sum"] == 707 and values["pr_report_pdf_pages_count"] == 4
+    # Every sample line is "name{labels} value"
+    assert all(re.fullmatch(r'[a-z_]+(\{.*\})? \S+', line) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_spans_fill_stage_histogram_and_endpoint_serves_live_values():
+    """Test that timed stages are observed and /metrics shows them before the run ends"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        textfile = Path(temp_dir) / "textfile" / "pr_report.prom"
+        with exporting(textfile, port=0, interval=0.05) as exporter:
+            with span("render"):
+                time.sleep(0.02)
+            prometheus.inc("pr_report_prs_fetched_total", 2, repo="acme/api")
+            with urllib.request.urlopen(exporter.url) as response:
+                live = samples(response.read().decode())
+                content_type = response.headers["Content-Type"]
+            try:
+                urllib.request.urlopen(exporter.url.replace("/metrics", "/other"))
+            except urllib.error.HTTPError as e:
+                missing = e.code
+            time.sleep(0.2)
+            # Rewritten while the run is still going
+            during = samples(textfile.read_text())
+            prometheus.inc("pr_report_prs_fetched_total", repo="acme/api")
+        final = samples(textfile.read_text())
+        leftovers = [p.name for p in textfile.parent.iterdir() if p != textfile]
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert missing == 404
+    assert live['pr_report_stage_seconds_count{stage="render"}'] == 1
+    assert live['pr_report_stage_seconds_bucket{stage="render",le="0.01"}'] == 0
+    assert live['pr_report_stage_seconds_bucket{stage="render",le="0.025"}'] <= 1
+    assert live['pr_report_prs_fetched_total{repo="acme/api"}'] == 2
+    assert live["pr_report_prs_fetched_per_second"] > 0
+    assert during['pr_report_prs_fetched_total{repo="acme/api"}'] == 2
+    assert final['pr_report_prs_fetched_total{repo="acme/api"}'] == 3
+    assert leftovers == []
+
+
+if __name__ == "__main__":
+    test_helpers_are_inert_without_exporter()
+    test_render_exposition_format()
+    test_spans_fill_stage_histogram_and_endpoint_serves_live_values()
+    print("✅ Prometheus exporter tests passed!")
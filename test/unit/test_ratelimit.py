@@ -0,0 +1,135 @@
+"""
+Unit tests for the GitHub rate limiter
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from pull_request_report.ratelimit import PRIORITY_METADATA, PRIORITY_PAGES, RateLimiter  # noqa: E402
+
+
+def call(limiter, priority=PRIORITY_METADATA) -> float:
+    waited = limiter.acquire(priority)
+    limiter.release()
+    return waited
+
+
+def test_unknown_budget_does_not_wait():
+    """Test that calls are not paced before GitHub reported a budget"""
+    limiter = RateLimiter(burst=2)
+    assert sum(call(limiter) for _ in range(50)) < 0.1
+    assert limiter.rate is None and limiter.in_flight == 0
+
+
+def window(remaining: int, reset_in: float, limit: int = 5000) -> dict:
+    return {"x-ratelimit-limit": str(limit), "x-ratelimit-remaining": str(remaining),
+            "x-ratelimit-reset": str(time.time() + reset_in)}
+
+
+def test_large_budget_is_not_paced():
+    """Test that calls go out at burst speed while most of the window's budget is left"""
+    limiter = RateLimiter(burst=8)
+    started = time.time()
+    for remaining in range(4990, 4790, -1):
+        call(limiter)
+        limiter.update(window(remaining, 3600))
+
+    assert time.time() - started < 0.5 and limiter.waited < 0.1
+    assert limiter.rate is None and limiter.remaining == 4791
+
+
+def test_update_spreads_remaining_budget():
+    """Test that the refill rate spreads the remaining calls over the window once it runs low"""
+    limiter = RateLimiter(burst=4)
+    limiter.update(window(100, 50))
+    assert 1.9 < limiter.rate < 2.1 and limiter.remaining == 100
+
+    limiter.update(window(40, 0.2))
+    for _ in range(4):
+        call(limiter)
+    # The burst is spent, so the next call waits for the 40/s refill
+    assert 0.01 < call(limiter) < 0.1
+
+
+def test_exhausted_budget_waits_for_reset():
+    """Test that remaining 0 pauses every caller until the window resets"""
+    limiter = RateLimiter(burst=4)
+    limiter.update(window(0, 0.3))
+    assert 0.2 < call(limiter) < 0.5
+
+
+def test_throttle_decisions():
+    """Test which rejections are retried and how long callers are paused"""
+    limiter = RateLimiter(burst=4, backoff=0.1, max_retries=2)
+
+    assert not limiter.throttle(404, {})
+    assert not limiter.throttle(403, {}, "Resource not accessible by integration")
+    assert limiter.throttled == 0
+
+    assert limiter.throttle(429, {"retry-after": "0.2"})
+    assert limiter.paused_until > time.time() + 0.1 and limiter.concurrency == 2
+    assert 0.1 < call(limiter) < 0.4
+
+    # Secondary limit without Retry-After: exponential backoff from ``backoff``
+    assert limiter.throttle(403, {}, "You have exceeded a secondary rate limit", attempt=1)
+    first_pause = limiter.paused_until - time.time()
+    call(limiter)
+    assert limiter.throttle(403, {}, "You have exceeded a secondary rate limit", attempt=1)
+    assert limiter.paused_until - time.time() > first_pause * 1.5
+    assert not limiter.throttle(429, {"retry-after": "0"}, attempt=2)
+    assert limiter.throttled == 4
+
+    # Concurrency halves once per episode, never below one, and grows back slowly
+    assert limiter.concurrency == 1
+    for _ in range(2):
+        limiter.update({})
+    assert limiter.failures == 0 and limiter.concurrency == 2.5
+
+
+def test_concurrency_limit():
+    """Test that only ``concurrency`` calls are in flight at once"""
+    limiter = RateLimiter(burst=4)
+    limiter.concurrency = 2
+    limiter.acquire()
+    limiter.acquire()
+    released = threading.Timer(0.1, limiter.release)
+    released.start()
+    assert 0.05 < limiter.acquire() < 0.3
+    assert limiter.in_flight == 2
+
+
+def test_metadata_goes_before_pages():
+    """Test that waiting metadata calls are served before queued pagination"""
+    limiter = RateLimiter(burst=1)
+    limiter.update(window(1000, 50))
+    limiter.throttle(429, {"retry-after": "0.2"})
+    order = []
+
+    def ordered_call(name, priority):
+        call(limiter, priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=ordered_call, args=(f"page{i}", PRIORITY_PAGES)) for i in range(3)]
+    threads += [threading.Thread(target=ordered_call, args=(f"meta{i}", PRIORITY_METADATA)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["meta0", "meta1", "page0", "page1", "page2"]
+
+
+if __name__ == "__main__":
+    test_unknown_budget_does_not_wait()
+    test_large_budget_is_not_paced()
+    test_update_spreads_remaining_budget()
+    test_exhausted_budget_waits_for_reset()
+    test_throttle_decisions()
+    test_concurrency_limit()
+    test_metadata_goes_before_pages()
+    print("✅ Rate limiter tests passed!")
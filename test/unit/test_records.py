@@ -0,0 +1,137 @@
+"""
+Unit tests for slotted PR, comment and review records
+"""
+
+import gc
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "fixtures"))
+
+import fake_gh  # noqa: E402
+
+from pull_request_report.fetch import (  # noqa: E402
+    PR_STATES,
+    REVIEW_STATES,
+    pr_watermark,
+    read_pr_data,
+    write_pr_data,
+)
+from pull_request_report.incremental import merge_pr_data  # noqa: E402
+from pull_request_report.ingest import iter_records  # noqa: E402
+from pull_request_report.records import (  # noqa: E402
+    Comment,
+    PRState,
+    PullRequest,
+    ReviewState,
+    from_pr_data,
+    to_pr_data,
+    typed_records,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+
+def test_round_trip():
+    """Test that records convert back to exactly the JSON they came from"""
+    sample = fake_gh.load_sample()
+    records = from_pr_data(sample)
+    assert to_pr_data(records) == sample
+    assert json.loads(json.dumps(to_pr_data(records))) == sample
+
+
+def test_states_and_interning():
+    """Test that states are shared enum members and logins/paths are interned"""
+    assert tuple(PRState.__members__) == PR_STATES
+    assert tuple(ReviewState.__members__) == REVIEW_STATES
+
+    records = from_pr_data(json.loads(json.dumps(fake_gh.load_sample())))
+    assert records["pr_list"][0].state is PRState.MERGED
+    assert records["pr_list"][1].reviewers[1].state is ReviewState.CHANGES_REQUESTED
+    db_comments = [c for c in records["comments"] if c.file == "database/pool.py"]
+    assert db_comments[0].file is db_comments[1].file
+    senior = [c.user for c in records["comments"] if c.user == "senior-dev"]
+    assert senior[0] is senior[1]
+    assert not hasattr(records["comments"][0], "__dict__")
+
+    try:
+        Comment.from_json({"pr_number": 1, "user": "a", "body": "b", "file": "f"})
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("A comment without a line should not convert")
+
+
+def test_typed_stream():
+    """Test that streamed records can be converted as they arrive"""
+    sample = fake_gh.load_sample()
+    typed = list(typed_records(iter_records(FIXTURES / "sample_pr_data.json")))
+    assert [r for section, r in typed if section == "reviews"] == from_pr_data(sample)["reviews"]
+
+
+def test_records_stand_in_for_dicts():
+    """Test that the fetch, merge and write paths keep records and read them like dicts"""
+    sample = fake_gh.load_sample()
+    records = from_pr_data(sample)
+    pr = records["pr_list"][0]
+    assert pr["number"] == pr.number and pr.get("title") == pr.title and pr["state"] == "MERGED"
+    assert pr.get("missing", 0) == 0 and pr["reviewers"][0].get("login") == sample["pr_list"][0]["reviewers"][0]["login"]
+    try:
+        pr["to_json"]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Only fields should be readable by key")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "pr_data.json"
+        write_pr_data(records, path)
+        assert json.loads(path.read_text()) == sample
+        existing = read_pr_data(path)
+    assert existing == records
+
+    newer = {**sample["pr_list"][1], "title": "Renamed", "created_at": "2025-07-01T00:00:00Z"}
+    merged = merge_pr_data(existing, from_pr_data({"pr_list": [newer]}))
+    assert all(isinstance(r, PullRequest) for r in merged["pr_list"])
+    assert [p.title for p in merged["pr_list"]][0] == "Renamed"
+    assert pr_watermark(merged["pr_list"][0]) == "2025-07-01T00:00:00Z"
+
+
+def test_records_use_less_memory():
+    """Test that slotted records retain well under the memory of plain dicts"""
+    sample = fake_gh.load_sample()
+    data = {"pr_list": sample["pr_list"], "reviews": sample["reviews"], "comments": [
+        {**comment, "pr_number": 123, "body": f"{comment['body']} ({i})"}
+        for i in range(5000) for comment in sample["comments"]
+    ]}
+    text = json.dumps(data)
+
+    def retained(build):
+        gc.collect()
+        tracemalloc.start()
+        result = build(text)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        return size
+
+    dict_bytes = retained(json.loads)
+    record_bytes = retained(lambda t: from_pr_data(json.loads(t)))
+    print(f"  {len(data['comments'])} comments: dicts {dict_bytes / 1e6:.1f} MB, "
+          f"records {record_bytes / 1e6:.1f} MB")
+    assert record_bytes < 0.65 * dict_bytes
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_states_and_interning()
+    test_typed_stream()
+    test_records_stand_in_for_dicts()
+    test_records_use_less_memory()
+    print("✅ Record tests passed!")
@@ -0,0 +1,131 @@
+"""
+Unit tests for the engineering standards index
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from convert_to_pdf import convert_summaries  # noqa: E402
+from pull_request_report.standards import (  # noqa: E402
+    StandardsIndex,
+    compliance_summary,
+    load_rules,
+    parse_standards,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+DOCS = FIXTURES / "sample_engineering_docs.md"
+
+
+def load_comments():
+    with open(FIXTURES / "sample_pr_data.json") as f:
+        return json.load(f)["comments"]
+
+
+def test_parse_rules():
+    """Test that every ### heading becomes a rule with keywords from its bullets"""
+    rules = {rule.name: rule for rule in load_rules(DOCS)}
+
+    assert len(rules) == 11
+    purity = rules["Repository Layer Purity"]
+    assert purity.critical and purity.section == "Repository Standards"
+    # "ZERO business logic" loses its qualifier; labels like "Violation" are skipped
+    assert purity.keywords == ["repository layer purity", "business logic", "database transactions", "type conversion"]
+    # Code spans are keywords too, code blocks are not
+    assert "redirect slashes" in rules["Router Configuration"].keywords
+    assert "gather with concurrency" in rules["Performance Consciousness"].keywords
+    assert not any("apirouter" in keyword for rule in rules.values() for keyword in rule.keywords)
+    assert not any(rule.critical for name, rule in rules.items() if name != "Repository Layer Purity")
+
+
+def test_match_comments():
+    """Test tagging comments, including plurals, hyphens and explicit keywords"""
+    index = StandardsIndex(parse_standards(
+        "## Data\n"
+        "### Repository Layer Purity\n"
+        "- **ZERO business logic** in DAO layers\n"
+        "- **Keywords**: dao, data access\n"
+        "### Error Handling\n"
+        "- **Null safety**: check inputs\n"
+    ))
+
+    names = [[rule.name for rule in index.match(text)] for text in (
+        "Business-logic should not live in the DAO.",
+        "Add null safety here and better error handling.",
+        "This DAOs layer also needs error-handling.",
+        "Looks good to me.",
+        "The dataaccess flag is unrelated.",
+    )]
+    assert names == [
+        ["Repository Layer Purity"],
+        ["Error Handling"],
+        ["Repository Layer Purity", "Error Handling"],
+        [],
+        [],
+    ]
+    assert StandardsIndex([]).match("anything") == []
+
+
+def test_nested_keywords_report_every_rule():
+    """Test that a keyword inside a longer keyword still tags its own rule"""
+    index = StandardsIndex(parse_standards(
+        "### Resource Cleanup\n- **Keywords**: cleanup\n"
+        "### Testing Strategy\n- **Resource cleanup**: use context managers\n"
+    ))
+    assert [rule.name for rule in index.match("Missing resource cleanup in tests")] == [
+        "Resource Cleanup", "Testing Strategy",
+    ]
+
+
+def test_compliance_summary():
+    """Test the rendered section for the fixture comments"""
+    index = StandardsIndex.from_file(DOCS)
+    assert compliance_summary(index, load_comments()) == (
+        "**Error Handling**: 1 comment (auth/jwt_handler.py)\n"
+        "**Testing Strategy**: 1 comment (database/pool.py)\n"
+    )
+    comments = [{"body": "Business logic in the DAO again", "file": f"dao/{i % 2}.py"} for i in range(3)]
+    assert compliance_summary(index, comments) == (
+        "**Repository Layer Purity** (critical): 3 comments (dao/0.py, dao/1.py)\n"
+    )
+
+
+def test_convert_fills_standards_compliance():
+    """Test that configured docs populate the section and are part of the cache key"""
+    with open(FIXTURES / "sample_config.json") as f:
+        config = json.load(f)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report_dir = Path(temp_dir)
+        summary = report_dir / "summary.md"
+        shutil.copy(FIXTURES / "sample_summary.md", summary)
+        shutil.copy(FIXTURES / "sample_pr_data.json", report_dir / "pr_data.json")
+        docs = report_dir / "standards.md"
+        shutil.copy(DOCS, docs)
+
+        (plain,) = convert_summaries([summary], config, pdf=False)
+        assert "Standards Compliance Analysis" not in plain["html"].read_text()
+
+        config["engineering_docs"]["path"] = str(docs)
+        (tallied,) = convert_summaries([summary], config, pdf=False)
+        assert tallied["html_key"] != plain["html_key"]
+        assert "<strong>Error Handling</strong>: 1 comment" in tallied["html"].read_text()
+
+        docs.write_text(DOCS.read_text() + "\n### Configuration\n- **Keywords**: environment variables\n")
+        (updated,) = convert_summaries([summary], config, pdf=False)
+        assert updated["cached"] == [] and updated["html_key"] != tallied["html_key"]
+        assert "<strong>Configuration</strong>: 1 comment" in updated["html"].read_text()
+
+
+if __name__ == "__main__":
+    test_parse_rules()
+    test_match_comments()
+    test_nested_keywords_report_every_rule()
+    test_compliance_summary()
+    test_convert_fills_standards_compliance()
+    print("✅ Standards tests passed!")
@@ -0,0 +1,114 @@
+"""
+Unit tests for the indexed SQLite PR store
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "fixtures"))
+
+import fake_gh  # noqa: E402
+
+from pull_request_report.store import PRStore, prefix_bounds  # noqa: E402
+
+Q2 = {"since": "2025-04-01T00:00:00Z", "until": "2025-07-01T00:00:00Z"}
+
+
+
+def test_prefix_bounds():
+    """Test that the range bounds match exactly the prefixed paths"""
+    low, high = prefix_bounds("database/")
+    assert low <= "database/pool.py" < high
+    assert not low <= "database_utils.py" < high
+    assert not low <= "auth/database/x.py" < high
+
+
+def test_ingest_and_query_reviews():
+    """Test the CHANGES_REQUESTED-by-reviewer-on-path-in-Q2 query"""
+    with tempfile.TemporaryDirectory() as temp_dir, PRStore(Path(temp_dir) / "store.sqlite") as store:
+        counts = store.ingest("acme/api", fake_gh.load_sample())
+        assert counts == {"pr_list": 2, "comments": 4, "reviews": 3}
+
+        rows = list(store.query_reviews("senior-dev", "CHANGES_REQUESTED", path_prefix="database/", **Q2))
+        assert [(r["repo"], r["pr_number"], r["author"]) for r in rows] == [("acme/api", 124, "testuser")]
+
+        assert list(store.query_reviews("senior-dev", "CHANGES_REQUESTED", since="2025-07-01")) == []
+        assert [r["pr_number"] for r in store.query_reviews("senior-dev")] == [124, 123]
+        assert list(store.query_reviews("senior-dev", path_prefix="auth/", state="CHANGES_REQUESTED")) == []
+
+
+def test_query_comments_and_prs():
+    """Test comment path filters and PR reviewer/state filters"""
+    with tempfile.TemporaryDirectory() as temp_dir, PRStore(Path(temp_dir) / "store.sqlite") as store:
+        store.ingest("acme/api", fake_gh.load_sample())
+        store.ingest("acme/web", fake_gh.load_sample())
+
+        comments = list(store.query_comments(path_prefix="database/", repo="acme/web"))
+        assert {(c["user"], c["file"]) for c in comments} == {
+            ("db-expert", "database/pool.py"), ("senior-dev", "database/pool.py"),
+        }
+        assert len(list(store.query_comments(user="team-lead"))) == 2
+
+        prs = list(store.query_prs(reviewer="db-expert", state="MERGED"))
+        assert sorted((p["repo"], p["number"]) for p in prs) == [("acme/api", 124), ("acme/web", 124)]
+        assert [p["number"] for p in store.query_prs(repo="acme/api", path_prefix="auth/")] == [123]
+
+
+def test_reingest_replaces_pr_children():
+    """Test that re-ingesting a PR drops its old comments, reviews and reviewers"""
+    sample = fake_gh.load_sample()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "store.sqlite"
+        with PRStore(path) as store:
+            store.ingest("acme/api", sample)
+
+        updated = {
+            "pr_list": [{**sample["pr_list"][1], "reviewers": [{"login": "senior-dev", "state": "APPROVED"}]}],
+            "comments": [{"pr_number": 124, "user": "senior-dev", "body": "LGTM", "file": "database/pool.py", "line": 1}],
+            "reviews": [{"pr_number": 124, "user": "senior-dev", "state": "APPROVED", "body": "LGTM"}],
+        }
+        with PRStore(path) as store:
+            store.ingest("acme/api", updated)
+            assert list(store.query_reviews("senior-dev", "CHANGES_REQUESTED")) == []
+            assert [c["body"] for c in store.query_comments(path_prefix="database/")] == ["LGTM"]
+            assert list(store.query_prs(reviewer="db-expert")) == []
+            # PR 123 was not part of the update and keeps its rows
+            assert len(list(store.query_comments(path_prefix="auth/"))) == 2
+
+
+def test_records_in_any_order():
+    """Test that comments arriving before their PR are kept when the PR follows"""
+    sample = fake_gh.load_sample()
+    records = [("reviews", r) for r in sample["reviews"]] + [("comments", c) for c in sample["comments"]]
+    records += [("pr_list", pr) for pr in sample["pr_list"]]
+    with tempfile.TemporaryDirectory() as temp_dir, PRStore(Path(temp_dir) / "store.sqlite") as store:
+        for _ in range(2):
+            store.ingest_records("acme/api", iter(records))
+        assert len(list(store.query_comments())) == len(sample["comments"])
+        assert len(list(store.query_reviews())) == len(sample["reviews"])
+
+
+def test_queries_use_indexes():
+    """Test that filtered queries search indexes instead of scanning tables"""
+    with tempfile.TemporaryDirectory() as temp_dir, PRStore(Path(temp_dir) / "store.sqlite") as store:
+        plan = " | ".join(store.explain(
+            "reviews", reviewer="senior-dev", state="CHANGES_REQUESTED", path_prefix="database/", **Q2
+        ))
+        assert "USING INDEX reviews_user" in plan
+        assert "comments_file" in plan or "comments_pr" in plan
+        assert "SCAN r" not in plan and "SCAN reviews" not in plan
+
+        plan = " | ".join(store.explain("comments", path_prefix="database/"))
+        assert "comments_file" in plan
+
+
+if __name__ == "__main__":
+    test_prefix_bounds()
+    test_ingest_and_query_reviews()
+    test_query_comments_and_prs()
+    test_reingest_replaces_pr_children()
+    test_records_in_any_order()
+    test_queries_use_indexes()
+    print("✅ Store tests passed!")
@@ -0,0 +1,98 @@
+"""
+Unit tests for the streaming markdown summary parser
+"""
+
+import io
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from convert_to_pdf import parse_markdown_summary  # noqa: E402
+
+SAMPLE_SUMMARY = Path(__file__).parent.parent / "fixtures" / "sample_summary.md"
+
+
+def test_file_and_string_input_agree():
+    """Test that parsing an open file matches parsing its text"""
+    with open(SAMPLE_SUMMARY) as f:
+        from_file = parse_markdown_summary(f)
+    assert from_file == parse_markdown_summary(SAMPLE_SUMMARY.read_text())
+
+    assert from_file["title"] == "Pull Request Analysis Summary"
+    assert from_file["pr_list"] == [
+        "PR #123: Add user authentication with JWT tokens",
+        "PR #124: Refactor database connection pooling",
+    ]
+    assert from_file["overview"].startswith("Analyzed 2 recent pull requests")
+    assert len(from_file["strengths"]) == 3
+    assert len(from_file["recommendations"]["immediate"]) >= 4
+    assert from_file["conclusion"].startswith("The analysis shows")
+
+
+def test_pattern_lists_follow_their_headings():
+    """Test that every item lands in the list whose heading precedes it"""
+    with open(SAMPLE_SUMMARY) as f:
+        patterns = parse_markdown_summary(f)["patterns"]
+
+    assert [p["name"] for p in patterns] == [
+        "Code Organization & Architecture",
+        "API Design & Error Handling",
+    ]
+    assert patterns[0]["issues"][0].startswith("**Method Placement**")
+    assert patterns[0]["improvements"] == [
+        "Extract utility functions for reusable logic",
+        "Use environment variables for configuration",
+        "Implement context managers for resource cleanup",
+    ]
+
+
+def test_long_pattern_lists_are_kept_whole():
+    """Test lists longer than a few items and short lists back to back"""
+    issues = [f"- **Issue {i}**: detail" for i in range(12)]
+    markdown = "\n".join(
+        ["## Key Patterns Identified", "### 1. **Long**", "**Recurring Issues:**"]
+        + issues
+        + ["**Improvement Actions:**", "- Fix everything"]
+        + ["### 2. **Short**", "**Recurring Issues:**", "- **Only**: one",
+           "**Improvement Actions:**", "- **Bold** action"]
+        + ["## Strengths Observed"] + [f"{i}. Strength {i}" for i in range(1, 12)]
+    )
+
+    data = parse_markdown_summary(io.StringIO(markdown))
+
+    assert len(data["patterns"][0]["issues"]) == 12
+    assert data["patterns"][0]["improvements"] == ["Fix everything"]
+    assert data["patterns"][1]["issues"] == ["**Only**: one"]
+    assert data["patterns"][1]["improvements"] == ["**Bold** action"]
+    assert len(data["strengths"]) == 11
+
+
+def test_parser_state_does_not_grow_with_input():
+    """Test that lines which produce no output are not retained"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "summary.md"
+        with open(path, "w") as f:
+            f.write("## Key Patterns Identified\n### 1. **Filler**\n")
+            for i in range(50_000):
+                f.write(f"Commentary line {i} that is not a list item.\n")
+
+        tracemalloc.start()
+        with open(path) as f:
+            data = parse_markdown_summary(f)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    assert data["patterns"][0]["issues"] == []
+    # The file is ~2.3 MB; a parser that keeps history would peak above that
+    assert peak < 512 * 1024, f"Parser peaked at {peak} bytes"
+
+
+if __name__ == "__main__":
+    test_file_and_string_input_agree()
+    test_pattern_lists_follow_their_headings()
+    test_long_pattern_lists_are_kept_whole()
+    test_parser_state_does_not_grow_with_input()
+    print("✅ Summary parser tests passed!")